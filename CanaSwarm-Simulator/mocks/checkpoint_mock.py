@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+Checkpoint Mock - CanaSwarm Simulator
+
+Snapshot completo de uma simulação (ambiente, física, robôs, agendamento e
+estado de todos os streams aleatórios), com restauração e ramificação
+barata de cenários "e se".
+
+O snapshot é um blob pickle imutável: restaurar é desserializar, sem
+re-simular o aquecimento. Os rasters de terreno/densidade (a maior parte da
+memória e nunca escritos) ficam fora do blob e são compartilhados por
+todos os ramos, como páginas copy-on-write.
+
+Author: CanaSwarm Team
+Date: 2026-02-20
+"""
+
+import io
+import pickle
+from array import array
+from typing import Any, Dict, Iterable, List, Optional
+
+from swarm_simulator_mock import SwarmSimulator
+from terrain_raster_mock import TerrainRaster
+from trajectory_recorder_mock import TrajectoryRecorder
+
+SNAPSHOT_FORMAT = 1
+
+
+class _SnapshotPickler(pickle.Pickler):
+    """Pickler que troca rasters por referências e desanexa o recorder"""
+
+    def __init__(self, file, rasters: Dict[str, TerrainRaster]):
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self.rasters = rasters
+        self._keys: Dict[int, str] = {}
+
+    def persistent_id(self, obj: Any) -> Optional[tuple]:
+        if isinstance(obj, TerrainRaster):
+            key = self._keys.get(id(obj))
+            if key is None:
+                key = self._keys[id(obj)] = f'raster-{len(self._keys)}'
+                self.rasters[key] = obj
+            return ('raster', key)
+        if isinstance(obj, TrajectoryRecorder):
+            # Arquivo aberto não vai para o snapshot: ramos gravam nos próprios recorders
+            return ('detached', None)
+        return None
+
+
+class _SnapshotUnpickler(pickle.Unpickler):
+    """Unpickler que resolve as referências de raster para os objetos compartilhados"""
+
+    def __init__(self, file, rasters: Dict[str, TerrainRaster]):
+        super().__init__(file)
+        self.rasters = rasters
+
+    def persistent_load(self, pid: tuple) -> Any:
+        kind, key = pid
+        if kind == 'raster':
+            return self.rasters[key]
+        if kind == 'detached':
+            return None
+        raise pickle.UnpicklingError(f"Referência desconhecida no snapshot: {pid}")
+
+
+class SimulationSnapshot:
+    """Estado congelado de um SwarmSimulator"""
+
+    def __init__(self, payload: bytes, rasters: Dict[str, TerrainRaster], info: Dict[str, Any]):
+        """
+        Inicializa snapshot (use `capture` ou `load`)
+
+        Args:
+            payload: Simulação serializada (sem os rasters)
+            rasters: Rasters compartilhados, por chave de referência
+            info: Metadados (tempo simulado, passos, robôs, seed)
+        """
+        self.payload = payload
+        self.rasters = rasters
+        self.info = info
+
+    @classmethod
+    def capture(cls, swarm: SwarmSimulator) -> 'SimulationSnapshot':
+        """
+        Congela o estado atual da simulação
+
+        Args:
+            swarm: Simulação a capturar (não é alterada)
+
+        Returns:
+            Snapshot independente da simulação original
+        """
+        rasters: Dict[str, TerrainRaster] = {}
+        buffer = io.BytesIO()
+        _SnapshotPickler(buffer, rasters).dump(swarm)
+
+        info = {
+            'elapsed_seconds': swarm.elapsed_seconds,
+            'step_count': swarm.step_count,
+            'robots': [robot.robot['robot_id'] for robot in swarm.robots],
+            'seed': swarm.rng_streams.seed
+        }
+        return cls(buffer.getvalue(), rasters, info)
+
+    def restore(self, seed: Optional[int] = None) -> SwarmSimulator:
+        """
+        Cria uma simulação a partir do snapshot
+
+        Args:
+            seed: Nova seed mestre para o ramo (None = continua a sequência
+                  original, reproduzindo exatamente a simulação capturada)
+
+        Returns:
+            Simulação independente (rasters compartilhados, somente leitura)
+        """
+        swarm = _SnapshotUnpickler(io.BytesIO(self.payload), self.rasters).load()
+        if seed is not None:
+            swarm.rng_streams.reseed(seed)
+        return swarm
+
+    def fork(self, seeds: Iterable[int]) -> List[SwarmSimulator]:
+        """Um ramo por seed, todos partindo deste snapshot"""
+        return [self.restore(seed) for seed in seeds]
+
+    def save(self, path: str):
+        """
+        Salva snapshot em disco
+
+        Rasters mapeados de arquivo são gravados como referência ao arquivo
+        de origem; rasters calculados em memória vão junto com os valores.
+        """
+        rasters = {}
+        for key, raster in self.rasters.items():
+            spec = {'outside_value': raster.outside_value}
+            if raster.source_path is not None:
+                spec['source_path'] = raster.source_path
+            else:
+                spec.update(bounds=raster.bounds, rows=raster.rows, cols=raster.cols,
+                            values=array('d', raster.values))
+            rasters[key] = spec
+
+        with open(path, 'wb') as f:
+            pickle.dump({
+                'format': SNAPSHOT_FORMAT,
+                'info': self.info,
+                'rasters': rasters,
+                'payload': self.payload
+            }, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def load(cls, path: str) -> 'SimulationSnapshot':
+        """Carrega snapshot salvo com `save` (apenas arquivos de fonte confiável)"""
+        with open(path, 'rb') as f:
+            data = pickle.load(f)
+
+        if data.get('format') != SNAPSHOT_FORMAT:
+            raise ValueError(f"{path}: formato de snapshot não suportado ({data.get('format')})")
+
+        rasters = {}
+        for key, spec in data['rasters'].items():
+            if 'source_path' in spec:
+                rasters[key] = TerrainRaster.from_file(spec['source_path'], spec['outside_value'])
+            else:
+                rasters[key] = TerrainRaster(spec['bounds'], spec['rows'], spec['cols'],
+                                             spec['values'], spec['outside_value'])
+
+        return cls(data['payload'], rasters, data['info'])
+
+
+def main():
+    """Testa captura, restauração determinística, ramos e disco"""
+    import json
+    import os
+    import tempfile
+    import time
+
+    print("📸 Simulator - Checkpoint Mock")
+    print("=" * 70)
+
+    with open('example_simulation_data.json', 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    warmup_s = 300
+    start = time.perf_counter()
+    swarm = SwarmSimulator(data)
+    swarm.run(warmup_s)
+    warmup_wall_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    snapshot = SimulationSnapshot.capture(swarm)
+    capture_ms = (time.perf_counter() - start) * 1000
+    raster_kb = sum(raster.rows * raster.cols * 8 for raster in snapshot.rasters.values()) / 1024
+    print(f"\n💾 SNAPSHOT em t={snapshot.info['elapsed_seconds']:.0f}s:")
+    print(f"   Aquecimento: {warmup_wall_s * 1000:.0f} ms | captura: {capture_ms:.1f} ms")
+    print(f"   Blob: {len(snapshot.payload) / 1024:.1f} KB (+ {len(snapshot.rasters)} rasters compartilhados, {raster_kb:.0f} KB)")
+
+    # Restauração sem nova seed reproduz exatamente a simulação original
+    start = time.perf_counter()
+    restored = snapshot.restore()
+    restore_ms = (time.perf_counter() - start) * 1000
+    swarm.run(60)
+    restored.run(60)
+    identical = all(a.robot['state'].to_dict() == b.robot['state'].to_dict() and a.stats == b.stats
+                    for a, b in zip(swarm.robots, restored.robots))
+    print(f"\n🔁 RESTAURAÇÃO: {restore_ms:.1f} ms | +60s idêntico ao original: {identical}")
+    print(f"   Rasters compartilhados: {restored.env_simulator.height_raster is swarm.env_simulator.height_raster}")
+
+    # Ramos "e se" com seeds diferentes
+    branches = snapshot.fork([101, 202, 303])
+    print(f"\n🌿 RAMOS ({len(branches)}):")
+    for seed, branch in zip([101, 202, 303], branches):
+        branch.run(60)
+        weather = branch.env_simulator.environment['weather']
+        print(f"   seed {seed}: t={branch.elapsed_seconds:.0f}s | {weather['temperature_c']:.2f}°C | "
+              f"vento {weather['wind_speed_ms']:.2f} m/s")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'warmup.snapshot')
+        snapshot.save(path)
+        loaded = SimulationSnapshot.load(path).restore()
+        loaded.run(60)
+        same = all(a.robot['state'].to_dict() == b.robot['state'].to_dict()
+                   for a, b in zip(restored.robots, loaded.robots))
+        print(f"\n📀 DISCO: {os.path.getsize(path) / 1024:.1f} KB | carregado +60s idêntico: {same}")
+
+    print(f"\n✅ Checkpoint funcionando!")
+
+
+if __name__ == '__main__':
+    main()
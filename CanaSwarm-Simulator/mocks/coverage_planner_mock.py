@@ -0,0 +1,339 @@
+#!/usr/bin/env python3
+"""
+Coverage Planner Mock - CanaSwarm Simulator
+
+Planejamento de cobertura (boustrophedon) para missões de colheita:
+- Linhas paralelas espaçadas pela largura de trabalho do robô, alternando
+  o sentido a cada linha, ao longo da maior dimensão da zona
+- Obstáculos (inflados por meia largura do robô + margem) contornados por
+  uma caixa de 4 waypoints no lado mais curto
+- Planos calculados uma vez e reaproveitados por (zona, largura de trabalho):
+  robôs na mesma faixa (ou no mesmo campo) compartilham o mesmo plano
+- `PathFollower`: controlador lookahead O(1) por tick (avança o índice do
+  waypoint; sem replanejamento)
+
+Waypoints ficam em metros no referencial local do campo (LocalENU).
+
+Author: CanaSwarm Team
+Date: 2026-02-20
+"""
+
+import math
+from array import array
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from geodesy_mock import LocalENU
+
+# Folga extra em volta de cada obstáculo (m)
+OBSTACLE_MARGIN_M = 0.5
+
+
+class CoveragePlan:
+    """Caminho de cobertura pré-calculado (waypoints em ENU)"""
+
+    def __init__(self, frame: LocalENU, easts: array, norths: array, row_count: int,
+                 work_width_m: float, zone: Dict[str, float]):
+        """
+        Inicializa plano (use `CoveragePlanner.plan`)
+
+        Args:
+            frame: Referencial local dos waypoints
+            easts, norths: Waypoints (m)
+            row_count: Linhas de cobertura
+            work_width_m: Espaçamento entre linhas
+            zone: Bounds GPS cobertos
+        """
+        self.frame = frame
+        self.easts = easts
+        self.norths = norths
+        self.row_count = row_count
+        self.work_width_m = work_width_m
+        self.zone = zone
+        self.length_m = sum(math.hypot(easts[i + 1] - easts[i], norths[i + 1] - norths[i])
+                            for i in range(len(easts) - 1))
+
+    def __len__(self) -> int:
+        return len(self.easts)
+
+    def nearest_index(self, east: float, north: float) -> int:
+        """Waypoint mais próximo de um ponto (busca linear, usada só ao iniciar a missão)"""
+        best_index, best_d2 = 0, float('inf')
+        for i, (e, n) in enumerate(zip(self.easts, self.norths)):
+            d2 = (e - east) ** 2 + (n - north) ** 2
+            if d2 < best_d2:
+                best_index, best_d2 = i, d2
+        return best_index
+
+    def waypoint(self, index: int) -> Tuple[float, float]:
+        """(lat, lon) de um waypoint"""
+        return self.frame.to_geodetic(self.easts[index], self.norths[index])
+
+
+class CoveragePlanner:
+    """Gera planos boustrophedon e mantém o cache por zona e largura de trabalho"""
+
+    def __init__(self, frame: LocalENU, obstacles: Sequence[Dict] = ()):
+        """
+        Inicializa planner
+
+        Args:
+            frame: Referencial local do campo
+            obstacles: Obstáculos do terreno (`position`, `radius_m`), fixos
+                       durante a vida do planner
+        """
+        self.frame = frame
+        self.obstacles = obstacles
+        # Obstáculos em ENU (east, north, raio), convertidos uma vez
+        self._obstacles_enu = tuple((*frame.to_enu(o['position']['lat'], o['position']['lon']), o['radius_m'])
+                                    for o in obstacles)
+        self._cache: Dict[tuple, CoveragePlan] = {}
+        self.stats = {'plans_computed': 0, 'cache_hits': 0}
+
+    def plan(self, zone: Dict[str, float], work_width_m: float, robot_width_m: float = 0.0) -> CoveragePlan:
+        """
+        Plano de cobertura de uma zona (do cache, se já calculado)
+
+        Args:
+            zone: Bounds GPS da zona (lat_min, lat_max, lon_min, lon_max)
+            work_width_m: Largura de trabalho (espaçamento entre linhas)
+            robot_width_m: Largura do robô (infla os obstáculos)
+
+        Returns:
+            Plano compartilhado (não alterar)
+        """
+        key = (round(zone['lat_min'], 7), round(zone['lat_max'], 7),
+               round(zone['lon_min'], 7), round(zone['lon_max'], 7),
+               work_width_m, robot_width_m)
+
+        plan = self._cache.get(key)
+        if plan is not None:
+            self.stats['cache_hits'] += 1
+            return plan
+
+        plan = self._build(zone, work_width_m, robot_width_m)
+        self._cache[key] = plan
+        self.stats['plans_computed'] += 1
+        return plan
+
+    @staticmethod
+    def zone_for_mission(mission: Dict[str, Any], field_bounds: Dict[str, float]) -> Dict[str, float]:
+        """
+        Zona coberta pela missão
+
+        Usa `mission['zone_bounds']` (faixa do MissionAllocator) se existir;
+        senão, o campo inteiro. As duas não dependem da posição do robô, então
+        robôs na mesma faixa ou sem faixa compartilham o plano do cache (cada
+        um começa no waypoint mais próximo).
+        """
+        return mission.get('zone_bounds', field_bounds)
+
+    def _build(self, zone: Dict[str, float], work_width_m: float, robot_width_m: float) -> CoveragePlan:
+        """Linhas boustrophedon com desvio de obstáculos"""
+        frame = self.frame
+        east_min, north_min = frame.to_enu(zone['lat_min'], zone['lon_min'])
+        east_max, north_max = frame.to_enu(zone['lat_max'], zone['lon_max'])
+
+        # Linhas ao longo da maior dimensão (menos manobras de cabeceira)
+        along_east = (east_max - east_min) >= (north_max - north_min)
+        if along_east:
+            along_min, along_max, across_min, across_max = east_min, east_max, north_min, north_max
+        else:
+            along_min, along_max, across_min, across_max = north_min, north_max, east_min, east_max
+
+        # Obstáculos em coordenadas (ao longo, através), com raio inflado
+        clearance = robot_width_m / 2 + OBSTACLE_MARGIN_M
+        circles = []
+        for east, north, radius_m in self._obstacles_enu:
+            along, across = (east, north) if along_east else (north, east)
+            circles.append((along, across, radius_m + clearance))
+
+        easts = array('d')
+        norths = array('d')
+
+        def add(along: float, across: float):
+            if along_east:
+                easts.append(along)
+                norths.append(across)
+            else:
+                easts.append(across)
+                norths.append(along)
+
+        row_count = max(1, int((across_max - across_min) // work_width_m))
+        for row in range(row_count):
+            across = across_min + (row + 0.5) * work_width_m
+            forward = row % 2 == 0
+            start, end = (along_min, along_max) if forward else (along_max, along_min)
+
+            add(start, across)
+            for box in self._row_detours(circles, across, along_min, along_max, forward):
+                for point in box:
+                    add(*point)
+            add(end, across)
+
+        return CoveragePlan(frame, easts, norths, row_count, work_width_m, dict(zone))
+
+    def _row_detours(self, circles: List[Tuple[float, float, float]], across: float,
+                     along_min: float, along_max: float, forward: bool) -> List[List[Tuple[float, float]]]:
+        """Caixas de desvio (4 waypoints) para os obstáculos que cruzam a linha"""
+        blocking = sorted((c for c in circles
+                           if abs(c[1] - across) < c[2] and along_min < c[0] < along_max),
+                          key=lambda c: c[0])
+
+        # Obstáculos com caixas sobrepostas viram um único desvio
+        groups: List[List[Tuple[float, float, float]]] = []
+        for circle in blocking:
+            if groups and circle[0] - circle[2] <= max(c[0] + c[2] for c in groups[-1]):
+                groups[-1].append(circle)
+            else:
+                groups.append([circle])
+
+        boxes = []
+        for group in groups:
+            low = min(c[0] - c[2] for c in group)
+            high = max(c[0] + c[2] for c in group)
+            center = sum(c[1] for c in group) / len(group)
+            # Contorna pelo lado em que a linha já está (desvio mais curto)
+            if across >= center:
+                offset = max(c[1] + c[2] for c in group)
+            else:
+                offset = min(c[1] - c[2] for c in group)
+            box = [(low, across), (low, offset), (high, offset), (high, across)]
+            boxes.append(box if forward else box[::-1])
+
+        return boxes if forward else boxes[::-1]
+
+
+class PathFollower:
+    """Seguidor de caminho por lookahead (custo constante por tick)"""
+
+    def __init__(self, plan: CoveragePlan, start_index: int = 0, lookahead_m: float = 3.0,
+                 mission_id: Optional[str] = None):
+        """
+        Inicializa seguidor
+
+        Args:
+            plan: Plano a seguir
+            start_index: Primeiro waypoint alvo
+            lookahead_m: Distância em que o waypoint alvo é considerado alcançado
+            mission_id: Missão dona do caminho (troca de missão = novo seguidor)
+        """
+        self.plan = plan
+        self.index = start_index
+        self.lookahead_m = lookahead_m
+        self.mission_id = mission_id
+
+    @property
+    def finished(self) -> bool:
+        return self.index >= len(self.plan)
+
+    def target_heading(self, lat: float, lon: float) -> Optional[float]:
+        """
+        Rumo (0-360°) para o waypoint alvo
+
+        Avança o alvo enquanto ele estiver dentro do lookahead ou já tiver
+        ficado para trás (projeção no segmento além do fim).
+
+        Returns:
+            Rumo alvo, ou None quando o caminho terminou
+        """
+        plan = self.plan
+        easts, norths = plan.easts, plan.norths
+        east, north = plan.frame.to_enu(lat, lon)
+        lookahead2 = self.lookahead_m * self.lookahead_m
+        count = len(easts)
+
+        index = self.index
+        while index < count:
+            de = easts[index] - east
+            dn = norths[index] - north
+            if de * de + dn * dn > lookahead2:
+                if index == 0:
+                    break
+                # Já passou do waypoint ao longo do segmento que termina nele?
+                se = easts[index] - easts[index - 1]
+                sn = norths[index] - norths[index - 1]
+                if se * de + sn * dn >= 0:
+                    break
+            index += 1
+        self.index = index
+
+        if index >= count:
+            return None
+        return (math.degrees(math.atan2(easts[index] - east, norths[index] - north)) + 360) % 360
+
+
+def main():
+    """Testa planos, cache e o seguidor no robô de colheita do exemplo"""
+    import json
+    import time
+
+    print("🗺️  Simulator - Coverage Planner Mock")
+    print("=" * 70)
+
+    with open('example_simulation_data.json', 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    terrain = data['environment']['terrain']
+    frame = LocalENU.from_bounds(terrain['bounds'])
+    planner = CoveragePlanner(frame, terrain['obstacles'])
+
+    robot = data['robots'][1]
+    mission = robot['state']['mission']
+    zone = planner.zone_for_mission(mission, terrain['bounds'])
+
+    start = time.perf_counter()
+    plan = planner.plan(zone, 2.0, robot['physics']['dimensions_m']['width'])
+    plan_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    for _ in range(1000):
+        planner.plan(zone, 2.0, robot['physics']['dimensions_m']['width'])
+    cached_us = (time.perf_counter() - start) / 1000 * 1e6
+
+    east_min, north_min = frame.to_enu(zone['lat_min'], zone['lon_min'])
+    east_max, north_max = frame.to_enu(zone['lat_max'], zone['lon_max'])
+    area_ha = (east_max - east_min) * (north_max - north_min) / 10000
+    print(f"\n📐 PLANO ({robot['robot_id']}, {mission['mission_id']}, sem zone_bounds → campo):")
+    print(f"   Zona: {area_ha:.1f} ha | "
+          f"{plan.row_count} linhas de {plan.work_width_m} m | {len(plan)} waypoints | {plan.length_m / 1000:.1f} km")
+    print(f"   Cálculo: {plan_ms:.1f} ms | do cache: {cached_us:.1f} µs | "
+          f"{planner.stats['plans_computed']} calculado, {planner.stats['cache_hits']} hits")
+    detours = (len(plan) - 2 * plan.row_count) // 4
+    print(f"   Desvios de obstáculo: {detours}")
+
+    shared = sum(planner.plan(planner.zone_for_mission(other['state']['mission'], terrain['bounds']), 2.0,
+                              robot['physics']['dimensions_m']['width']) is plan
+                 for other in data['robots'])
+    print(f"   Robôs do exemplo no mesmo plano: {shared}/{len(data['robots'])} (posições diferentes)")
+
+    wider = planner.plan(zone, 4.0, robot['physics']['dimensions_m']['width'])
+    print(f"   Largura 4 m: {wider.row_count} linhas, {wider.length_m / 1000:.1f} km (novo plano no cache)")
+
+    # Seguidor: robô cinemático ideal a 1.2 m/s com giro limitado
+    follower = PathFollower(plan)
+    lat, lon = plan.waypoint(0)
+    heading = 90.0
+    speed, dt, max_turn_deg_s = 1.2, 0.1, 45.0
+    ticks = 0
+    start = time.perf_counter()
+    while ticks < 20000:
+        target = follower.target_heading(lat, lon)
+        if target is None:
+            break
+        error = (target - heading + 180) % 360 - 180
+        heading = (heading + max(-max_turn_deg_s * dt, min(max_turn_deg_s * dt, error))) % 360
+        east, north = frame.to_enu(lat, lon)
+        east += speed * dt * math.sin(math.radians(heading))
+        north += speed * dt * math.cos(math.radians(heading))
+        lat, lon = frame.to_geodetic(east, north)
+        ticks += 1
+    follow_us = (time.perf_counter() - start) / max(ticks, 1) * 1e6
+
+    print(f"\n🚜 SEGUIDOR ({ticks} ticks, {ticks * dt:.0f}s):")
+    print(f"   Waypoint {follower.index}/{len(plan)} | {follow_us:.1f} µs/tick (inclui integração)")
+
+    print(f"\n✅ Coverage planner funcionando!")
+
+
+if __name__ == '__main__':
+    main()
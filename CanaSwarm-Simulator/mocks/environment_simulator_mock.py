@@ -10,54 +10,94 @@ Date: 2026-02-20
 
 import json
 import math
-import random
 from datetime import datetime, timedelta
-from typing import Dict, List, Tuple, Any
+from typing import Dict, List, Tuple, Any, Optional
+
+from coverage_planner_mock import CoveragePlanner
+from geodesy_mock import LocalENU, LocalPointSet
+from rng_streams_mock import RNGStreams
+from scheduler_mock import MultiRateScheduler
+from terrain_raster_mock import TerrainRaster
 
 
 class EnvironmentSimulator:
     """Simulador de ambiente para robôs agrícolas"""
     
-    def __init__(self, environment_data: Dict[str, Any], config: Dict[str, Any]):
+    def __init__(self, environment_data: Dict[str, Any], config: Dict[str, Any],
+                 rng_streams: Optional[RNGStreams] = None):
         """
         Inicializa environment simulator
         
         Args:
             environment_data: Dados iniciais do ambiente
             config: Configuração da simulação
+            rng_streams: Streams aleatórios da simulação (default: seed de `config['random_seed']`)
         """
         self.environment = environment_data.copy()
         self.config = config
         self.timestep = config.get('timestep_seconds', 0.1)
+        self.rng_streams = rng_streams or RNGStreams.from_config(config)
+        self.rng = self.rng_streams.stream('environment.weather')
         self.current_time = datetime.fromisoformat(environment_data.get('solar', {}).get('date', '2026-02-20') + 'T00:00:00')
         
+        # Campos espaciais rasterizados uma vez (ou mapeados de disco: DEM/NDVI reais)
+        self.height_raster, self.density_raster = self._build_rasters()
+        
+        # Referencial plano do campo: obstáculos projetados uma vez (ver check_obstacle_at)
+        self.frame = LocalENU.from_bounds(self.environment['terrain']['bounds'])
+        self._obstacle_points: Optional[LocalPointSet] = None
+        
+        # Planos de cobertura compartilhados pelos robôs (cache por zona e largura)
+        self.coverage_planner = CoveragePlanner(self.frame, self.environment['terrain'].get('obstacles', []))
+        
+        # Subsistemas em taxas próprias (clima ~1s, sol ~1min, plantação ~1h)
+        self.scheduler = MultiRateScheduler()
+        if config.get('weather_simulation', True):
+            self.scheduler.add_task('weather', config.get('weather_update_seconds', 1.0),
+                                    self._update_weather, run_immediately=True)
+        if config.get('solar_simulation', True):
+            self.scheduler.add_task('solar', config.get('solar_update_seconds', 60.0),
+                                    self._update_solar, run_immediately=True)
+        self.scheduler.add_task('plantation', config.get('plantation_update_seconds', 3600.0),
+                                self._update_plantation)
+        
     def update_environment(self, elapsed_seconds: float) -> Dict[str, Any]:
         """
         Atualiza estado do ambiente
         
+        O relógio avança sempre; clima, sol e plantação só são recalculados
+        quando vence o período de cada um (ver MultiRateScheduler).
+        
         Args:
-            elapsed_seconds: Tempo decorrido desde início da simulação
+            elapsed_seconds: Tempo decorrido desde a última atualização
             
         Returns:
             Estado atualizado do ambiente
         """
         self.current_time = self.current_time + timedelta(seconds=elapsed_seconds)
         
-        # Atualizar componentes do ambiente
-        if self.config.get('weather_simulation', True):
-            self._update_weather(elapsed_seconds)
-        
-        if self.config.get('solar_simulation', True):
-            self._update_solar(elapsed_seconds)
-        
-        self._update_plantation(elapsed_seconds)
+        # Atualizar componentes do ambiente que venceram
+        self.scheduler.advance(elapsed_seconds)
         
         return self.environment.copy()
     
+    def _random_walk_step(self, low: float, high: float, steps: float) -> float:
+        """
+        Soma de `steps` passos uniformes [low, high) em um único sorteio
+        
+        Preserva média e variância do passeio aleatório original (calibrado
+        por timestep) quando o clima é atualizado com período maior.
+        """
+        mean = (low + high) / 2
+        return mean * steps + (self.rng.uniform(low, high) - mean) * math.sqrt(steps)
+    
     def _update_weather(self, elapsed_seconds: float):
         """Atualiza condições climáticas"""
         weather = self.environment['weather']
         
+        # Número de timesteps representados por esta atualização
+        steps = elapsed_seconds / self.timestep
+        
         # Temperatura varia com hora do dia (modelo simplificado sinusoidal)
         hour = self.current_time.hour + self.current_time.minute / 60
         temp_base = 25  # Temp média
@@ -65,7 +105,7 @@ class EnvironmentSimulator:
         temp_peak_hour = 14  # Pico às 14h
         
         temperature_c = temp_base + temp_amplitude * math.sin(2 * math.pi * (hour - 6) / 24)
-        temperature_c += random.uniform(-0.5, 0.5)  # Ruído
+        temperature_c += self.rng.uniform(-0.5, 0.5)  # Ruído
         
         # Umidade inversamente proporcional a temperatura
         humidity_base = 70
@@ -73,22 +113,23 @@ class EnvironmentSimulator:
         humidity_percent = max(30, min(95, humidity_percent))
         
         # Vento varia aleatoriamente
-        wind_change = random.uniform(-0.2, 0.2)
+        wind_change = self._random_walk_step(-0.2, 0.2, steps)
         wind_speed_ms = weather['wind_speed_ms'] + wind_change
         wind_speed_ms = max(0, min(15, wind_speed_ms))
         
         # Direção do vento muda lentamente
-        wind_direction_change = random.uniform(-2, 2)
+        wind_direction_change = self._random_walk_step(-2, 2, steps)
         wind_direction_deg = (weather['wind_direction_deg'] + wind_direction_change) % 360
         
         # Precipitação (modelo simples: probabilidade baseada em cloud cover)
         cloud_cover = weather['cloud_cover_percent']
-        if random.random() < (cloud_cover / 100) * 0.01:  # 1% chance por timestep se 100% nuvens
-            precipitation_mm_per_hour = random.uniform(0, 10)
+        rain_probability = 1 - (1 - (cloud_cover / 100) * 0.01) ** steps  # 1% chance por timestep se 100% nuvens
+        if self.rng.random() < rain_probability:
+            precipitation_mm_per_hour = self.rng.uniform(0, 10)
             cloud_cover = min(100, cloud_cover + 5)
         else:
-            precipitation_mm_per_hour = max(0, weather['precipitation_mm_per_hour'] - 0.1)
-            cloud_cover = max(0, cloud_cover + random.uniform(-1, 0.5))
+            precipitation_mm_per_hour = max(0, weather['precipitation_mm_per_hour'] - 0.1 * steps)
+            cloud_cover = max(0, cloud_cover + self._random_walk_step(-1, 0.5, steps))
         
         # Condições meteorológicas
         if precipitation_mm_per_hour > 5:
@@ -197,6 +238,27 @@ class EnvironmentSimulator:
         max_biomass = 100000
         plantation['biomass_kg_per_ha'] = (plantation['maturity']['avg_percent'] / 100) * max_biomass
     
+    def _build_rasters(self) -> Tuple[TerrainRaster, TerrainRaster]:
+        """Rasteriza altura do terreno e densidade de plantas"""
+        terrain = self.environment['terrain']
+        bounds = terrain['bounds']
+        resolution_m = self.config.get('raster_resolution_m', 5.0)
+        
+        height_path = terrain.get('elevation', {}).get('raster_path')
+        if height_path:
+            height_raster = TerrainRaster.from_file(height_path)
+        else:
+            height_raster = TerrainRaster.from_function(bounds, resolution_m, self._terrain_height_model)
+        
+        density_path = self.environment.get('plantation', {}).get('density_raster_path')
+        if density_path:
+            density_raster = TerrainRaster.from_file(density_path, outside_value=0.0)
+        else:
+            density_raster = TerrainRaster.from_function(bounds, resolution_m, self._plant_density_model,
+                                                         outside_value=0.0)
+        
+        return height_raster, density_raster
+    
     def get_terrain_height(self, lat: float, lon: float) -> float:
         """
         Obtém altura do terreno em uma posição GPS
@@ -205,8 +267,32 @@ class EnvironmentSimulator:
             lat, lon: Coordenadas GPS
             
         Returns:
-            Altura em metros
+            Altura em metros (interpolação bilinear do raster)
+        """
+        return self.height_raster.sample(lat, lon)
+    
+    def get_terrain_heights(self, lats: List[float], lons: List[float]) -> List[float]:
+        """Altura do terreno para várias posições"""
+        return self.height_raster.sample_batch(lats, lons)
+    
+    def get_plant_density(self, lat: float, lon: float) -> float:
+        """
+        Obtém densidade de plantas em uma posição
+        
+        Args:
+            lat, lon: Coordenadas GPS
+            
+        Returns:
+            Densidade (0-1, 1 = densidade máxima; 0 fora da área plantada)
         """
+        return self.density_raster.sample(lat, lon)
+    
+    def get_plant_densities(self, lats: List[float], lons: List[float]) -> List[float]:
+        """Densidade de plantas para várias posições"""
+        return self.density_raster.sample_batch(lats, lons)
+    
+    def _terrain_height_model(self, lat: float, lon: float) -> float:
+        """Modelo de elevação analítico usado para gerar o raster"""
         terrain = self.environment['terrain']
         bounds = terrain['bounds']
         elevation = terrain['elevation']
@@ -227,25 +313,9 @@ class EnvironmentSimulator:
         
         return height
     
-    def get_plant_density(self, lat: float, lon: float) -> float:
-        """
-        Obtém densidade de plantas em uma posição
-        
-        Args:
-            lat, lon: Coordenadas GPS
-            
-        Returns:
-            Densidade (0-1, 1 = densidade máxima)
-        """
-        plantation = self.environment['plantation']
-        
-        # Verificar se está dentro da área plantada
-        terrain = self.environment['terrain']
-        bounds = terrain['bounds']
-        
-        if not (bounds['lat_min'] <= lat <= bounds['lat_max'] and
-                bounds['lon_min'] <= lon <= bounds['lon_max']):
-            return 0.0
+    def _plant_density_model(self, lat: float, lon: float) -> float:
+        """Modelo de densidade analítico usado para gerar o raster"""
+        bounds = self.environment['terrain']['bounds']
         
         # Densidade varia com posição (áreas com falhas na plantação)
         lat_norm = (lat - bounds['lat_min']) / (bounds['lat_max'] - bounds['lat_min'])
@@ -272,15 +342,15 @@ class EnvironmentSimulator:
         obstacles_found = []
         obstacles = self.environment['terrain'].get('obstacles', [])
         
-        for obstacle in obstacles:
-            obs_lat = obstacle['position']['lat']
-            obs_lon = obstacle['position']['lon']
-            obs_radius = obstacle['radius_m']
-            
-            # Distância (Haversine)
-            distance = self._haversine_distance(lat, lon, obs_lat, obs_lon)
-            
-            if distance < (radius_m + obs_radius):
+        if not obstacles:
+            return obstacles_found
+        if self._obstacle_points is None or not self._obstacle_points.is_current(obstacles):
+            self._obstacle_points = LocalPointSet.from_obstacles(obstacles, self.frame)
+        
+        distances = self._obstacle_points.distances_from(lat, lon)
+        
+        for obstacle, distance in zip(obstacles, distances):
+            if distance < (radius_m + obstacle['radius_m']):
                 obstacles_found.append({
                     'type': obstacle['type'],
                     'distance_m': distance,
@@ -289,20 +359,6 @@ class EnvironmentSimulator:
         
         return obstacles_found
     
-    def _haversine_distance(self, lat1: float, lon1: float, lat2: float, lon2: float) -> float:
-        """Calcula distância Haversine"""
-        R = 6371000  # Raio da Terra em metros
-        
-        phi1 = math.radians(lat1)
-        phi2 = math.radians(lat2)
-        delta_phi = math.radians(lat2 - lat1)
-        delta_lambda = math.radians(lon2 - lon1)
-        
-        a = math.sin(delta_phi/2)**2 + math.cos(phi1) * math.cos(phi2) * math.sin(delta_lambda/2)**2
-        c = 2 * math.atan2(math.sqrt(a), math.sqrt(1-a))
-        
-        return R * c
-    
     def get_environment_summary(self) -> Dict[str, Any]:
         """Retorna resumo do estado do ambiente"""
         weather = self.environment['weather']
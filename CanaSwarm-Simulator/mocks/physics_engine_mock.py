@@ -11,7 +11,10 @@ Date: 2026-02-20
 import json
 import math
 from datetime import datetime, timedelta
-from typing import Dict, List, Tuple, Any
+from typing import Dict, List, Tuple, Any, Optional
+
+from battery_model_mock import BatteryModel
+from geodesy_mock import LocalPointSet
 
 
 class PhysicsEngine:
@@ -28,46 +31,60 @@ class PhysicsEngine:
         self.timestep = config.get('timestep_seconds', 0.1)
         self.collision_detection = config.get('collision_detection', True)
         self.gravity = 9.81  # m/s²
+        self.terrain_raster = None  # Raster de altura (ver attach_terrain)
+        self._obstacle_points: Optional[LocalPointSet] = None  # Obstáculos projetados em ENU
+        self.battery_model = BatteryModel.from_config(config)  # Tabelas OCV/R, estado em precisão total
+        
+    def attach_terrain(self, height_raster):
+        """
+        Associa raster de altura do terreno (TerrainRaster)
+        
+        Com raster, a altitude do robô acompanha o relevo em vez do ponto
+        médio constante da faixa de elevação.
+        """
+        self.terrain_raster = height_raster
         
-    def update_robot_physics(self, robot: Dict[str, Any], environment: Dict[str, Any]) -> Dict[str, Any]:
+    def update_robot_physics(self, robot: Dict[str, Any], environment: Dict[str, Any],
+                             dt: Optional[float] = None) -> Dict[str, Any]:
         """
         Atualiza física do robô (posição, velocidade, forças)
         
         Args:
             robot: Estado atual do robô
             environment: Estado do ambiente (terreno, clima)
+            dt: Passo de integração (default: timestep da simulação)
             
         Returns:
-            Estado atualizado do robô com novos valores de física
+            Estado do robô (atualizado no próprio objeto) e forças/colisões
         """
+        dt = self.timestep if dt is None else dt
         state = robot['state']
         physics = robot['physics']
         
         # 1. Calcular forças atuantes
         forces = self._calculate_forces(state, physics, environment)
         
+        # 2-4. Integração escrita no próprio estado (sem cópias por passo)
+        acceleration = state.get('acceleration')
+        if acceleration is None:
+            acceleration = state['acceleration'] = {}
+        
         # 2. Atualizar aceleração (F = ma)
-        acceleration = self._calculate_acceleration(forces, physics['mass_kg'])
+        self._calculate_acceleration(forces, physics['mass_kg'], acceleration)
         
         # 3. Atualizar velocidade (v = v0 + at)
-        velocity = self._update_velocity(state['velocity'], acceleration, self.timestep)
+        velocity = self._update_velocity(state['velocity'], acceleration, dt)
         
         # 4. Atualizar posição (s = s0 + vt)
-        position = self._update_position(state['position'], velocity, self.timestep, environment)
+        position = self._update_position(state['position'], velocity, dt, environment)
         
         # 5. Detectar colisões
         collisions = []
         if self.collision_detection:
             collisions = self._detect_collisions(position, robot, environment)
         
-        # 6. Atualizar estado
-        updated_state = state.copy()
-        updated_state['position'] = position
-        updated_state['velocity'] = velocity
-        updated_state['acceleration'] = acceleration
-        
         return {
-            'state': updated_state,
+            'state': state,
             'forces': forces,
             'collisions': collisions
         }
@@ -85,7 +102,7 @@ class PhysicsEngine:
         air_density = 1.225  # kg/m³ at sea level
         frontal_area = physics['dimensions_m']['width'] * physics['dimensions_m']['height']
         velocity_ms = state['velocity']['linear_ms']
-        drag_force = 0.5 * air_density * physics['drag_coefficient'] * frontal_area * (velocity_ms ** 2)
+        drag_force = 0.5 * air_density * physics.get('drag_coefficient', 0.7) * frontal_area * (velocity_ms ** 2)
         
         # Força gravitacional em declive (Fg = m × g × sin(θ))
         terrain = environment.get('terrain', {})
@@ -128,8 +145,8 @@ class PhysicsEngine:
         
         return force
     
-    def _calculate_acceleration(self, forces: Dict, mass_kg: float) -> Dict[str, float]:
-        """Calcula aceleração linear e angular"""
+    def _calculate_acceleration(self, forces: Dict, mass_kg: float, acceleration: Dict) -> Dict[str, float]:
+        """Calcula aceleração linear e angular (escreve em `acceleration`)"""
         
         # Aceleração linear (a = F/m)
         linear_ms2 = forces['net_force_n'] / mass_kg if mass_kg > 0 else 0
@@ -138,13 +155,12 @@ class PhysicsEngine:
         # Em simulação real, seria momento de inércia × aceleração angular
         angular_deg_per_s2 = 0.0  # Calculado separadamente pelo steering
         
-        return {
-            'linear_ms2': linear_ms2,
-            'angular_deg_per_s2': angular_deg_per_s2
-        }
+        acceleration['linear_ms2'] = linear_ms2
+        acceleration['angular_deg_per_s2'] = angular_deg_per_s2
+        return acceleration
     
     def _update_velocity(self, velocity: Dict, acceleration: Dict, dt: float) -> Dict[str, float]:
-        """Atualiza velocidade baseado em aceleração"""
+        """Atualiza velocidade baseado em aceleração (no próprio `velocity`)"""
         
         # v = v0 + a×t
         linear_ms = velocity['linear_ms'] + acceleration['linear_ms2'] * dt
@@ -154,13 +170,12 @@ class PhysicsEngine:
         linear_ms = max(0, min(linear_ms, 3.0))  # Max 3 m/s
         angular_deg_per_s = max(-45, min(angular_deg_per_s, 45))  # Max ±45°/s
         
-        return {
-            'linear_ms': linear_ms,
-            'angular_deg_per_s': angular_deg_per_s
-        }
+        velocity['linear_ms'] = linear_ms
+        velocity['angular_deg_per_s'] = angular_deg_per_s
+        return velocity
     
     def _update_position(self, position: Dict, velocity: Dict, dt: float, environment: Dict) -> Dict[str, float]:
-        """Atualiza posição baseado em velocidade"""
+        """Atualiza posição baseado em velocidade (no próprio `position`)"""
         
         # Movimento linear
         distance_m = velocity['linear_ms'] * dt
@@ -173,23 +188,31 @@ class PhysicsEngine:
         new_lat = position['lat'] + lat_change
         new_lon = position['lon'] + lon_change
         
-        # Atualizar altitude baseado em terreno (simplificado)
-        terrain = environment.get('terrain', {})
-        elevation_min = terrain.get('elevation', {}).get('min_m', 580)
-        elevation_max = terrain.get('elevation', {}).get('max_m', 610)
-        # Altitude varia com posição (modelo simplificado)
-        altitude_m = elevation_min + (elevation_max - elevation_min) * 0.5
+        # Atualizar altitude baseado em terreno
+        if self.terrain_raster is not None:
+            altitude_m = self.terrain_raster.sample(new_lat, new_lon)
+        else:
+            # Sem raster: ponto médio da faixa de elevação
+            terrain = environment.get('terrain', {})
+            elevation_min = terrain.get('elevation', {}).get('min_m', 580)
+            elevation_max = terrain.get('elevation', {}).get('max_m', 610)
+            altitude_m = elevation_min + (elevation_max - elevation_min) * 0.5
         
         # Rotação
         heading_deg = position['heading_deg'] + velocity['angular_deg_per_s'] * dt
         heading_deg = heading_deg % 360  # Normalizar 0-360
         
-        return {
-            'lat': new_lat,
-            'lon': new_lon,
-            'altitude_m': altitude_m,
-            'heading_deg': heading_deg
-        }
+        position['lat'] = new_lat
+        position['lon'] = new_lon
+        position['altitude_m'] = altitude_m
+        position['heading_deg'] = heading_deg
+        return position
+    
+    def detect_collisions(self, robot: Dict[str, Any], environment: Dict[str, Any]) -> List[Dict]:
+        """Colisões na posição atual do robô (vazio se a detecção está desligada)"""
+        if not self.collision_detection:
+            return []
+        return self._detect_collisions(robot['state']['position'], robot, environment)
     
     def _detect_collisions(self, position: Dict, robot: Dict, environment: Dict) -> List[Dict]:
         """Detecta colisões com obstáculos e outros objetos"""
@@ -202,14 +225,17 @@ class PhysicsEngine:
         # Verificar colisões com obstáculos
         obstacles = environment.get('terrain', {}).get('obstacles', [])
         
-        for obstacle in obstacles:
-            obs_lat = obstacle['position']['lat']
-            obs_lon = obstacle['position']['lon']
+        if not obstacles:
+            return collisions
+        if self._obstacle_points is None or not self._obstacle_points.is_current(obstacles):
+            self._obstacle_points = LocalPointSet.from_obstacles(obstacles)
+        
+        # Distância entre robô e cada obstáculo (projeção local do campo)
+        distances = self._obstacle_points.distances_from(robot_lat, robot_lon)
+        
+        for obstacle, distance_m in zip(obstacles, distances):
             obs_radius = obstacle['radius_m']
             
-            # Distância entre robô e obstáculo
-            distance_m = self._haversine_distance(robot_lat, robot_lon, obs_lat, obs_lon)
-            
             # Colisão se distância < soma dos raios
             if distance_m < (robot_radius + obs_radius):
                 collisions.append({
@@ -222,33 +248,21 @@ class PhysicsEngine:
         
         return collisions
     
-    def _haversine_distance(self, lat1: float, lon1: float, lat2: float, lon2: float) -> float:
-        """Calcula distância entre dois pontos GPS (Haversine)"""
-        R = 6371000  # Raio da Terra em metros
-        
-        phi1 = math.radians(lat1)
-        phi2 = math.radians(lat2)
-        delta_phi = math.radians(lat2 - lat1)
-        delta_lambda = math.radians(lon2 - lon1)
-        
-        a = math.sin(delta_phi/2)**2 + math.cos(phi1) * math.cos(phi2) * math.sin(delta_lambda/2)**2
-        c = 2 * math.atan2(math.sqrt(a), math.sqrt(1-a))
-        
-        distance = R * c
-        return distance
-    
-    def update_battery_physics(self, robot: Dict[str, Any], environment: Dict[str, Any]) -> Dict[str, Any]:
+    def update_battery_physics(self, robot: Dict[str, Any], environment: Dict[str, Any],
+                               dt: Optional[float] = None) -> Dict[str, Any]:
         """
         Atualiza física da bateria (consumo, carga, temperatura)
         
         Args:
             robot: Estado do robô
             environment: Estado do ambiente (solar irradiance)
+            dt: Passo de integração (default: timestep da simulação)
             
         Returns:
-            Estado atualizado da bateria
+            Bateria (atualizada no próprio objeto) e balanço de potência
         """
-        battery = robot['state']['battery'].copy()
+        dt = self.timestep if dt is None else dt
+        battery = robot['state']['battery']
         actuators = robot['state']['actuators']
         
         # 1. Calcular consumo total de potência
@@ -263,49 +277,100 @@ class PhysicsEngine:
         # 3. Potência líquida (negativo = descarga, positivo = carga)
         power_net_w = power_solar_w - power_consumption_w
         
-        # 4. Atualizar SOC (State of Charge)
-        capacity_wh = battery['capacity_ah'] * battery['voltage_v']
-        energy_change_wh = (power_net_w * self.timestep) / 3600  # W×s → Wh
-        soc_change_percent = (energy_change_wh / capacity_wh) * 100
+        # 4. SOC, tensão, corrente e temperatura pelo modelo de tabelas (sem arredondar:
+        #    o arredondamento por passo congelava deltas pequenos; só a exportação arredonda)
+        ambient_temp = environment.get('weather', {}).get('temperature_c', 25)
+        self.battery_model.step(battery, power_net_w, ambient_temp, dt, key=robot.get('robot_id'))
+        energy_change_wh = (power_net_w * dt) / 3600  # W×s → Wh
         
-        new_soc = battery['soc_percent'] + soc_change_percent
-        new_soc = max(0, min(100, new_soc))  # Limitar 0-100%
+        return {
+            'battery': battery,
+            'power_consumption_w': power_consumption_w,
+            'power_solar_w': power_solar_w,
+            'power_net_w': power_net_w,
+            'energy_change_wh': energy_change_wh
+        }
+    
+    def battery_power_balance(self, robot: Dict[str, Any], environment: Dict[str, Any],
+                              cpu_usage_percent: Optional[float] = None) -> Dict[str, float]:
+        """
+        Balanço de potência da bateria no estado atual dos atuadores
         
-        # 5. Atualizar corrente (I = P/V)
-        new_current_a = power_net_w / battery['voltage_v'] if battery['voltage_v'] > 0 else 0
+        Args:
+            robot: Estado do robô
+            environment: Estado do ambiente (solar irradiance)
+            cpu_usage_percent: Carga de CPU a considerar (default: a do health atual)
+            
+        Returns:
+            Consumo, geração solar e potência líquida (W)
+        """
+        state = robot['state']
+        power_consumption_w = self._calculate_power_consumption(state['actuators'], state, cpu_usage_percent)
         
-        # 6. Atualizar temperatura (modelo simplificado)
-        ambient_temp = environment.get('weather', {}).get('temperature_c', 25)
-        heat_generation = abs(power_net_w) * 0.1  # 10% de perdas térmicas
-        temp_rise = heat_generation / 1000  # Simplificado
-        
-        new_temp = battery['temperature_c'] + (temp_rise - (battery['temperature_c'] - ambient_temp) * 0.01) * self.timestep
-        new_temp = max(ambient_temp - 5, min(70, new_temp))  # Limites realistas
-        
-        # 7. Atualizar tensão baseado em SOC (curva simplificada)
-        nominal_voltage = 48.0
-        voltage_range = 6.0  # 45-51V
-        new_voltage = nominal_voltage + (new_soc - 50) * (voltage_range / 100)
-        
-        battery_updated = {
-            'soc_percent': round(new_soc, 1),
-            'voltage_v': round(new_voltage, 1),
-            'current_a': round(new_current_a, 1),
-            'temperature_c': round(new_temp, 1),
-            'capacity_ah': battery['capacity_ah'],
-            'charging': battery['charging'],
-            'cycles': battery['cycles']
-        }
+        power_solar_w = 0
+        if state['battery'].get('charging', False):
+            power_solar_w = self._calculate_solar_charging(environment.get('solar', {}), robot)
         
         return {
-            'battery': battery_updated,
             'power_consumption_w': power_consumption_w,
             'power_solar_w': power_solar_w,
+            'power_net_w': power_solar_w - power_consumption_w
+        }
+    
+    def time_to_soc(self, battery: Dict[str, Any], power_net_w: float, target_soc: float) -> float:
+        """
+        Tempo até o SOC atingir `target_soc` sob potência líquida constante
+        
+        Delegado ao `BatteryModel` (tabela de energia química pré-integrada).
+        
+        Returns:
+            Segundos até o evento (inf se o SOC não caminha para o alvo)
+        """
+        return self.battery_model.time_to_soc(battery, power_net_w, target_soc)
+    
+    def time_to_battery_temperature(self, battery: Dict[str, Any], power_net_w: float,
+                                    ambient_temp_c: float, target_temp_c: float) -> float:
+        """
+        Tempo até a temperatura da bateria cruzar `target_temp_c` (potência constante)
+        
+        Returns:
+            Segundos até o evento (inf se a temperatura não cruza o alvo)
+        """
+        return self.battery_model.time_to_temperature(battery, power_net_w, ambient_temp_c, target_temp_c)
+    
+    def advance_battery(self, robot: Dict[str, Any], environment: Dict[str, Any],
+                        duration_s: float, power_balance: Dict[str, float]) -> Dict[str, Any]:
+        """
+        Avança a bateria `duration_s` segundos de uma vez sob potência constante
+        
+        Solução analítica do mesmo modelo de `update_battery_physics`: usada
+        para robôs parados (idle/carregando), onde a potência não muda até o
+        próximo evento.
+        
+        Args:
+            robot: Estado do robô
+            environment: Estado do ambiente
+            duration_s: Intervalo a avançar
+            power_balance: Resultado de `battery_power_balance`
+            
+        Returns:
+            Mesmo formato de `update_battery_physics`
+        """
+        battery = robot['state']['battery']
+        power_net_w = power_balance['power_net_w']
+        ambient_temp = environment.get('weather', {}).get('temperature_c', 25)
+        self.battery_model.advance(battery, power_net_w, ambient_temp, duration_s, key=robot.get('robot_id'))
+        
+        return {
+            'battery': battery,
+            'power_consumption_w': power_balance['power_consumption_w'],
+            'power_solar_w': power_balance['power_solar_w'],
             'power_net_w': power_net_w,
-            'energy_change_wh': energy_change_wh
+            'energy_change_wh': power_net_w * duration_s / 3600
         }
     
-    def _calculate_power_consumption(self, actuators: Dict, state: Dict) -> float:
+    def _calculate_power_consumption(self, actuators: Dict, state: Dict,
+                                     cpu_usage_percent: Optional[float] = None) -> float:
         """Calcula consumo total de potência dos atuadores"""
         total_power_w = 0
         
@@ -323,7 +388,9 @@ class PhysicsEngine:
         total_power_w += 50  # 50W baseline
         
         # CPU usage aumenta consumo
-        cpu_percent = state.get('health', {}).get('cpu_usage_percent', 40)
+        cpu_percent = cpu_usage_percent
+        if cpu_percent is None:
+            cpu_percent = state.get('health', {}).get('cpu_usage_percent', 40)
         compute_power_w = (cpu_percent / 100) * 30  # Max 30W para processamento
         total_power_w += compute_power_w
         
@@ -397,7 +464,7 @@ def main():
     robot_charging = data['robots'][0]  # MICROBOT-001
     
     print(f"\n\n🔋 BATERIA: {robot_charging['robot_id']}")
-    battery_initial = robot_charging['state']['battery']
+    battery_initial = robot_charging['state']['battery'].copy()  # Bateria é atualizada no lugar
     print(f"   SOC inicial: {battery_initial['soc_percent']}%")
     print(f"   Tensão: {battery_initial['voltage_v']}V")
     print(f"   Corrente: {battery_initial['current_a']}A")
@@ -416,10 +483,10 @@ def main():
     print(f"\n🔋 BATERIA ATUALIZADA:")
     battery_new = battery_result['battery']
     soc_change = battery_new['soc_percent'] - battery_initial['soc_percent']
-    print(f"   SOC: {battery_new['soc_percent']}% ({soc_change:+.4f}%)")
-    print(f"   Tensão: {battery_new['voltage_v']}V")
-    print(f"   Corrente: {battery_new['current_a']}A")
-    print(f"   Temperatura: {battery_new['temperature_c']}°C")
+    print(f"   SOC: {battery_new['soc_percent']:.4f}% ({soc_change:+.4f}%)")
+    print(f"   Tensão: {battery_new['voltage_v']:.2f}V")
+    print(f"   Corrente: {battery_new['current_a']:.2f}A")
+    print(f"   Temperatura: {battery_new['temperature_c']:.2f}°C")
     
     print(f"\n✅ Physics engine funcionando!")
     print(f"\nTotal de testes: 2")
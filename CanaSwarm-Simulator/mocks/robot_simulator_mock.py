@@ -10,16 +10,32 @@ Date: 2026-02-20
 
 import json
 import math
-import random
 from datetime import datetime, timedelta
-from typing import Dict, List, Tuple, Any
+from typing import Dict, List, Tuple, Any, Optional
+
+import geodesy_mock as geodesy
+from coverage_planner_mock import PathFollower
+from rng_streams_mock import RNGStreams
+from robot_state_mock import AccelerationState, RobotState
 
 
 class RobotSimulator:
     """Simulador completo de robô autônomo"""
     
+    # Carga de CPU por status de missão: (base, ruído mínimo, ruído máximo)
+    CPU_LOAD_PROFILE = {
+        'harvesting': (70, -5, 10),
+        'transporting': (40, -5, 5)
+    }
+    DEFAULT_CPU_LOAD = (30, -5, 5)
+    
+    # Limiares de SOC que mudam alertas, health ou missão (eventos do fast-forward)
+    SOC_EVENT_THRESHOLDS = (20, 40, 50, 80)
+    BATTERY_TEMP_EVENT_THRESHOLD_C = 50
+    
     def __init__(self, robot_data: Dict[str, Any], environment: Dict[str, Any], 
-                 physics_engine, environment_simulator):
+                 physics_engine, environment_simulator,
+                 rng_streams: Optional[RNGStreams] = None):
         """
         Inicializa robot simulator
         
@@ -28,12 +44,33 @@ class RobotSimulator:
             environment: Estado do ambiente
             physics_engine: Engine de física
             environment_simulator: Simulador de ambiente
+            rng_streams: Streams aleatórios (default: os do environment simulator)
         """
         self.robot = robot_data.copy()
         self.physics_engine = physics_engine
         self.env_simulator = environment_simulator
         self.timestep = physics_engine.timestep
         
+        # Robôs sem atuadores/sensores declarados (ex: transporte) simulam com blocos vazios
+        state = self.robot['state'] = RobotState.from_dict(robot_data['state'])
+        state.setdefault('acceleration', AccelerationState(linear_ms2=0.0, angular_deg_per_s2=0.0))
+        state.setdefault('actuators', {})
+        state.setdefault('sensors', {})
+        
+        # Altitude segue o raster de terreno do ambiente
+        if physics_engine.terrain_raster is None:
+            physics_engine.attach_terrain(environment_simulator.height_raster)
+        
+        # Streams aleatórios próprios do robô (sensores e saúde independentes)
+        rng_streams = rng_streams or environment_simulator.rng_streams
+        robot_id = robot_data['robot_id']
+        self.sensor_rng = rng_streams.stream(f'robot.{robot_id}.sensors')
+        self.health_rng = rng_streams.stream(f'robot.{robot_id}.health')
+        
+        # Cobertura: plano calculado ao iniciar a colheita, seguido por lookahead
+        self.work_width_m = robot_data['physics'].get('work_width_m', 2.0)
+        self.path_follower: Optional[PathFollower] = None
+        
         # Estatísticas de simulação
         self.stats = {
             'total_timesteps': 0,
@@ -44,13 +81,21 @@ class RobotSimulator:
             'mission_progress_percent': robot_data['state']['mission'].get('progress_percent', 0)
         }
         
-    def update(self) -> Dict[str, Any]:
+    def update(self, dt: Optional[float] = None) -> Dict[str, Any]:
         """
-        Atualiza simulação do robô (1 timestep)
+        Atualiza simulação do robô (1 passo)
+        
+        Args:
+            dt: Duração do passo (default: timestep). Robôs parados podem ser
+                avançados com passos maiores pelo SwarmSimulator.
         
         Returns:
-            Estado atualizado completo
+            Estado atualizado completo (robô e estatísticas são os objetos
+            vivos do simulador, sem cópia; use `robot['state'].to_dict()`
+            para guardar um snapshot)
         """
+        dt = self.timestep if dt is None else dt
+        
         # 1. Ler ambiente atual
         environment = self.env_simulator.environment
         
@@ -61,24 +106,22 @@ class RobotSimulator:
         self._apply_actions(mission_actions)
         
         # 4. Atualizar física (movimento)
-        physics_result = self.physics_engine.update_robot_physics(self.robot, environment)
-        self.robot['state'] = physics_result['state']
+        physics_result = self.physics_engine.update_robot_physics(self.robot, environment, dt)
         
         # 5. Atualizar bateria
-        battery_result = self.physics_engine.update_battery_physics(self.robot, environment)
-        self.robot['state']['battery'] = battery_result['battery']
+        battery_result = self.physics_engine.update_battery_physics(self.robot, environment, dt)
         
         # 6. Atualizar sensores (leituras com ruído)
         self._update_sensors(environment)
         
         # 7. Atualizar progresso da missão
-        self._update_mission_progress()
+        self._update_mission_progress(dt)
         
         # 8. Atualizar health status
-        self._update_health_status()
+        self._update_health_status(dt)
         
         # 9. Atualizar estatísticas
-        self._update_statistics(physics_result, battery_result)
+        self._update_statistics(physics_result, battery_result, dt)
         
         # 10. Gerar alertas se necessário
         alerts = self._check_alerts()
@@ -87,16 +130,108 @@ class RobotSimulator:
         if physics_result['collisions']:
             self.stats['collisions'] += len(physics_result['collisions'])
         
-        self.stats['total_timesteps'] += 1
+        self.stats['total_timesteps'] += max(1, round(dt / self.timestep))
         
         return {
             'robot': self.robot,
             'physics': physics_result,
             'battery': battery_result,
             'alerts': alerts,
-            'statistics': self.stats.copy()
+            'statistics': self.stats,
+            'action': mission_actions['action']
         }
     
+    def is_quiescent(self) -> bool:
+        """
+        Robô parado em estado estável (idle ou carregando, velocidade ~0)
+        
+        Nesse estado nada muda além de bateria, saúde e relógio, então ele
+        pode ser avançado com passos maiores sem perder eventos de física.
+        """
+        state = self.robot['state']
+        if state['velocity']['linear_ms'] > 1e-3:
+            return False
+        return state['battery']['charging'] or state['mission']['status'] == 'idle'
+    
+    def fast_forward(self, max_seconds: float) -> Optional[Dict[str, Any]]:
+        """
+        Avança um robô parado direto até o próximo evento, em um único passo
+        
+        Parado (idle/carregando) o robô tem potência constante até: SOC cruzar
+        um limiar (alertas, health, fim de carga em 80%), a temperatura da
+        bateria cruzar 50°C, ou o sol ser recalculado. O instante do evento é
+        calculado analiticamente e bateria, energia e timesteps são avançados
+        de uma vez (ver PhysicsEngine.advance_battery).
+        
+        Args:
+            max_seconds: Limite do salto
+        
+        Returns:
+            Resultado no formato de `update()` com 'fast_forward_seconds',
+            ou None se não há intervalo a pular
+        """
+        if not self.is_quiescent():
+            return None
+        
+        state = self.robot['state']
+        battery = state['battery']
+        
+        # Carga completa: a transição para idle é feita pelo passo normal
+        if battery['charging'] and battery['soc_percent'] >= 80:
+            return None
+        
+        environment = self.env_simulator.environment
+        base, noise_min, noise_max = self.CPU_LOAD_PROFILE.get(state['mission']['status'], self.DEFAULT_CPU_LOAD)
+        expected_cpu = base + (noise_min + noise_max) / 2
+        power_balance = self.physics_engine.battery_power_balance(self.robot, environment, expected_cpu)
+        
+        # Passos inteiros: horizonte arredonda para baixo, evento para cima
+        # (o evento cai dentro do último passo, como no loop normal)
+        horizon_s = min(max_seconds, self.env_simulator.scheduler.time_to_next('solar'))
+        steps = math.floor(horizon_s / self.timestep + 1e-9)
+        event_s = self._time_to_next_event(power_balance['power_net_w'], environment)
+        if not math.isinf(event_s):
+            steps = min(steps, math.ceil(event_s / self.timestep - 1e-9))
+        
+        if steps < 2:
+            return None
+        
+        duration = steps * self.timestep
+        battery_result = self.physics_engine.advance_battery(self.robot, environment, duration, power_balance)
+        
+        self._update_sensors(environment)
+        self._update_health_status(duration)
+        
+        # Parado: as colisões da posição atual valem para cada passo pulado
+        collisions = self.physics_engine.detect_collisions(self.robot, environment)
+        physics_result = {'state': state, 'forces': {}, 'collisions': collisions}
+        self._update_statistics(physics_result, battery_result, duration)
+        alerts = self._check_alerts()
+        self.stats['collisions'] += len(collisions) * steps
+        self.stats['total_timesteps'] += steps
+        
+        return {
+            'robot': self.robot,
+            'physics': physics_result,
+            'battery': battery_result,
+            'alerts': alerts,
+            'statistics': self.stats,
+            'fast_forward_seconds': duration
+        }
+    
+    def _time_to_next_event(self, power_net_w: float, environment: Dict) -> float:
+        """Segundos até o próximo cruzamento de limiar de SOC ou temperatura"""
+        battery = self.robot['state']['battery']
+        times = [self.physics_engine.time_to_soc(battery, power_net_w, threshold)
+                 for threshold in self.SOC_EVENT_THRESHOLDS]
+        
+        ambient_temp = environment.get('weather', {}).get('temperature_c', 25)
+        times.append(self.physics_engine.time_to_battery_temperature(
+            battery, power_net_w, ambient_temp, self.BATTERY_TEMP_EVENT_THRESHOLD_C
+        ))
+        
+        return min(times)
+    
     def _execute_mission_logic(self) -> Dict[str, Any]:
         """
         Lógica de decisão da missão
@@ -142,9 +277,18 @@ class RobotSimulator:
             # Mais denso = mais lento
             target_speed = 1.5 - plant_density * 0.8  # 0.7 - 1.5 m/s
             
-            # Heading: avançar em linha (simplificado - sem waypoint navigation aqui)
-            current_heading = position['heading_deg']
-            target_heading = current_heading  # Manter direção
+            # Heading: seguir o plano de cobertura
+            target_heading = self._coverage_heading(mission, position)
+            if target_heading is None:
+                # Caminho terminou: zona coberta
+                mission['status'] = 'idle'
+                mission['progress_percent'] = 100
+                return {
+                    'target_speed_ms': 0.0,
+                    'target_heading_deg': position['heading_deg'],
+                    'blade_active': False,
+                    'action': 'coverage_complete'
+                }
             
             return {
                 'target_speed_ms': target_speed,
@@ -180,6 +324,26 @@ class RobotSimulator:
                 'action': 'unknown'
             }
     
+    def _coverage_heading(self, mission: Dict[str, Any], position: Dict[str, float]) -> Optional[float]:
+        """
+        Rumo alvo no plano de cobertura da missão (None quando terminou)
+        
+        O plano vem do cache do CoveragePlanner do ambiente; o seguidor
+        começa no waypoint mais próximo do robô.
+        """
+        follower = self.path_follower
+        if follower is None or follower.mission_id != mission.get('mission_id'):
+            planner = self.env_simulator.coverage_planner
+            zone = planner.zone_for_mission(mission, self.env_simulator.environment['terrain']['bounds'])
+            plan = planner.plan(zone, self.work_width_m, self.robot['physics']['dimensions_m']['width'])
+            start_index = plan.nearest_index(*plan.frame.to_enu(position['lat'], position['lon']))
+            follower = self.path_follower = PathFollower(plan, start_index, mission_id=mission.get('mission_id'))
+        
+        target_heading = follower.target_heading(position['lat'], position['lon'])
+        mission['waypoint_current'] = follower.index
+        mission['waypoint_total'] = len(follower.plan)
+        return target_heading
+    
     def _apply_actions(self, actions: Dict[str, Any]):
         """Aplica ações aos atuadores do robô"""
         actuators = self.robot['state']['actuators']
@@ -227,6 +391,13 @@ class RobotSimulator:
             
             actuators['steering']['angle_deg'] = steering_angle
             actuators['steering']['servo_position_percent'] = 50 + (steering_angle / 30) * 50
+            
+            # Giro cinemático (bicicleta): ω = v × tan(δ) / entre-eixos
+            physics = self.robot['physics']
+            wheel_base = physics.get('wheel_base_m', 1.5)
+            max_yaw = physics.get('max_angular_velocity_deg_per_s', 45)
+            yaw_rate = math.degrees(current_velocity * math.tan(math.radians(steering_angle)) / wheel_base)
+            self.robot['state']['velocity']['angular_deg_per_s'] = max(-max_yaw, min(max_yaw, yaw_rate))
     
     def _torque_to_rpm(self, torque_nm: float, velocity_ms: float) -> float:
         """Converte torque e velocidade em RPM da roda"""
@@ -264,22 +435,7 @@ class RobotSimulator:
         current_pos = self.robot['state']['position']
         dest = mission['destination']
         
-        # Calcular bearing entre dois pontos GPS
-        lat1 = math.radians(current_pos['lat'])
-        lat2 = math.radians(dest['lat'])
-        lon1 = math.radians(current_pos['lon'])
-        lon2 = math.radians(dest['lon'])
-        
-        delta_lon = lon2 - lon1
-        
-        x = math.sin(delta_lon) * math.cos(lat2)
-        y = math.cos(lat1) * math.sin(lat2) - math.sin(lat1) * math.cos(lat2) * math.cos(delta_lon)
-        
-        bearing_rad = math.atan2(x, y)
-        bearing_deg = math.degrees(bearing_rad)
-        bearing_deg = (bearing_deg + 360) % 360  # Normalizar 0-360
-        
-        return bearing_deg
+        return geodesy.bearing_deg(current_pos['lat'], current_pos['lon'], dest['lat'], dest['lon'])
     
     def _normalize_angle(self, angle_deg: float) -> float:
         """Normaliza ângulo para ±180°"""
@@ -302,7 +458,7 @@ class RobotSimulator:
         # IMU: adicionar ruído de giroscópio
         if 'imu' in sensors:
             gyro_noise = sensors['imu'].get('gyro_noise_deg_per_s', 0.1)
-            sensors['imu']['yaw_deg'] = position['heading_deg'] + random.uniform(-gyro_noise, gyro_noise)
+            sensors['imu']['yaw_deg'] = position['heading_deg'] + self.sensor_rng.uniform(-gyro_noise, gyro_noise)
         
         # LiDAR: detectar obstáculos
         if 'lidar' in sensors:
@@ -319,15 +475,14 @@ class RobotSimulator:
             objects_detected = int(plant_density * 15)  # 0-15 objetos
             sensors['camera_front']['objects_detected'] = objects_detected
     
-    def _update_mission_progress(self):
+    def _update_mission_progress(self, dt: float):
         """Atualiza progresso da missão"""
         mission = self.robot['state']['mission']
         velocity = self.robot['state']['velocity']['linear_ms']
         
         if mission['status'] == 'harvesting' and velocity > 0.1:
             # Área coberta proporcional a velocidade e largura de trabalho
-            work_width_m = 2.0  # Largura de colheita
-            area_m2_per_timestep = velocity * work_width_m * self.timestep
+            area_m2_per_timestep = velocity * self.work_width_m * dt
             area_ha_per_timestep = area_m2_per_timestep / 10000
             
             mission['area_covered_ha'] = mission.get('area_covered_ha', 0) + area_ha_per_timestep
@@ -346,7 +501,7 @@ class RobotSimulator:
             if 'destination' in mission:
                 position = self.robot['state']['position']
                 dest = mission['destination']
-                distance_m = self._haversine_distance(
+                distance_m = geodesy.haversine_m(
                     position['lat'], position['lon'],
                     dest['lat'], dest['lon']
                 )
@@ -360,28 +515,28 @@ class RobotSimulator:
                     mission['status'] = 'idle'
                     mission['progress_percent'] = 100
     
-    def _update_health_status(self):
+    def _update_health_status(self, dt: float):
         """Atualiza status de saúde do robô"""
         health = self.robot['state']['health']
         battery = self.robot['state']['battery']
         
         # CPU usage varia com carga de trabalho
         mission = self.robot['state']['mission']
-        if mission['status'] == 'harvesting':
-            health['cpu_usage_percent'] = 70 + random.uniform(-5, 10)
-        elif mission['status'] == 'transporting':
-            health['cpu_usage_percent'] = 40 + random.uniform(-5, 5)
-        else:
-            health['cpu_usage_percent'] = 30 + random.uniform(-5, 5)
+        base, noise_min, noise_max = self.CPU_LOAD_PROFILE.get(mission['status'], self.DEFAULT_CPU_LOAD)
+        health['cpu_usage_percent'] = base + self.health_rng.uniform(noise_min, noise_max)
         
         health['cpu_usage_percent'] = max(20, min(95, health['cpu_usage_percent']))
         
-        # Memory usage aumenta lentamente
-        health['memory_usage_percent'] += random.uniform(-0.5, 1.0) * self.timestep
+        # Memory usage aumenta lentamente: passeio de um passo uniforme por
+        # timestep; o salto de fast_forward soma `steps` passos em um sorteio
+        # (mesma média e variância, como o clima em EnvironmentSimulator)
+        steps = dt / self.timestep
+        drift = 0.25 * steps + (self.health_rng.uniform(-0.5, 1.0) - 0.25) * math.sqrt(steps)
+        health['memory_usage_percent'] += drift * self.timestep
         health['memory_usage_percent'] = max(40, min(90, health['memory_usage_percent']))
         
         # Uptime
-        health['uptime_hours'] += self.timestep / 3600
+        health['uptime_hours'] += dt / 3600
         
         # Overall status baseado em condições
         if battery['soc_percent'] < 20:
@@ -391,10 +546,10 @@ class RobotSimulator:
         else:
             health['overall_status'] = 'healthy'
     
-    def _update_statistics(self, physics_result: Dict, battery_result: Dict):
+    def _update_statistics(self, physics_result: Dict, battery_result: Dict, dt: float):
         """Atualiza estatísticas de simulação"""
         velocity = physics_result['state']['velocity']['linear_ms']
-        distance_m = velocity * self.timestep
+        distance_m = velocity * dt
         self.stats['distance_traveled_km'] += distance_m / 1000
         
         energy_wh = abs(battery_result['energy_change_wh'])
@@ -413,14 +568,14 @@ class RobotSimulator:
             alerts.append({
                 'severity': 'critical',
                 'type': 'battery_critical',
-                'message': f"Bateria crítica: {battery['soc_percent']}%",
+                'message': f"Bateria crítica: {battery['soc_percent']:.1f}%",
                 'timestamp': datetime.utcnow().isoformat() + 'Z'
             })
         elif battery['soc_percent'] < 50 and not battery['charging']:
             alerts.append({
                 'severity': 'warning',
                 'type': 'battery_low',
-                'message': f"Bateria baixa: {battery['soc_percent']}%",
+                'message': f"Bateria baixa: {battery['soc_percent']:.1f}%",
                 'timestamp': datetime.utcnow().isoformat() + 'Z'
             })
         
@@ -429,7 +584,7 @@ class RobotSimulator:
             alerts.append({
                 'severity': 'warning',
                 'type': 'temperature_high',
-                'message': f"Temperatura alta: {battery['temperature_c']}°C",
+                'message': f"Temperatura alta: {battery['temperature_c']:.1f}°C",
                 'timestamp': datetime.utcnow().isoformat() + 'Z'
             })
         
@@ -443,20 +598,6 @@ class RobotSimulator:
             })
         
         return alerts
-    
-    def _haversine_distance(self, lat1: float, lon1: float, lat2: float, lon2: float) -> float:
-        """Calcula distância Haversine"""
-        R = 6371000  # Raio da Terra em metros
-        
-        phi1 = math.radians(lat1)
-        phi2 = math.radians(lat2)
-        delta_phi = math.radians(lat2 - lat1)
-        delta_lambda = math.radians(lon2 - lon1)
-        
-        a = math.sin(delta_phi/2)**2 + math.cos(phi1) * math.cos(phi2) * math.sin(delta_lambda/2)**2
-        c = 2 * math.atan2(math.sqrt(a), math.sqrt(1-a))
-        
-        return R * c
 
 
 def main():
@@ -473,6 +614,7 @@ def main():
     sys.path.insert(0, '.')
     from physics_engine_mock import PhysicsEngine
     from environment_simulator_mock import EnvironmentSimulator
+    from sim_clock_mock import SimulationClock
     
     # Inicializar componentes
     physics_engine = PhysicsEngine(data['config'])
@@ -484,7 +626,7 @@ def main():
     
     print(f"\n🤖 ROBÔ: {robot_sim.robot['robot_id']} ({robot_sim.robot['type']})")
     print(f"   Missão: {robot_sim.robot['state']['mission']['status']}")
-    print(f"   SOC inicial: {robot_sim.robot['state']['battery']['soc_percent']}%")
+    print(f"   SOC inicial: {robot_sim.robot['state']['battery']['soc_percent']:.1f}%")
     print(f"   Posição: ({robot_sim.robot['state']['position']['lat']:.6f}, {robot_sim.robot['state']['position']['lon']:.6f})")
     
     # Simular 30 segundos
@@ -498,9 +640,14 @@ def main():
     sample_interval = 10  # segundos
     sample_steps = int(sample_interval / timestep)
     
+    # Relógio: fast (padrão), paced (k× tempo real) ou lockstep, via config
+    clock = SimulationClock.from_config(data['config'])
+    
     for step in range(steps):
+        clock.begin_tick()
         result = robot_sim.update()
         env_simulator.update_environment(timestep)
+        clock.end_tick()
         
         if (step + 1) % sample_steps == 0:
             elapsed = (step + 1) * timestep
@@ -533,6 +680,10 @@ def main():
     print(f"   Colisões: {stats['collisions']}")
     print(f"   Progresso missão: {stats['mission_progress_percent']:.1f}%")
     
+    clock_stats = clock.get_stats()
+    print(f"   Relógio ({clock_stats['mode']}): {clock_stats['realtime_factor_achieved']}× tempo real, "
+          f"{clock_stats['overruns']} overruns")
+    
     print(f"\n✅ Robot simulator funcionando!")
 
 
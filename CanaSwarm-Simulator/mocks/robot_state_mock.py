@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Robot State Mock - CanaSwarm Simulator
+
+Estado do robô em registros compactos com __slots__ em vez de dicts aninhados.
+
+Os blocos de esquema fixo (posição, velocidade, aceleração, bateria) viram
+registros sem __dict__ e continuam acessíveis por chave
+(`state['battery']['soc_percent']`), então o physics engine e o robot
+simulator funcionam igual com dicts ou registros. Blocos heterogêneos
+(atuadores, sensores, missão, saúde, carga) continuam como dicts.
+
+As atualizações são feitas no próprio registro (sem `state.copy()` por
+passo); `to_dict()` gera a cópia em dicts puros apenas para exportar JSON.
+
+Author: CanaSwarm Team
+Date: 2026-02-20
+"""
+
+import copy
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, List, Tuple
+
+
+class StateRecord:
+    """
+    Registro de esquema fixo com __slots__ acessível como dict
+
+    O acesso por chave é ligado direto ao acesso de atributo do CPython
+    (`record['lat']` custa o mesmo que `record.lat`), por isso o registro
+    exige todos os campos do esquema. Chave fora do esquema levanta
+    AttributeError; use `in`/`get()` para consultas opcionais.
+    """
+
+    __slots__ = ()
+
+    __getitem__ = object.__getattribute__
+    __setitem__ = object.__setattr__
+
+    def __init__(self, **values):
+        missing = [key for key in self.__slots__ if key not in values]
+        if missing:
+            raise ValueError(f"{type(self).__name__}: campos ausentes {missing}")
+        for key, value in values.items():
+            setattr(self, key, value)
+
+    @classmethod
+    def accepts(cls, data: Mapping) -> bool:
+        """True se `data` tem exatamente os campos do registro"""
+        return len(data) == len(cls.__slots__) and all(key in data for key in cls.__slots__)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.__slots__
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.__slots__)
+
+    def __len__(self) -> int:
+        return len(self.__slots__)
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, (StateRecord, Mapping)):
+            return len(other) == len(self) and all(key in other and other[key] == self[key] for key in self)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.to_dict()})"
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Valor do campo ou `default` se a chave não é do esquema"""
+        return getattr(self, key) if key in self.__slots__ else default
+
+    def keys(self) -> Tuple[str, ...]:
+        return self.__slots__
+
+    def values(self) -> List[Any]:
+        return [getattr(self, key) for key in self.__slots__]
+
+    def items(self) -> List[Tuple[str, Any]]:
+        return [(key, getattr(self, key)) for key in self.__slots__]
+
+    def copy(self) -> 'StateRecord':
+        """Cópia rasa (mesmo tipo)"""
+        return type(self)(**dict(self.items()))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Exporta como dict puro (JSON)"""
+        return dict(self.items())
+
+
+class PositionState(StateRecord):
+    """Posição GPS e orientação"""
+    __slots__ = ('lat', 'lon', 'altitude_m', 'heading_deg')
+
+
+class VelocityState(StateRecord):
+    """Velocidades linear e angular"""
+    __slots__ = ('linear_ms', 'angular_deg_per_s')
+
+
+class AccelerationState(StateRecord):
+    """Acelerações linear e angular"""
+    __slots__ = ('linear_ms2', 'angular_deg_per_s2')
+
+
+class BatteryState(StateRecord):
+    """Estado da bateria"""
+    __slots__ = ('soc_percent', 'voltage_v', 'current_a', 'temperature_c',
+                 'capacity_ah', 'charging', 'cycles')
+
+
+# Blocos do estado que viram registros compactos
+SECTION_RECORDS = {
+    'position': PositionState,
+    'velocity': VelocityState,
+    'acceleration': AccelerationState,
+    'battery': BatteryState
+}
+
+
+class RobotState(dict):
+    """
+    Estado completo do robô
+
+    O nível de cima continua um dict (poucas chaves, acesso mais quente do
+    loop); os blocos de SECTION_RECORDS viram registros compactos.
+    """
+
+    __slots__ = ()
+
+    @classmethod
+    def from_dict(cls, data: Mapping) -> 'RobotState':
+        """
+        Converte o estado em dicts (JSON) para registros
+
+        Blocos com campos diferentes do registro correspondente são mantidos
+        como dicts. Os demais dicts não são copiados: o RobotState passa a
+        ser o dono deles.
+
+        Args:
+            data: Estado no formato de example_simulation_data.json
+
+        Returns:
+            Estado compacto
+        """
+        state = cls()
+        for key, value in data.items():
+            record_type = SECTION_RECORDS.get(key)
+            if record_type is not None and isinstance(value, Mapping) and record_type.accepts(value):
+                value = record_type(**value)
+            state[key] = value
+        return state
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Exporta snapshot em dicts puros (JSON), sem compartilhar objetos"""
+        return _export(self)
+
+
+def _export(value: Any) -> Any:
+    """Converte registros (e dicts que os contêm) em dicts puros"""
+    if isinstance(value, StateRecord):
+        return value.to_dict()
+    if isinstance(value, dict):
+        return {key: _export(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_export(item) for item in value]
+    return value
+
+
+def main():
+    """Testa conversão, acesso por chave e memória por robô"""
+    import json
+    import sys
+    import tracemalloc
+
+    print("🧱 Simulator - Robot State Mock")
+    print("=" * 70)
+
+    with open('example_simulation_data.json', 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    print(f"\n🔁 CONVERSÃO:")
+    for robot in data['robots']:
+        state = RobotState.from_dict(copy.deepcopy(robot['state']))
+        records = [key for key in state if isinstance(state[key], StateRecord)]
+        print(f"   {robot['robot_id']}: registros {records} | round-trip = {state.to_dict() == robot['state']}")
+
+    state = RobotState.from_dict(copy.deepcopy(data['robots'][0]['state']))
+    state['battery']['soc_percent'] += 1.5
+    print(f"\n🔋 ACESSO POR CHAVE: SOC {state['battery']['soc_percent']}% | "
+          f"get ausente = {state['battery'].get('state_of_health', 'n/a')}")
+    print(f"   Bateria: {sys.getsizeof(state['battery'])} bytes (dict: {sys.getsizeof(data['robots'][0]['state']['battery'])} bytes)")
+
+    # Memória de 10k estados (dicts vs registros)
+    count = 10000
+    template = data['robots'][1]['state']
+    results = {}
+    for label, build in (('dicts', lambda: copy.deepcopy(template)),
+                         ('registros', lambda: RobotState.from_dict(copy.deepcopy(template)))):
+        tracemalloc.start()
+        states = [build() for _ in range(count)]
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        results[label] = current / count
+        del states
+
+    print(f"\n💾 MEMÓRIA ({count} robôs):")
+    for label, per_robot in results.items():
+        print(f"   {label:<10} {per_robot:>7.0f} bytes/robô | {per_robot * count / 1e6:.1f} MB total")
+
+    print(f"\n✅ Robot state funcionando!")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Multi-Rate Scheduler Mock - CanaSwarm Simulator
+
+Executa subsistemas da simulação em taxas diferentes sobre o mesmo relógio:
+física a cada timestep, clima a cada segundo, sol a cada minuto, plantação
+a cada hora. Cada tarefa recebe o tempo acumulado desde a sua última
+execução, então modelos proporcionais ao tempo continuam corretos.
+
+Author: CanaSwarm Team
+Date: 2026-02-20
+"""
+
+from typing import Any, Callable, Dict, List, Optional
+
+# Tolerância para comparar tempos acumulados em ponto flutuante
+TIME_EPSILON = 1e-6
+
+
+class MultiRateScheduler:
+    """Agenda tarefas periódicas com períodos independentes"""
+
+    def __init__(self):
+        """Inicializa scheduler com relógio em 0"""
+        self.now = 0.0
+        self.tasks: List[Dict[str, Any]] = []
+
+    def add_task(self, name: str, period_seconds: float, fn: Callable[[float], Any],
+                 run_immediately: bool = False):
+        """
+        Registra tarefa periódica
+
+        Args:
+            name: Nome da tarefa
+            period_seconds: Período entre execuções
+            fn: Função chamada com o tempo decorrido desde a última execução
+            run_immediately: Executa já no primeiro avanço do relógio
+        """
+        if period_seconds <= 0:
+            raise ValueError(f"Período inválido para '{name}': {period_seconds}")
+
+        self.tasks.append({
+            'name': name,
+            'period_seconds': period_seconds,
+            'fn': fn,
+            'last_run': self.now,
+            'next_due': self.now if run_immediately else self.now + period_seconds,
+            'runs': 0
+        })
+
+    def advance(self, elapsed_seconds: float) -> List[str]:
+        """
+        Avança o relógio e executa as tarefas vencidas
+
+        Args:
+            elapsed_seconds: Tempo a avançar
+
+        Returns:
+            Nomes das tarefas executadas (na ordem de registro)
+        """
+        self.now += elapsed_seconds
+        executed = []
+
+        for task in self.tasks:
+            if self.now + TIME_EPSILON < task['next_due']:
+                continue
+
+            task['fn'](self.now - task['last_run'])
+            task['last_run'] = self.now
+            task['runs'] += 1
+
+            # Próximo vencimento alinhado à grade do período (sem deriva)
+            while task['next_due'] <= self.now + TIME_EPSILON:
+                task['next_due'] += task['period_seconds']
+
+            executed.append(task['name'])
+
+        return executed
+
+    def time_to_next(self, name: Optional[str] = None) -> float:
+        """
+        Tempo até a próxima tarefa vencer
+
+        Args:
+            name: Considera apenas a tarefa com este nome (default: todas)
+        """
+        due = [task['next_due'] for task in self.tasks if name is None or task['name'] == name]
+        if not due:
+            return float('inf')
+        return max(0.0, min(due) - self.now)
+
+    def get_stats(self) -> Dict[str, int]:
+        """Número de execuções por tarefa"""
+        return {task['name']: task['runs'] for task in self.tasks}
+
+
+def main():
+    """Testa scheduler com três taxas"""
+    print("⏲️  Simulator - Multi-Rate Scheduler Mock")
+    print("=" * 70)
+
+    scheduler = MultiRateScheduler()
+    elapsed_seen = {'weather': 0.0, 'solar': 0.0, 'plantation': 0.0}
+
+    def make_task(name):
+        def run(elapsed):
+            elapsed_seen[name] += elapsed
+        return run
+
+    scheduler.add_task('weather', 1.0, make_task('weather'), run_immediately=True)
+    scheduler.add_task('solar', 60.0, make_task('solar'), run_immediately=True)
+    scheduler.add_task('plantation', 3600.0, make_task('plantation'))
+
+    timestep = 0.1
+    steps = 36000  # 1 hora
+    for _ in range(steps):
+        scheduler.advance(timestep)
+
+    print(f"\n⏱️  1 HORA SIMULADA ({steps} passos de {timestep}s):")
+    for name, runs in scheduler.get_stats().items():
+        print(f"   {name:<12} {runs:>6} execuções | tempo integrado {elapsed_seen[name]:>8.1f}s")
+    print(f"   Próxima tarefa em: {scheduler.time_to_next():.1f}s")
+
+    print(f"\n✅ Scheduler funcionando!")
+
+
+if __name__ == '__main__':
+    main()
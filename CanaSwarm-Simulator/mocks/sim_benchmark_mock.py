@@ -0,0 +1,327 @@
+#!/usr/bin/env python3
+"""
+Simulation Benchmark Mock - CanaSwarm Simulator
+
+Suíte de benchmark do simulador em frotas sintéticas de 1, 10, 100 e 1000
+robôs (réplicas de `example_simulation_data.json` via `scale_fleet`) sobre
+um campo de obstáculos sintético.
+
+Mede por tamanho de frota:
+- ticks/s e µs por robô por tick (relógio de parede, sem tracemalloc)
+- memória por robô (tracemalloc na construção, descontado o ambiente)
+- alocação por tick (pico transitório do tracemalloc e coletas gen0 do GC)
+
+O resultado é comparado com uma baseline JSON (`benchmark_baseline.json`);
+qualquer métrica fora da tolerância encerra com código 1. Os ticks/s são
+normalizados por uma calibração de CPU (laço Python de referência) feita em
+rodadas intercaladas com os ticks, então a baseline continua válida em
+máquinas mais rápidas, mais lentas ou com carga variável.
+
+Uso:
+    python sim_benchmark_mock.py                    # compara com a baseline
+    python sim_benchmark_mock.py --update-baseline  # grava nova baseline
+
+Author: CanaSwarm Team
+Date: 2026-02-20
+"""
+
+import gc
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import Any, Dict, List, Optional, Sequence
+
+from rng_streams_mock import RNGStreams
+from swarm_simulator_mock import SwarmSimulator
+from telemetry_bridge_mock import scale_fleet
+
+FLEET_SIZES = (1, 10, 100, 1000)
+OBSTACLE_COUNT = 200
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmark_baseline.json')
+
+# Tolerâncias da comparação com a baseline (fração)
+TOLERANCES = {
+    'normalized_ticks_per_s': 0.30,   # queda máxima
+    'memory_per_robot_kb': 0.20,      # aumento máximo
+    'alloc_kb_per_robot_tick': 0.50   # aumento máximo
+}
+
+OBSTACLE_TYPES = (('rock', 0.3, 1.0), ('tree', 0.8, 2.0), ('post', 0.1, 0.3))
+
+
+def synthetic_obstacles(environment: Dict[str, Any], count: int, seed: int = 42) -> List[Dict[str, Any]]:
+    """
+    Obstáculos aleatórios (reprodutíveis) dentro dos limites do terreno
+
+    Args:
+        environment: Ambiente do exemplo (usa `terrain.bounds`)
+        count: Número de obstáculos
+        seed: Semente do stream 'benchmark_obstacles'
+
+    Returns:
+        Lista no formato de `terrain.obstacles`
+    """
+    rng = RNGStreams(seed).stream('benchmark_obstacles')
+    bounds = environment['terrain']['bounds']
+    obstacles = []
+    for _ in range(count):
+        kind, min_radius, max_radius = rng.choice(OBSTACLE_TYPES)
+        obstacles.append({
+            'type': kind,
+            'position': {
+                'lat': rng.uniform(bounds['lat_min'], bounds['lat_max']),
+                'lon': rng.uniform(bounds['lon_min'], bounds['lon_max'])
+            },
+            'radius_m': round(rng.uniform(min_radius, max_radius), 2)
+        })
+    return obstacles
+
+
+def synthetic_scenario(simulation_data: Dict[str, Any], fleet_size: int,
+                       obstacle_count: int = OBSTACLE_COUNT, seed: int = 42) -> Dict[str, Any]:
+    """
+    Dados de simulação com frota escalada e campo de obstáculos sintético
+
+    Robôs em movimento vêm primeiro na réplica: a frota de 1 robô mede o
+    laço de física, não um robô carregando (avançado por fast-forward).
+    """
+    templates = sorted(simulation_data['robots'], key=lambda robot: robot['state']['battery']['charging'])
+    data = scale_fleet(dict(simulation_data, robots=templates), fleet_size)
+    data['environment']['terrain']['obstacles'] = synthetic_obstacles(data['environment'], obstacle_count, seed)
+    return data
+
+
+def calibrate(iterations: int = 200000, repeats: int = 5) -> float:
+    """
+    Velocidade de referência da CPU (operações/s de um laço Python típico)
+
+    Mistura aritmética de float, acesso a dict e chamada de função, como o
+    laço do simulador. Usada para normalizar ticks/s entre máquinas.
+    Mediana das rodadas, com o GC desligado e uma rodada de aquecimento.
+    """
+    def work(state: Dict[str, float], dt: float) -> float:
+        state['v'] += state['a'] * dt
+        return state['v'] * dt
+
+    rates = []
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeats + 1):
+            state = {'v': 0.0, 'a': 0.5}
+            start = time.perf_counter()
+            total = 0.0
+            for _ in range(iterations):
+                total += work(state, 0.1)
+            rates.append(iterations / (time.perf_counter() - start))
+    finally:
+        if gc_enabled:
+            gc.enable()
+    # Primeira rodada é aquecimento
+    return statistics.median(rates[1:])
+
+
+def _traced_construction(data: Dict[str, Any]) -> int:
+    """Bytes retidos pela construção de um SwarmSimulator"""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        swarm = SwarmSimulator(data)
+        gc.collect()
+        current, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del swarm
+    return current
+
+
+def benchmark_fleet(simulation_data: Dict[str, Any], fleet_size: int,
+                    obstacle_count: int = OBSTACLE_COUNT, warmup_ticks: int = 5,
+                    rounds: int = 5, min_ticks: int = 10, min_seconds: float = 1.0,
+                    alloc_ticks: int = 3) -> Dict[str, Any]:
+    """
+    Mede uma frota sintética
+
+    Args:
+        simulation_data: Dados do exemplo
+        fleet_size: Número de robôs
+        obstacle_count: Obstáculos sintéticos no terreno
+        warmup_ticks: Ticks descartados antes de medir
+        rounds: Rodadas de calibração + ticks intercaladas
+        min_ticks, min_seconds: Mínimos de cada rodada (a frota grande
+            ainda mede min_ticks ticks, não só os que cabem em min_seconds)
+        alloc_ticks: Ticks medidos com tracemalloc
+
+    Returns:
+        Métricas da frota
+    """
+    data = synthetic_scenario(simulation_data, fleet_size, obstacle_count)
+
+    # Memória por robô: construção com e sem a frota (ambiente descontado)
+    empty = dict(data, robots=[])
+    fleet_bytes = _traced_construction(data) - _traced_construction(empty)
+
+    # Ticks/s (sem tracemalloc). Cada rodada calibra a CPU logo antes dos
+    # próprios ticks: a razão entre os dois acompanha a carga da máquina
+    # naquele momento, e a mediana das rodadas descarta os picos.
+    swarm = SwarmSimulator(data)
+    for _ in range(warmup_ticks):
+        swarm.step()
+    calibrations, tick_rates, normalized = [], [], []
+    ticks = 0
+    for _ in range(rounds):
+        calibration = calibrate(repeats=1)
+        tick_times = []
+        elapsed = 0.0
+        while len(tick_times) < min_ticks or elapsed < min_seconds:
+            start = time.perf_counter()
+            swarm.step()
+            tick_times.append(time.perf_counter() - start)
+            elapsed += tick_times[-1]
+        ticks += len(tick_times)
+        rate = 1 / statistics.median(tick_times)
+        calibrations.append(calibration)
+        tick_rates.append(rate)
+        # Ticks por milhão de operações de referência: independe da velocidade da CPU
+        normalized.append(rate / calibration * 1e6)
+    ticks_per_s = statistics.median(tick_rates)
+
+    # Alocação: pico transitório acima do retido, por tick, e coletas gen0
+    gc.collect()
+    gen0_before = gc.get_stats()[0]['collections']
+    peak_total = 0
+    tracemalloc.start()
+    try:
+        for _ in range(alloc_ticks):
+            current, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            swarm.step()
+            _, peak = tracemalloc.get_traced_memory()
+            peak_total += peak - current
+    finally:
+        tracemalloc.stop()
+    gen0_per_tick = (gc.get_stats()[0]['collections'] - gen0_before) / alloc_ticks
+
+    return {
+        'robots': fleet_size,
+        'obstacles': obstacle_count,
+        'ticks_measured': ticks,
+        'ticks_per_s': round(ticks_per_s, 2),
+        'us_per_robot_tick': round(1e6 / ticks_per_s / fleet_size, 2),
+        'calibration_ops_per_s': round(statistics.median(calibrations)),
+        'normalized_ticks_per_s': round(statistics.median(normalized), 3),
+        'memory_per_robot_kb': round(fleet_bytes / fleet_size / 1024, 2),
+        'alloc_kb_per_tick': round(peak_total / alloc_ticks / 1024, 2),
+        'alloc_kb_per_robot_tick': round(peak_total / alloc_ticks / fleet_size / 1024, 3),
+        'gc_gen0_per_tick': round(gen0_per_tick, 2)
+    }
+
+
+def run_suite(simulation_data: Dict[str, Any], fleet_sizes: Sequence[int] = FLEET_SIZES,
+              obstacle_count: int = OBSTACLE_COUNT) -> Dict[str, Any]:
+    """
+    Roda a suíte completa
+
+    Returns:
+        Calibração (mediana das frotas), ambiente e métricas por tamanho
+        de frota (ticks/s também normalizados pela calibração)
+    """
+    results = {}
+    for fleet_size in fleet_sizes:
+        results[str(fleet_size)] = benchmark_fleet(simulation_data, fleet_size, obstacle_count)
+    return {
+        'python': platform.python_version(),
+        'calibration_ops_per_s': round(statistics.median(
+            fleet['calibration_ops_per_s'] for fleet in results.values())),
+        'fleets': results
+    }
+
+
+def compare_with_baseline(current: Dict[str, Any], baseline: Dict[str, Any],
+                          tolerances: Dict[str, float] = TOLERANCES) -> List[str]:
+    """
+    Regressões em relação à baseline
+
+    Returns:
+        Mensagens (vazia se tudo dentro da tolerância)
+    """
+    regressions = []
+    for fleet, base in baseline['fleets'].items():
+        now = current['fleets'].get(fleet)
+        if now is None:
+            continue
+        for metric, tolerance in tolerances.items():
+            before, after = base.get(metric), now.get(metric)
+            if not before or after is None:
+                continue
+            change = (after - before) / before
+            # ticks/s: pior é cair; memória e alocação: pior é subir
+            worse = -change if metric.endswith('ticks_per_s') else change
+            if worse > tolerance:
+                regressions.append(f"{fleet} robôs: {metric} {before} → {after} "
+                                   f"({change*100:+.0f}%, tolerância {tolerance*100:.0f}%)")
+    return regressions
+
+
+def load_baseline(path: str = BASELINE_PATH) -> Optional[Dict[str, Any]]:
+    """Baseline gravada (None se não existe)"""
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_baseline(result: Dict[str, Any], path: str = BASELINE_PATH):
+    """Grava a baseline"""
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(result, f, indent=2, ensure_ascii=False)
+        f.write('\n')
+
+
+def main(argv: Optional[List[str]] = None):
+    """Roda a suíte e compara com a baseline (ou grava com --update-baseline)"""
+    argv = sys.argv[1:] if argv is None else argv
+    update = '--update-baseline' in argv
+
+    print("📏 Simulator - Simulation Benchmark Mock")
+    print("=" * 70)
+
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+    with open(os.path.join(base_dir, 'example_simulation_data.json'), 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    result = run_suite(data)
+
+    print(f"\n🧮 CALIBRAÇÃO: {result['calibration_ops_per_s']:,} ops/s (Python {result['python']})")
+    print(f"\n🐝 FROTAS ({OBSTACLE_COUNT} obstáculos sintéticos):")
+    print(f"   {'robôs':>6} {'ticks/s':>9} {'µs/robô':>8} {'KB/robô':>8} {'KB aloc/tick':>13} {'gen0/tick':>10}")
+    for fleet in result['fleets'].values():
+        print(f"   {fleet['robots']:>6} {fleet['ticks_per_s']:>9.1f} {fleet['us_per_robot_tick']:>8.1f} "
+              f"{fleet['memory_per_robot_kb']:>8.1f} {fleet['alloc_kb_per_tick']:>13.1f} "
+              f"{fleet['gc_gen0_per_tick']:>10.2f}")
+
+    baseline = load_baseline()
+    if update or baseline is None:
+        save_baseline(result)
+        print(f"\n💾 BASELINE GRAVADA: {os.path.basename(BASELINE_PATH)}")
+    else:
+        regressions = compare_with_baseline(result, baseline)
+        if regressions:
+            print(f"\n❌ REGRESSÕES ({len(regressions)}):")
+            for message in regressions:
+                print(f"   {message}")
+            raise SystemExit(1)
+        print(f"\n📊 BASELINE: {len(baseline['fleets'])} frotas dentro da tolerância "
+              f"(ticks/s -{TOLERANCES['normalized_ticks_per_s']*100:.0f}%, "
+              f"memória +{TOLERANCES['memory_per_robot_kb']*100:.0f}%, "
+              f"alocação +{TOLERANCES['alloc_kb_per_robot_tick']*100:.0f}%)")
+
+    print(f"\n✅ Simulation benchmark funcionando!")
+
+
+if __name__ == '__main__':
+    main()
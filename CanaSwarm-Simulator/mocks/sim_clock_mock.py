@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Simulation Clock Mock - CanaSwarm Simulator
+
+Relógio da simulação com três modos:
+- fast: o mais rápido possível (batch, experimentos)
+- paced: k× o tempo real (`realtime_factor`), para hardware-in-the-loop e
+  testes de carga do pipeline de telemetria em taxas realistas
+- lockstep: cada tick espera liberação de um driver externo
+
+Mede o custo de cada tick contra o orçamento (timestep / realtime_factor) e
+reporta overruns quando a simulação não acompanha o ritmo pedido.
+
+Author: CanaSwarm Team
+Date: 2026-02-20
+"""
+
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+CLOCK_MODES = ('fast', 'paced', 'lockstep')
+
+
+class SimulationClock:
+    """Relógio de ticks com pacing e métricas de overrun"""
+
+    def __init__(self, timestep: float, mode: str = 'fast', realtime_factor: float = 1.0,
+                 time_fn: Callable[[], float] = time.perf_counter,
+                 sleep_fn: Callable[[float], None] = time.sleep):
+        """
+        Inicializa relógio
+
+        Args:
+            timestep: Tempo simulado por tick (s)
+            mode: 'fast', 'paced' ou 'lockstep'
+            realtime_factor: Velocidade alvo em relação ao tempo real (paced)
+            time_fn, sleep_fn: Relógio de parede e espera (substituíveis em testes)
+        """
+        if mode not in CLOCK_MODES:
+            raise ValueError(f"Modo de relógio inválido: {mode} (use {', '.join(CLOCK_MODES)})")
+        if realtime_factor <= 0:
+            raise ValueError(f"realtime_factor deve ser positivo: {realtime_factor}")
+
+        self.timestep = timestep
+        self.mode = mode
+        self.realtime_factor = realtime_factor
+        self.tick_budget_s = timestep / realtime_factor
+        self.time_fn = time_fn
+        self.sleep_fn = sleep_fn
+
+        self.ticks = 0
+        self.sim_time = 0.0
+        self._start_wall: Optional[float] = None
+        self._next_deadline = 0.0
+        self._tick_start = 0.0
+
+        # Lockstep: cada liberação do driver vale um tick
+        self._grants = threading.Semaphore(0)
+        self._closed = False
+
+        self.stats = {
+            'overruns': 0,
+            'overrun_total_s': 0.0,
+            'max_tick_s': 0.0,
+            'busy_s': 0.0,
+            'idle_s': 0.0
+        }
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> 'SimulationClock':
+        """Cria relógio a partir da configuração (`clock_mode`, `realtime_factor`)"""
+        return cls(config.get('timestep_seconds', 0.1),
+                   config.get('clock_mode', 'fast'),
+                   config.get('realtime_factor', 1.0))
+
+    def begin_tick(self) -> bool:
+        """
+        Espera a vez do próximo tick (pacing ou liberação do driver)
+
+        Returns:
+            False se o relógio foi fechado (lockstep) e o loop deve parar
+        """
+        now = self.time_fn()
+        if self._start_wall is None:
+            self._start_wall = now
+            self._next_deadline = now
+
+        if self.mode == 'paced':
+            delay = self._next_deadline - now
+            if delay > 0:
+                self.sleep_fn(delay)
+                self.stats['idle_s'] += delay
+        elif self.mode == 'lockstep':
+            self._grants.acquire()
+            if self._closed:
+                return False
+            self.stats['idle_s'] += self.time_fn() - now
+
+        self._tick_start = self.time_fn()
+        return True
+
+    def time_until_next_tick(self) -> float:
+        """
+        Espera restante até o próximo tick no modo paced (0 nos demais)
+
+        Permite a loops asyncio esperarem com `asyncio.sleep` antes de
+        `begin_tick()`, sem bloquear o event loop.
+        """
+        if self.mode != 'paced' or self._start_wall is None:
+            return 0.0
+        return max(0.0, self._next_deadline - self.time_fn())
+
+    def end_tick(self):
+        """Fecha o tick: avança o tempo simulado e contabiliza overrun"""
+        now = self.time_fn()
+        duration = now - self._tick_start
+
+        self.ticks += 1
+        self.sim_time = self.ticks * self.timestep
+        self.stats['busy_s'] += duration
+        self.stats['max_tick_s'] = max(self.stats['max_tick_s'], duration)
+
+        if duration > self.tick_budget_s:
+            self.stats['overruns'] += 1
+            self.stats['overrun_total_s'] += duration - self.tick_budget_s
+
+        if self.mode == 'paced':
+            # Atrasado: recomeça a grade a partir de agora (sem rajada para compensar)
+            self._next_deadline = max(self._next_deadline + self.tick_budget_s, now)
+
+    def run(self, tick_fn: Callable[[], Any], steps: int) -> Dict[str, Any]:
+        """
+        Executa `tick_fn` por até `steps` ticks no ritmo do modo
+
+        Returns:
+            Estatísticas do relógio
+        """
+        for _ in range(steps):
+            if not self.begin_tick():
+                break
+            tick_fn()
+            self.end_tick()
+        return self.get_stats()
+
+    def release(self, ticks: int = 1):
+        """Driver externo libera `ticks` ticks (modo lockstep)"""
+        for _ in range(ticks):
+            self._grants.release()
+
+    def close(self):
+        """Encerra o lockstep (desbloqueia o loop que está esperando)"""
+        self._closed = True
+        self._grants.release()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Ticks, fator de tempo real alcançado e overruns"""
+        wall_s = (self.time_fn() - self._start_wall) if self._start_wall is not None else 0.0
+        return {
+            'mode': self.mode,
+            'ticks': self.ticks,
+            'sim_time_s': round(self.sim_time, 6),
+            'wall_time_s': round(wall_s, 6),
+            'realtime_factor_target': self.realtime_factor if self.mode == 'paced' else None,
+            'realtime_factor_achieved': round(self.sim_time / wall_s, 2) if wall_s > 0 else None,
+            'tick_budget_ms': round(self.tick_budget_s * 1000, 3),
+            'max_tick_ms': round(self.stats['max_tick_s'] * 1000, 3),
+            'overruns': self.stats['overruns'],
+            'overrun_ratio': round(self.stats['overruns'] / self.ticks, 4) if self.ticks else 0,
+            'overrun_total_ms': round(self.stats['overrun_total_s'] * 1000, 3),
+            'utilization': round(self.stats['busy_s'] / wall_s, 3) if wall_s > 0 else None
+        }
+
+
+def main():
+    """Testa os três modos com a frota do exemplo"""
+    import json
+
+    from swarm_simulator_mock import SwarmSimulator
+
+    print("⏱️  Simulator - Simulation Clock Mock")
+    print("=" * 70)
+
+    with open('example_simulation_data.json', 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    def report(label: str, stats: Dict[str, Any]):
+        print(f"\n{label}")
+        print(f"   {stats['ticks']} ticks | {stats['sim_time_s']:.1f}s simulados em {stats['wall_time_s']:.2f}s reais "
+              f"({stats['realtime_factor_achieved']}× tempo real)")
+        print(f"   Orçamento/tick: {stats['tick_budget_ms']} ms | pior tick: {stats['max_tick_ms']} ms | "
+              f"overruns: {stats['overruns']} ({stats['overrun_ratio'] * 100:.1f}%) | utilização: {stats['utilization']}")
+
+    swarm = SwarmSimulator(data)
+    clock = SimulationClock(swarm.timestep, 'fast')
+    report("🚀 FAST (60s simulados):", clock.run(swarm.step, 600))
+
+    swarm = SwarmSimulator(data)
+    clock = SimulationClock(swarm.timestep, 'paced', realtime_factor=10)
+    report("🎚️  PACED 10× (5s simulados):", clock.run(swarm.step, 50))
+
+    # Fator acima do que a simulação aguenta: overruns reportados
+    swarm = SwarmSimulator(data)
+    clock = SimulationClock(swarm.timestep, 'paced', realtime_factor=2000)
+    report("🔥 PACED 2000× (20s simulados):", clock.run(swarm.step, 200))
+
+    # Lockstep: driver externo (ex: bancada HIL) libera um tick por vez
+    swarm = SwarmSimulator(data)
+    clock = SimulationClock(swarm.timestep, 'lockstep')
+
+    def driver():
+        for _ in range(20):
+            clock.release()
+            time.sleep(0.005)
+        clock.close()
+
+    thread = threading.Thread(target=driver)
+    thread.start()
+    stats = clock.run(swarm.step, 1000)
+    thread.join()
+    report("🔒 LOCKSTEP (driver libera 20 ticks a cada 5 ms):", stats)
+
+    print(f"\n✅ Simulation clock funcionando!")
+
+
+if __name__ == '__main__':
+    main()
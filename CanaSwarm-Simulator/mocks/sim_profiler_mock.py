@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+Simulation Profiler Mock - CanaSwarm Simulator
+
+Modo profiler do simulador: mede o tempo gasto por tick em cada subsistema
+(lógica de missão, atuadores, física, bateria, sensores, saúde, alertas e
+ambiente) antes de escalar o tamanho da frota.
+
+Os métodos medidos são envolvidos por instância (sem tocar nas classes),
+então só a simulação instrumentada paga o custo, e `detach()` devolve os
+métodos originais. Os wrappers são objetos picláveis: o checkpoint de uma
+simulação instrumentada restaura robôs e ramos já medidos (cada ramo com a
+própria cópia do profiler). Cada chamada é acumulada pela pilha de chamadas
+medidas, o que permite separar tempo próprio de tempo dos filhos e exportar
+no formato "collapsed stacks" (`tick;RobotSimulator.update;... 1234`),
+aceito por flamegraph.pl, speedscope e inferno.
+
+Author: CanaSwarm Team
+Date: 2026-02-20
+"""
+
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Métodos medidos por componente: (atributo da simulação, métodos)
+ROBOT_METHODS = (
+    'update', 'fast_forward', '_execute_mission_logic', '_apply_actions',
+    '_update_sensors', '_update_mission_progress', '_update_health_status',
+    '_update_statistics', '_check_alerts'
+)
+PHYSICS_METHODS = (
+    'update_robot_physics', 'update_battery_physics', 'detect_collisions',
+    'advance_battery', 'battery_power_balance'
+)
+ENVIRONMENT_METHODS = ('update_environment',)
+
+ROOT_FRAME = 'tick'
+
+
+class _Measured:
+    """Wrapper medido de um método (piclável: guarda objeto, função da classe e rótulo)"""
+
+    __slots__ = ('profiler', 'obj', 'function', 'label', 'tick')
+
+    def __init__(self, profiler: 'SimProfiler', obj: Any, function: Callable, label: str, tick: bool):
+        self.profiler = profiler
+        self.obj = obj
+        self.function = function
+        self.label = label
+        self.tick = tick
+
+    def __call__(self, *args, **kwargs):
+        profiler = self.profiler
+        child_time = profiler._child_time
+        time_fn = profiler.time_fn
+        parent = profiler._stack
+        stack = profiler._stack = parent + (self.label,)
+        child_time.append(0.0)
+        start = time_fn()
+        try:
+            return self.function(self.obj, *args, **kwargs)
+        finally:
+            elapsed = time_fn() - start
+            children = child_time.pop()
+            if child_time:
+                child_time[-1] += elapsed
+            profiler._stack = parent
+
+            entry = profiler.frames.get(stack)
+            if entry is None:
+                entry = profiler.frames[stack] = [0, 0.0, 0.0]
+            entry[0] += 1
+            entry[1] += elapsed
+            entry[2] += children
+            if self.tick:
+                profiler.ticks += 1
+                profiler.tick_seconds += elapsed
+
+
+class SimProfiler:
+    """Profiler por subsistema com pilha de chamadas e saída collapsed stacks"""
+
+    def __init__(self, time_fn: Callable[[], float] = time.perf_counter):
+        """
+        Inicializa profiler
+
+        Args:
+            time_fn: Relógio de parede (substituível em testes)
+        """
+        self.time_fn = time_fn
+
+        # Pilha (tupla de frames) → [chamadas, tempo total, tempo dos filhos]
+        self.frames: Dict[Tuple[str, ...], List[float]] = {}
+        self._stack: Tuple[str, ...] = ()
+        self._child_time: List[float] = []
+
+        self.ticks = 0
+        self.tick_seconds = 0.0
+        self._patched: List[Tuple[Any, str]] = []
+
+    def instrument(self, swarm):
+        """
+        Envolve o tick do swarm e os métodos de robôs, física e ambiente
+
+        Pode ser chamado de novo para medir robôs adicionados depois
+        (objetos já instrumentados são mantidos).
+
+        Args:
+            swarm: SwarmSimulator (ou objeto com `step`, `robots`,
+                `physics_engine` e `env_simulator`)
+        """
+        self._wrap(swarm, 'step', ROOT_FRAME, tick=True)
+        for method in PHYSICS_METHODS:
+            self._wrap(swarm.physics_engine, method, f'PhysicsEngine.{method}')
+        for method in ENVIRONMENT_METHODS:
+            self._wrap(swarm.env_simulator, method, f'EnvironmentSimulator.{method}')
+        for robot in swarm.robots:
+            for method in ROBOT_METHODS:
+                self._wrap(robot, method, f'RobotSimulator.{method}')
+
+    def detach(self):
+        """Remove os wrappers (volta aos métodos da classe)"""
+        for obj, name in reversed(self._patched):
+            delattr(obj, name)
+        self._patched.clear()
+
+    def reset(self):
+        """Zera as medições (mantém a instrumentação)"""
+        self.frames.clear()
+        self.ticks = 0
+        self.tick_seconds = 0.0
+
+    def _wrap(self, obj: Any, name: str, label: str, tick: bool = False):
+        """Substitui `obj.name` por um wrapper medido (atributo de instância)"""
+        if isinstance(vars(obj).get(name), _Measured):
+            return  # já instrumentado
+        setattr(obj, name, _Measured(self, obj, getattr(type(obj), name), label, tick))
+        self._patched.append((obj, name))
+
+    def ticks_per_second(self) -> float:
+        """Ticks por segundo de parede (só o tempo dentro dos ticks)"""
+        return self.ticks / self.tick_seconds if self.tick_seconds > 0 else 0.0
+
+    def breakdown(self) -> List[Dict[str, Any]]:
+        """
+        Tempo por método, somado sobre todas as pilhas em que aparece
+
+        Returns:
+            Linhas ordenadas por tempo próprio (maior primeiro), com tempo
+            total/próprio, µs por tick e fração do tempo dos ticks
+        """
+        totals: Dict[str, List[float]] = {}
+        for stack, (calls, total_s, children_s) in self.frames.items():
+            row = totals.setdefault(stack[-1], [0, 0.0, 0.0])
+            row[0] += calls
+            row[2] += total_s - children_s
+            # Tempo total sem contar recursão (frame já presente mais acima na pilha)
+            if stack[-1] not in stack[:-1]:
+                row[1] += total_s
+
+        ticks = max(1, self.ticks)
+        tick_seconds = self.tick_seconds or 1.0
+        rows = [{
+            'name': name,
+            'calls': int(calls),
+            'total_s': total_s,
+            'self_s': self_s,
+            'self_us_per_tick': self_s / ticks * 1e6,
+            'self_fraction': self_s / tick_seconds
+        } for name, (calls, total_s, self_s) in totals.items()]
+        rows.sort(key=lambda row: row['self_s'], reverse=True)
+        return rows
+
+    def collapsed_stacks(self) -> List[str]:
+        """
+        Linhas "frame;frame;frame valor" com o tempo próprio em µs
+
+        Returns:
+            Linhas prontas para flamegraph.pl / speedscope
+        """
+        lines = []
+        for stack, (calls, total_s, children_s) in sorted(self.frames.items()):
+            self_us = int(round((total_s - children_s) * 1e6))
+            if self_us > 0:
+                lines.append(f"{';'.join(stack)} {self_us}")
+        return lines
+
+    def write_collapsed(self, path: str) -> int:
+        """
+        Grava as collapsed stacks em arquivo
+
+        Returns:
+            Número de linhas gravadas
+        """
+        lines = self.collapsed_stacks()
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(lines) + '\n')
+        return len(lines)
+
+    def get_summary(self) -> Dict[str, Any]:
+        """Resumo: ticks, ticks/s e detalhamento por método"""
+        return {
+            'ticks': self.ticks,
+            'tick_seconds': round(self.tick_seconds, 6),
+            'ticks_per_second': round(self.ticks_per_second(), 1),
+            'us_per_tick': round(self.tick_seconds / self.ticks * 1e6, 1) if self.ticks else 0.0,
+            'breakdown': self.breakdown()
+        }
+
+
+def format_breakdown(summary: Dict[str, Any], limit: Optional[int] = None) -> List[str]:
+    """Tabela de texto do detalhamento (tempo próprio por método)"""
+    lines = [f"{'método':<42} {'chamadas':>9} {'µs/tick':>9} {'%':>6}"]
+    for row in summary['breakdown'][:limit]:
+        lines.append(f"{row['name']:<42} {row['calls']:>9} {row['self_us_per_tick']:>9.1f} "
+                     f"{row['self_fraction']*100:>5.1f}%")
+    return lines
+
+
+def main():
+    """Testa profiler no swarm do exemplo e em uma frota escalada"""
+    import json
+    import os
+    import tempfile
+
+    from swarm_simulator_mock import SwarmSimulator
+    from telemetry_bridge_mock import scale_fleet
+
+    print("🔬 Simulator - Simulation Profiler Mock")
+    print("=" * 70)
+
+    with open('example_simulation_data.json', 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    # 1. Modo profiler pela configuração
+    profiled = dict(data, config=dict(data['config'], profile=True))
+    swarm = SwarmSimulator(profiled)
+    swarm.run(60)
+    summary = swarm.profiler.get_summary()
+
+    print(f"\n🤖 FROTA DO EXEMPLO ({len(swarm.robots)} robôs, 60s simulados):")
+    print(f"   {summary['ticks']} ticks | {summary['ticks_per_second']:.0f} ticks/s | "
+          f"{summary['us_per_tick']:.0f} µs/tick")
+    for line in format_breakdown(summary, limit=8):
+        print(f"   {line}")
+
+    # 2. Overhead da instrumentação
+    plain = SwarmSimulator(data)
+    start = time.perf_counter()
+    plain.run(60)
+    plain_s = time.perf_counter() - start
+    print(f"\n⏱️  OVERHEAD: {summary['tick_seconds']:.3f}s instrumentado vs {plain_s:.3f}s sem profiler")
+
+    # 3. Frota escalada: onde o tempo vai com mais robôs
+    fleet = scale_fleet(data, 100)
+    swarm = SwarmSimulator(fleet)
+    profiler = SimProfiler()
+    swarm.attach_profiler(profiler)
+    swarm.run(10)
+    summary = profiler.get_summary()
+
+    print(f"\n🐝 FROTA DE {len(swarm.robots)} ROBÔS (10s simulados):")
+    print(f"   {summary['ticks_per_second']:.1f} ticks/s | {summary['us_per_tick']/len(swarm.robots):.0f} µs/robô/tick")
+    for line in format_breakdown(summary, limit=5):
+        print(f"   {line}")
+
+    # 4. Flame graph
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'sim_profile.folded')
+        count = profiler.write_collapsed(path)
+        size_kb = os.path.getsize(path) / 1024
+    heaviest = max(profiler.collapsed_stacks(), key=lambda line: int(line.rsplit(' ', 1)[1]))
+    print(f"\n🔥 COLLAPSED STACKS: {count} pilhas em {os.path.basename(path)} ({size_kb:.1f} KB)")
+    print(f"   Mais pesada: {heaviest}")
+
+    profiler.detach()
+    print(f"   Após detach: {'step' not in vars(swarm)} (métodos originais)")
+
+    print(f"\n✅ Simulation profiler funcionando!")
+
+
+if __name__ == '__main__':
+    main()
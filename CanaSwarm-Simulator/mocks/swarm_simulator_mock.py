@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+Swarm Simulator Mock - CanaSwarm Simulator
+
+Simula a frota inteira sobre um relógio comum com taxas múltiplas:
+- Física dos robôs ativos a cada timestep (0.1s)
+- Clima, sol e plantação nas taxas do EnvironmentSimulator (1s, 1min, 1h)
+- Robôs parados (idle/carregando) avançados direto até o próximo evento
+  (fim de carga, limiar de SOC/temperatura, atualização do sol)
+- Opcional: faixas do campo distribuídas por um MissionAllocator, com
+  realocação quando um robô entra em parada de emergência
+- Opcional: modo profiler (`config['profile']` ou `attach_profiler`) com
+  tempo por subsistema e ticks/s (ver SimProfiler)
+
+Author: CanaSwarm Team
+Date: 2026-02-20
+"""
+
+import copy
+import json
+import time
+from typing import Any, Dict, List, Optional
+
+from environment_simulator_mock import EnvironmentSimulator
+from physics_engine_mock import PhysicsEngine
+from rng_streams_mock import RNGStreams
+from robot_simulator_mock import RobotSimulator
+from sim_clock_mock import SimulationClock
+from sim_profiler_mock import SimProfiler
+
+
+class SwarmSimulator:
+    """Simulador de frota com agendamento multi-taxa"""
+
+    def __init__(self, simulation_data: Dict[str, Any], rng_streams: Optional[RNGStreams] = None):
+        """
+        Inicializa swarm simulator
+
+        Args:
+            simulation_data: Dados da simulação (config, environment, robots)
+            rng_streams: Streams aleatórios (default: seed de `config['random_seed']`)
+        """
+        # Cópia profunda: cada simulação é dona do próprio estado
+        data = copy.deepcopy(simulation_data)
+
+        self.config = data['config']
+        self.timestep = self.config.get('timestep_seconds', 0.1)
+        self.max_fast_forward = self.config.get('max_fast_forward_seconds', 60.0)
+        self.rng_streams = rng_streams or RNGStreams.from_config(self.config)
+
+        self.physics_engine = PhysicsEngine(self.config)
+        self.env_simulator = EnvironmentSimulator(data['environment'], self.config, self.rng_streams)
+        self.robots: List[RobotSimulator] = [
+            RobotSimulator(robot_data, self.env_simulator.environment, self.physics_engine,
+                           self.env_simulator, self.rng_streams)
+            for robot_data in data['robots']
+        ]
+
+        self.step_count = 0
+        self.elapsed_seconds = 0.0
+        # Instante (simulado) até onde cada robô já foi atualizado
+        self._robot_clock = [0.0] * len(self.robots)
+        self.stats = {
+            'robot_updates': 0,
+            'robot_updates_skipped': 0,
+            'fast_forwards': 0
+        }
+        self.recorder = None
+        self.allocator = None
+        self.profiler = None
+        if self.config.get('profile', False):
+            self.attach_profiler(SimProfiler())
+
+    def attach_recorder(self, recorder):
+        """
+        Grava cada resultado de robô (ver TrajectoryRecorder)
+
+        Args:
+            recorder: Objeto com `record_result(t, robot_index, result)`
+        """
+        self.recorder = recorder
+
+    def attach_profiler(self, profiler):
+        """
+        Mede o tempo de cada tick por subsistema (ver SimProfiler)
+
+        Args:
+            profiler: Objeto com `instrument(swarm)`
+        """
+        self.profiler = profiler
+        profiler.instrument(self)
+
+    def attach_allocator(self, allocator, reserve_soc_percent: float = 30.0):
+        """
+        Entrega a distribuição de faixas a um MissionAllocator
+
+        Todas as colheitadeiras entram no leilão com a energia acima da
+        reserva (recarga vai até 80%). Robôs ociosos recebem a primeira faixa
+        na hora; os demais ao terminar a missão atual.
+
+        Args:
+            allocator: MissionAllocator com as faixas do campo
+            reserve_soc_percent: SOC mantido fora do leilão (volta à base)
+
+        Returns:
+            O próprio allocator, já alocado
+        """
+        self.allocator = allocator
+        for robot in self.robots:
+            data = robot.robot
+            if data['type'] != 'harvester':
+                continue
+            battery = data['state']['battery']
+            wh_per_percent = battery['capacity_ah'] * self.physics_engine.battery_model.nominal_voltage_v / 100
+            position = data['state']['position']
+            allocator.add_robot(data['robot_id'], position['lat'], position['lon'],
+                                available_wh=max(0.0, battery['soc_percent'] - reserve_soc_percent) * wh_per_percent,
+                                capacity_wh=max(0.0, 80 - reserve_soc_percent) * wh_per_percent,
+                                work_width_m=robot.work_width_m,
+                                travel_speed_ms=data['physics'].get('max_speed_ms', 2.0))
+
+        allocator.allocate()
+        for robot in self.robots:
+            self._dispatch_mission(robot, None)
+        return allocator
+
+    def _dispatch_mission(self, robot: RobotSimulator, result: Optional[Dict[str, Any]]):
+        """Realoca faixas de robôs em emergência e entrega a próxima faixa a robôs ociosos"""
+        robot_id = robot.robot['robot_id']
+        assignment = self.allocator.robots.get(robot_id)
+        if assignment is None or not assignment['active']:
+            return
+
+        state = robot.robot['state']
+        if result is not None and result.get('action') == 'emergency_stop_low_battery':
+            self.allocator.release_robot(robot_id)
+            state['mission']['status'] = 'idle'
+            return
+
+        if state['mission']['status'] == 'idle' and not state['battery']['charging']:
+            strip = self.allocator.next_strip(robot_id)
+            if strip is not None:
+                state['mission'].pop('destination', None)
+                state['mission'].update(self.allocator.mission_for(strip))
+
+    def step(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Avança a frota 1 timestep
+
+        Returns:
+            Resultados dos robôs atualizados neste passo (por robot_id)
+        """
+        self.step_count += 1
+        self.elapsed_seconds = self.step_count * self.timestep
+        results = {}
+
+        for index, robot in enumerate(self.robots):
+            robot_id = robot.robot['robot_id']
+
+            # Robô já avançado além deste instante por fast-forward
+            if self._robot_clock[index] >= self.elapsed_seconds - 1e-9:
+                self.stats['robot_updates_skipped'] += 1
+                continue
+
+            # Robô parado: salta direto até o próximo evento
+            if robot.is_quiescent():
+                result = robot.fast_forward(self.max_fast_forward)
+                if result is not None:
+                    results[robot_id] = result
+                    self._robot_clock[index] += result['fast_forward_seconds']
+                    self.stats['fast_forwards'] += 1
+                    if self.recorder is not None:
+                        self.recorder.record_result(self._robot_clock[index], index, result)
+                    if self.allocator is not None:
+                        self._dispatch_mission(robot, result)
+                    continue
+
+            result = results[robot_id] = robot.update(self.elapsed_seconds - self._robot_clock[index])
+            self._robot_clock[index] = self.elapsed_seconds
+            self.stats['robot_updates'] += 1
+            if self.recorder is not None:
+                self.recorder.record_result(self.elapsed_seconds, index, result)
+            if self.allocator is not None:
+                self._dispatch_mission(robot, result)
+
+        self.env_simulator.update_environment(self.timestep)
+        return results
+
+    def run(self, duration_seconds: float, clock: Optional[SimulationClock] = None) -> Dict[str, Any]:
+        """
+        Simula a frota por um intervalo
+
+        Args:
+            duration_seconds: Tempo simulado
+            clock: Relógio para pacing (paced/lockstep); sem relógio roda o mais rápido possível
+
+        Returns:
+            Resumo da execução (com as métricas do relógio, se houver)
+        """
+        steps = int(round(duration_seconds / self.timestep))
+        if clock is None:
+            for _ in range(steps):
+                self.step()
+            return self.get_summary()
+
+        clock.run(self.step, steps)
+        summary = self.get_summary()
+        summary['clock'] = clock.get_stats()
+        return summary
+
+    def get_summary(self) -> Dict[str, Any]:
+        """Resumo da frota e do agendamento"""
+        total_updates = sum(self.stats.values())
+        return {
+            'elapsed_seconds': round(self.elapsed_seconds, 3),
+            'steps': self.step_count,
+            'robots': len(self.robots),
+            'robot_updates': self.stats['robot_updates'],
+            'robot_updates_skipped': self.stats['robot_updates_skipped'],
+            'fast_forwards': self.stats['fast_forwards'],
+            'skip_ratio': round(self.stats['robot_updates_skipped'] / total_updates, 3) if total_updates else 0,
+            'environment_updates': self.env_simulator.scheduler.get_stats()
+        }
+
+
+def main():
+    """Testa swarm simulator com a frota do exemplo"""
+    print("🐝 Simulator - Swarm Simulator Mock")
+    print("=" * 70)
+
+    with open('example_simulation_data.json', 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    swarm = SwarmSimulator(data)
+
+    print(f"\n🤖 FROTA: {len(swarm.robots)} robôs")
+    for robot in swarm.robots:
+        state = robot.robot['state']
+        print(f"   {robot.robot['robot_id']}: {state['mission']['status']} | SOC {state['battery']['soc_percent']:.1f}%")
+
+    duration = 600  # 10 minutos
+    print(f"\n⏱️  SIMULANDO {duration}s (timestep {swarm.timestep}s)...")
+    start = time.perf_counter()
+    summary = swarm.run(duration)
+    wall_s = time.perf_counter() - start
+
+    print(f"\n📊 AGENDAMENTO:")
+    print(f"   Passos: {summary['steps']} ({wall_s:.2f}s reais)")
+    print(f"   Atualizações de robô: {summary['robot_updates']} | fast-forwards: {summary['fast_forwards']} "
+          f"(puladas: {summary['robot_updates_skipped']}, {summary['skip_ratio']*100:.0f}%)")
+    for name, runs in summary['environment_updates'].items():
+        print(f"   Ambiente/{name}: {runs} atualizações")
+
+    print(f"\n🤖 ESTADO FINAL:")
+    for robot in swarm.robots:
+        state = robot.robot['state']
+        print(f"   {robot.robot['robot_id']}: {state['mission']['status']} | SOC {state['battery']['soc_percent']:.1f}% | "
+              f"{robot.stats['distance_traveled_km']*1000:.1f} m | {robot.stats['energy_consumed_kwh']*1000:.1f} Wh")
+
+    print(f"\n✅ Swarm simulator funcionando!")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,475 @@
+#!/usr/bin/env python3
+"""
+Telemetry Bridge Mock - CanaSwarm Simulator
+
+Liga o simulador ao stack de telemetria: a cada publicação (em Hz de tempo
+simulado) o estado da frota vira registros no formato de
+`Telemetry/mocks/example_telemetry_data.json` (e, opcionalmente, no
+contrato `contracts/telemetry.schema.json`) e segue por uma fila asyncio
+limitada até MetricsCollector, DataAggregator e AlertManager.
+
+A fila limitada dá backpressure: se a telemetria não acompanha, o produtor
+(a simulação) espera em vez de acumular memória. Serve de gerador de carga
+ponta a ponta para a telemetria, sem robôs reais, com tamanho de frota e
+frequência configuráveis.
+
+Author: CanaSwarm Team
+Date: 2026-02-20
+"""
+
+import asyncio
+import copy
+import math
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from sim_clock_mock import SimulationClock
+from swarm_simulator_mock import SwarmSimulator
+
+TELEMETRY_MOCKS_DIR = Path(__file__).resolve().parent.parent.parent / 'Telemetry' / 'mocks'
+
+# Status da missão no simulador → status operacional do contrato
+CONTRACT_STATUS = {
+    'harvesting': 'working',
+    'transporting': 'moving',
+    'charging': 'charging',
+    'idle': 'idle'
+}
+
+# Status da missão → task_type do contrato
+CONTRACT_TASK_TYPE = {
+    'harvesting': 'harvest',
+    'transporting': 'transport'
+}
+
+# Consumo nominal para estimar autonomia antes do robô ter rodado (Wh/km)
+NOMINAL_WH_PER_KM = 600
+
+# Conversão aproximada de irradiância solar para iluminância
+LUX_PER_W_M2 = 120
+
+
+def scale_fleet(simulation_data: Dict[str, Any], fleet_size: int,
+                spacing_deg: float = 0.0001) -> Dict[str, Any]:
+    """
+    Replica os robôs do exemplo até `fleet_size` robôs
+
+    Cada cópia recebe um ID próprio (sufixo numérico) e é deslocada em
+    grade para não ocupar a mesma posição.
+
+    Args:
+        simulation_data: Dados da simulação (config, environment, robots)
+        fleet_size: Número de robôs desejado
+        spacing_deg: Espaçamento entre cópias (graus)
+
+    Returns:
+        Cópia dos dados com a frota escalada
+    """
+    data = copy.deepcopy(simulation_data)
+    templates = data['robots']
+    robots = []
+    for index in range(fleet_size):
+        robot = copy.deepcopy(templates[index % len(templates)])
+        copy_number = index // len(templates)
+        if copy_number:
+            prefix = robot['robot_id'].rsplit('-', 1)[0]
+            robot['robot_id'] = f"{prefix}-{index + 1:04d}"
+            position = robot['state']['position']
+            position['lat'] += spacing_deg * (copy_number % 50)
+            position['lon'] += spacing_deg * (copy_number // 50)
+        robots.append(robot)
+    data['robots'] = robots
+    return data
+
+
+class TelemetryBridge:
+    """Converte ticks do simulador em telemetria e alimenta o stack de telemetria"""
+
+    def __init__(self, swarm: SwarmSimulator, publish_hz: float = 1.0, queue_size: int = 16,
+                 session_id: Optional[str] = None):
+        """
+        Inicializa bridge
+
+        Args:
+            swarm: Simulação produtora
+            publish_hz: Publicações por segundo simulado
+            queue_size: Capacidade da fila (payloads de frota) antes do backpressure
+            session_id: ID da sessão de telemetria
+        """
+        if publish_hz <= 0:
+            raise ValueError(f"publish_hz deve ser positivo: {publish_hz}")
+
+        self.swarm = swarm
+        self.publish_hz = publish_hz
+        self.queue_size = queue_size
+        self.ticks_per_publish = max(1, round(1 / (publish_hz * swarm.timestep)))
+        self.session_id = session_id or ('TELEM-SIM-' + swarm.env_simulator.current_time.strftime('%Y%m%d-%H%M%S'))
+
+        # Resultados mais recentes de cada robô (alertas e potência)
+        self._latest: Dict[str, Dict[str, Any]] = {}
+
+        self.stats = {
+            'ticks': 0,
+            'published': 0,
+            'consumed': 0,
+            'robot_records': 0,
+            'max_queue_depth': 0,
+            'producer_blocked_s': 0.0,
+            'consumer_busy_s': 0.0
+        }
+
+    def _timestamp(self) -> str:
+        return self.swarm.env_simulator.current_time.isoformat(timespec='milliseconds') + 'Z'
+
+    def robot_record(self, robot_sim, timestamp: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Registro de um robô no formato de `robots_telemetry`
+
+        Args:
+            robot_sim: RobotSimulator
+            timestamp: Timestamp ISO (default: relógio do ambiente)
+
+        Returns:
+            Registro de telemetria do robô
+        """
+        robot = robot_sim.robot
+        state = robot['state']
+        position = state['position']
+        battery = state['battery']
+        latest = self._latest.get(robot['robot_id'], {})
+        battery_result = latest.get('battery', {})
+
+        remaining_wh = battery['soc_percent'] / 100 * battery['capacity_ah'] * battery['voltage_v']
+        stats = robot_sim.stats
+        wh_per_km = (stats['energy_consumed_kwh'] / stats['distance_traveled_km'] * 1000
+                     if stats['distance_traveled_km'] > 0.01 else NOMINAL_WH_PER_KM)
+
+        sensors = {}
+        for name, sensor in state['sensors'].items():
+            record = dict(sensor)
+            record.setdefault('status', 'active')
+            sensors[name] = record
+
+        actuators = {}
+        for name, actuator in state['actuators'].items():
+            if 'rpm' in actuator or 'power_w' in actuator:
+                power_w = actuator.get('power_w', 0)
+                actuators[name] = {
+                    'speed_rpm': actuator.get('rpm', 0),
+                    'power_w': power_w,
+                    'status': 'active' if power_w > 0 else 'idle'
+                }
+            else:
+                actuators[name] = {**actuator, 'status': 'active'}
+
+        alerts = [{
+            'alert_id': f"ALERT-{robot['robot_id']}-{alert['type']}",
+            'severity': alert['severity'],
+            'type': alert['type'],
+            'message': alert['message'],
+            'timestamp': alert['timestamp'],
+            'acknowledged': False
+        } for alert in latest.get('alerts', [])]
+
+        return {
+            'robot_id': robot['robot_id'],
+            'type': robot['type'],
+            'timestamp': timestamp or self._timestamp(),
+            'position': {
+                'lat': position['lat'],
+                'lon': position['lon'],
+                'altitude_m': position['altitude_m'],
+                'heading_deg': position['heading_deg'],
+                'speed_ms': state['velocity']['linear_ms']
+            },
+            'battery': {
+                'soc_percent': round(battery['soc_percent'], 1),
+                'voltage_v': round(battery['voltage_v'], 1),
+                'current_a': round(battery['current_a'], 1),
+                'temperature_c': round(battery['temperature_c'], 1),
+                'charging': battery['charging'],
+                'charge_power_kw': round(battery_result.get('power_solar_w', 0) / 1000, 3),
+                'estimated_range_km': round(remaining_wh / wh_per_km, 2),
+                'cycles_count': battery['cycles']
+            },
+            'sensors': sensors,
+            'actuators': actuators,
+            'mission': dict(state['mission']),
+            'health': dict(state['health']),
+            'alerts': alerts
+        }
+
+    def contract_record(self, robot_sim, timestamp: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Registro de um robô no formato de `contracts/telemetry.schema.json`
+
+        Args:
+            robot_sim: RobotSimulator
+            timestamp: Timestamp ISO (default: relógio do ambiente)
+
+        Returns:
+            Registro conforme o contrato v1
+        """
+        robot = robot_sim.robot
+        state = robot['state']
+        position = state['position']
+        battery = state['battery']
+        mission = state['mission']
+        health = state['health']
+        environment = self.swarm.env_simulator.environment
+        latest = self._latest.get(robot['robot_id'], {})
+
+        alnum_id = re.sub(r'[^A-Z0-9]', '', robot['robot_id'].upper())[-12:].rjust(4, '0')
+        prefix = 'SWARM' if robot['type'] == 'harvester' else 'BOT'
+
+        power_w = abs(latest.get('battery', {}).get('power_net_w', 0))
+        runtime_min = (battery['soc_percent'] / 100 * battery['capacity_ah'] * battery['voltage_v'] / power_w * 60
+                       if power_w > 0 else 1440)
+
+        record = {
+            'device_id': f'{prefix}-{alnum_id}',
+            'timestamp': timestamp or self._timestamp(),
+            'location': {
+                'latitude': position['lat'],
+                'longitude': position['lon'],
+                'altitude_m': position['altitude_m'],
+                'accuracy_m': state['sensors'].get('gps', {}).get('accuracy_m', 0.05),
+                'heading_degrees': position['heading_deg'],
+                'speed_km_h': min(50, state['velocity']['linear_ms'] * 3.6)
+            },
+            'battery': {
+                'level_percent': round(battery['soc_percent'], 1),
+                'voltage_v': round(battery['voltage_v'], 1),
+                'current_a': round(abs(battery['current_a']), 1),
+                'temperature_c': round(battery['temperature_c'], 1),
+                'estimated_runtime_minutes': int(min(1440, runtime_min))
+            },
+            'status': CONTRACT_STATUS.get(mission['status'], 'error'),
+            'sensors': {
+                'ambient_temperature_c': environment['weather']['temperature_c'],
+                'humidity_percent': environment['weather']['humidity_percent'],
+                'light_lux': environment.get('solar', {}).get('irradiance_w_per_m2', 0) * LUX_PER_W_M2
+            },
+            'diagnostics': {
+                'cpu_usage_percent': health.get('cpu_usage_percent', 0),
+                'memory_usage_percent': health.get('memory_usage_percent', 0),
+                'errors': [('ERR_' if alert['severity'] == 'critical' else 'WARN_') + alert['type'].upper()
+                           for alert in latest.get('alerts', [])]
+            }
+        }
+        if 'disk_usage_percent' in health:
+            record['diagnostics']['disk_usage_percent'] = health['disk_usage_percent']
+
+        task_type = CONTRACT_TASK_TYPE.get(mission['status'])
+        if task_type and mission.get('mission_id'):
+            mission_code = re.sub(r'[^A-Z0-9]', '', mission['mission_id'].upper())
+            task = {
+                'task_id': f'TASK-{mission_code[-16:].rjust(8, "0")}',
+                'task_type': task_type,
+                'progress_percent': mission.get('progress_percent', 0)
+            }
+            field = re.search(r'F\d{3}', mission['mission_id'])
+            zone = re.search(r'Z\d{3}', mission['mission_id'])
+            if field:
+                task['field_id'] = field.group()
+            if zone:
+                task['zone_id'] = zone.group()
+            record['task'] = task
+
+        return record
+
+    def fleet_payload(self, queue_depth: int = 0) -> Dict[str, Any]:
+        """
+        Payload de frota no formato de example_telemetry_data.json
+
+        Args:
+            queue_depth: Profundidade atual da fila (vai para system_health)
+
+        Returns:
+            Payload aceito por MetricsCollector, DataAggregator e AlertManager
+        """
+        timestamp = self._timestamp()
+        robots = [self.robot_record(robot_sim, timestamp) for robot_sim in self.swarm.robots]
+
+        mission_types: Dict[str, int] = {}
+        for record in robots:
+            status = record['mission'].get('status', 'idle')
+            mission_types[status] = mission_types.get(status, 0) + 1
+        idle = mission_types.get('idle', 0) + mission_types.get('charging', 0)
+
+        return {
+            'telemetry_session_id': self.session_id,
+            'timestamp': timestamp,
+            'collection_interval_seconds': 1 / self.publish_hz,
+            'fleet_snapshot': {
+                'total_robots': len(robots),
+                'active_robots': len(robots) - idle,
+                'idle_robots': idle,
+                'charging_robots': sum(1 for record in robots if record['battery']['charging']),
+                'mission_types': mission_types
+            },
+            'robots_telemetry': robots,
+            'system_health': {
+                'telemetry_collector_status': 'healthy',
+                'message_queue_depth': queue_depth,
+                'dropped_messages_count': 0,
+                'last_collection_timestamp': timestamp
+            }
+        }
+
+    def _tick(self):
+        """Avança a simulação 1 timestep e guarda os resultados dos robôs"""
+        self._latest.update(self.swarm.step())
+        self.stats['ticks'] += 1
+
+    async def produce(self, queue: asyncio.Queue, duration_seconds: float,
+                      clock: Optional[SimulationClock] = None):
+        """
+        Simula e publica payloads de frota na fila
+
+        Args:
+            queue: Fila limitada (put espera quando cheia = backpressure)
+            duration_seconds: Tempo simulado
+            clock: Relógio fast/paced (lockstep não é suportado no event loop)
+        """
+        if clock is not None and clock.mode == 'lockstep':
+            raise ValueError("Bridge assíncrona suporta relógio fast ou paced")
+
+        steps = int(round(duration_seconds / self.swarm.timestep))
+        for step in range(1, steps + 1):
+            if clock is not None:
+                delay = clock.time_until_next_tick()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                clock.begin_tick()
+                self._tick()
+                clock.end_tick()
+            else:
+                self._tick()
+
+            if step % self.ticks_per_publish == 0:
+                payload = self.fleet_payload(queue.qsize())
+                start = time.perf_counter()
+                await queue.put(payload)
+                self.stats['producer_blocked_s'] += time.perf_counter() - start
+                self.stats['published'] += 1
+                self.stats['robot_records'] += len(payload['robots_telemetry'])
+                self.stats['max_queue_depth'] = max(self.stats['max_queue_depth'], queue.qsize())
+            elif step % 64 == 0:
+                # Cede o event loop para os consumidores em publicações espaçadas
+                await asyncio.sleep(0)
+
+        await queue.put(None)
+
+    async def consume(self, queue: asyncio.Queue, consumers: List[Any]) -> List[Dict[str, Any]]:
+        """
+        Entrega cada payload aos consumidores de telemetria
+
+        Args:
+            queue: Fila alimentada por `produce`
+            consumers: MetricsCollector, DataAggregator, AlertManager (ou compatíveis)
+
+        Returns:
+            Último resultado de cada consumidor
+        """
+        latest_results: List[Dict[str, Any]] = []
+        while True:
+            payload = await queue.get()
+            if payload is None:
+                break
+
+            start = time.perf_counter()
+            latest_results = [self._dispatch(consumer, payload) for consumer in consumers]
+            self.stats['consumer_busy_s'] += time.perf_counter() - start
+            self.stats['consumed'] += 1
+            queue.task_done()
+        return latest_results
+
+    @staticmethod
+    def _dispatch(consumer: Any, payload: Dict[str, Any]) -> Dict[str, Any]:
+        for method in ('collect_metrics', 'aggregate_data', 'manage_alerts'):
+            handler = getattr(consumer, method, None)
+            if handler is not None:
+                return handler(payload)
+        raise TypeError(f"Consumidor sem interface de telemetria: {type(consumer).__name__}")
+
+    async def run(self, duration_seconds: float, consumers: List[Any],
+                  clock: Optional[SimulationClock] = None) -> Dict[str, Any]:
+        """
+        Executa produtor e consumidores até o fim da simulação
+
+        Returns:
+            Estatísticas do fluxo e último resultado de cada consumidor
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        start = time.perf_counter()
+        _, results = await asyncio.gather(
+            self.produce(queue, duration_seconds, clock),
+            self.consume(queue, consumers)
+        )
+        wall_s = time.perf_counter() - start
+
+        return {
+            'wall_time_s': round(wall_s, 3),
+            'records_per_second': round(self.stats['robot_records'] / wall_s, 1) if wall_s > 0 else 0,
+            **{key: round(value, 4) if isinstance(value, float) else value for key, value in self.stats.items()},
+            'results': results
+        }
+
+
+def load_telemetry_consumers(session_id: str) -> List[Any]:
+    """Instancia MetricsCollector, DataAggregator e AlertManager de Telemetry/mocks"""
+    if str(TELEMETRY_MOCKS_DIR) not in sys.path:
+        sys.path.insert(0, str(TELEMETRY_MOCKS_DIR))
+
+    from alert_manager_mock import AlertManager
+    from data_aggregator_mock import DataAggregator
+    from metrics_collector_mock import MetricsCollector
+
+    return [MetricsCollector(session_id), DataAggregator(session_id), AlertManager(session_id)]
+
+
+def main():
+    """Gera carga de telemetria com a frota do exemplo escalada"""
+    import json
+
+    print("📡 Simulator - Telemetry Bridge Mock")
+    print("=" * 70)
+
+    with open('example_simulation_data.json', 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    swarm = SwarmSimulator(data)
+    bridge = TelemetryBridge(swarm, publish_hz=1.0)
+
+    # Registro no formato do contrato (validação leve dos campos obrigatórios)
+    swarm.step()
+    record = bridge.contract_record(swarm.robots[1])
+    required = ('device_id', 'timestamp', 'location', 'battery', 'status')
+    device_ok = re.fullmatch(r'(BOT|SWARM|DRONE)-[A-Z0-9]{4,12}', record['device_id']) is not None
+    print(f"\n📄 CONTRATO telemetry.v1: {record['device_id']} | status {record['status']} | "
+          f"obrigatórios {all(key in record for key in required)} | device_id válido {device_ok}")
+
+    for fleet_size, hz in ((3, 1.0), (50, 1.0), (50, 10.0)):
+        swarm = SwarmSimulator(scale_fleet(data, fleet_size))
+        bridge = TelemetryBridge(swarm, publish_hz=hz, queue_size=8)
+        consumers = load_telemetry_consumers(bridge.session_id)
+        summary = asyncio.run(bridge.run(30, consumers))
+
+        collection, aggregation, alerts = summary['results']
+        print(f"\n🔀 FROTA {fleet_size} robôs @ {hz:g} Hz (30s simulados):")
+        print(f"   Payloads: {summary['published']} publicados / {summary['consumed']} consumidos | "
+              f"{summary['robot_records']} registros em {summary['wall_time_s']}s ({summary['records_per_second']:.0f} registros/s)")
+        print(f"   Fila: profundidade máx {summary['max_queue_depth']}/{bridge.queue_size} | "
+              f"produtor bloqueado {summary['producer_blocked_s']:.3f}s | consumidores {summary['consumer_busy_s']:.3f}s")
+        print(f"   Coletor: SOC médio {collection['collection_stats']['average_battery_soc']}% | "
+              f"Agregador: {aggregation['fleet']['total_robots']} robôs | Alertas: {alerts['total_alerts']}")
+
+    print(f"\n✅ Telemetry bridge funcionando!")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+Terrain Raster Mock - CanaSwarm Simulator
+
+Campos espaciais (altura do terreno, densidade de plantas) rasterizados em
+grade regular sobre os bounds do campo, com interpolação bilinear.
+
+O raster é calculado uma única vez (ou mapeado em memória a partir de disco,
+para DEM/NDVI reais) e as consultas por posição viram acesso a 4 células.
+
+Formato em disco:
+- `<path>`: valores float32 little-endian, linha a linha (linha 0 = lat_min)
+- `<path>.json`: cabeçalho com bounds, rows, cols
+
+Author: CanaSwarm Team
+Date: 2026-02-20
+"""
+
+import json
+import math
+import mmap
+import sys
+from array import array
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+# Metros por grau de latitude (mesma aproximação do PhysicsEngine)
+METERS_PER_DEG_LAT = 111000
+
+
+class TerrainRaster:
+    """Grade regular de valores sobre os bounds do campo"""
+
+    def __init__(self, bounds: Dict[str, float], rows: int, cols: int, values,
+                 outside_value: Optional[float] = None):
+        """
+        Inicializa raster
+
+        Args:
+            bounds: lat_min, lat_max, lon_min, lon_max
+            rows, cols: Dimensões da grade (>= 2 em cada eixo)
+            values: Sequência indexável de rows × cols valores (linha 0 = lat_min)
+            outside_value: Valor fora dos bounds (None = estende a borda)
+        """
+        if rows < 2 or cols < 2:
+            raise ValueError("Raster precisa de pelo menos 2x2 células")
+        if len(values) != rows * cols:
+            raise ValueError(f"Esperados {rows * cols} valores, recebidos {len(values)}")
+
+        self.bounds = dict(bounds)
+        self.rows = rows
+        self.cols = cols
+        self.values = values
+        self.outside_value = outside_value
+
+        self._lat_min = bounds['lat_min']
+        self._lon_min = bounds['lon_min']
+        self._lat_scale = (rows - 1) / (bounds['lat_max'] - bounds['lat_min'])
+        self._lon_scale = (cols - 1) / (bounds['lon_max'] - bounds['lon_min'])
+        self._mmap = None
+        # Arquivo de origem (rasters mapeados com `from_file`)
+        self.source_path = None
+
+    @classmethod
+    def from_function(cls, bounds: Dict[str, float], resolution_m: float,
+                      fn: Callable[[float, float], float],
+                      outside_value: Optional[float] = None) -> 'TerrainRaster':
+        """
+        Rasteriza um modelo analítico fn(lat, lon)
+
+        Args:
+            bounds: Bounds do campo
+            resolution_m: Espaçamento da grade em metros
+            fn: Modelo avaliado em cada nó da grade
+            outside_value: Valor fora dos bounds
+
+        Returns:
+            Raster com os valores pré-calculados
+        """
+        lat_span = bounds['lat_max'] - bounds['lat_min']
+        lon_span = bounds['lon_max'] - bounds['lon_min']
+        mid_lat = (bounds['lat_max'] + bounds['lat_min']) / 2
+
+        height_m = lat_span * METERS_PER_DEG_LAT
+        width_m = lon_span * METERS_PER_DEG_LAT * math.cos(math.radians(mid_lat))
+        rows = max(2, int(math.ceil(height_m / resolution_m)) + 1)
+        cols = max(2, int(math.ceil(width_m / resolution_m)) + 1)
+
+        lats = [bounds['lat_min'] + lat_span * i / (rows - 1) for i in range(rows)]
+        lons = [bounds['lon_min'] + lon_span * j / (cols - 1) for j in range(cols)]
+
+        values = array('d')
+        for lat in lats:
+            values.extend(fn(lat, lon) for lon in lons)
+
+        return cls(bounds, rows, cols, values, outside_value)
+
+    @classmethod
+    def from_file(cls, path: str, outside_value: Optional[float] = None) -> 'TerrainRaster':
+        """
+        Mapeia em memória um raster salvo em disco (DEM, NDVI)
+
+        Args:
+            path: Arquivo de valores float32 (cabeçalho em `<path>.json`)
+            outside_value: Valor fora dos bounds
+
+        Returns:
+            Raster cujos valores são lidos diretamente do arquivo mapeado
+        """
+        with open(path + '.json', 'r', encoding='utf-8') as f:
+            header = json.load(f)
+
+        with open(path, 'rb') as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if sys.byteorder != 'little':
+            values = array('f', mapped[:])
+            values.byteswap()
+            mapped.close()
+            raster = cls(header['bounds'], header['rows'], header['cols'], values, outside_value)
+            raster.source_path = path
+            return raster
+
+        buffer = memoryview(mapped)
+        raster = cls(header['bounds'], header['rows'], header['cols'], buffer.cast('f'), outside_value)
+        raster._mmap = (mapped, buffer)
+        raster.source_path = path
+        return raster
+
+    def save(self, path: str):
+        """Salva raster no formato mapeável (float32 + cabeçalho JSON)"""
+        data = array('f', self.values)
+        if sys.byteorder != 'little':
+            data.byteswap()
+        with open(path, 'wb') as f:
+            data.tofile(f)
+
+        with open(path + '.json', 'w', encoding='utf-8') as f:
+            json.dump({'bounds': self.bounds, 'rows': self.rows, 'cols': self.cols}, f, indent=2)
+
+    def sample(self, lat: float, lon: float) -> float:
+        """
+        Valor interpolado (bilinear) em uma posição GPS
+
+        Args:
+            lat, lon: Coordenadas GPS
+
+        Returns:
+            Valor interpolado
+        """
+        y = (lat - self._lat_min) * self._lat_scale
+        x = (lon - self._lon_min) * self._lon_scale
+        max_y = self.rows - 1
+        max_x = self.cols - 1
+
+        if not (0 <= y <= max_y and 0 <= x <= max_x):
+            if self.outside_value is not None:
+                return self.outside_value
+            y = min(max(y, 0.0), max_y)
+            x = min(max(x, 0.0), max_x)
+
+        i = min(int(y), max_y - 1)
+        j = min(int(x), max_x - 1)
+        ty = y - i
+        tx = x - j
+
+        values = self.values
+        base = i * self.cols + j
+        v00 = values[base]
+        v01 = values[base + 1]
+        v10 = values[base + self.cols]
+        v11 = values[base + self.cols + 1]
+
+        top = v00 + (v01 - v00) * tx
+        bottom = v10 + (v11 - v10) * tx
+        return top + (bottom - top) * ty
+
+    def sample_batch(self, lats: Iterable[float], lons: Iterable[float]) -> List[float]:
+        """Consulta em lote (uma posição por par lat/lon)"""
+        sample = self.sample
+        return [sample(lat, lon) for lat, lon in zip(lats, lons)]
+
+    def close(self):
+        """Libera o arquivo mapeado (rasters carregados com `from_file`)"""
+        if self._mmap is not None:
+            mapped, buffer = self._mmap
+            self.values.release()
+            buffer.release()
+            mapped.close()
+            self._mmap = None
+
+    def summary(self) -> Dict[str, Any]:
+        """Resumo da grade"""
+        return {
+            'rows': self.rows,
+            'cols': self.cols,
+            'cells': self.rows * self.cols,
+            'memory_mapped': self._mmap is not None,
+            'min': min(self.values),
+            'max': max(self.values)
+        }
+
+
+def main():
+    """Testa rasterização, interpolação e mapeamento em disco"""
+    import os
+    import tempfile
+    import time
+
+    print("🗺️  Simulator - Terrain Raster Mock")
+    print("=" * 70)
+
+    with open('example_simulation_data.json', 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    bounds = data['environment']['terrain']['bounds']
+
+    def density_model(lat, lon):
+        lat_norm = (lat - bounds['lat_min']) / (bounds['lat_max'] - bounds['lat_min'])
+        lon_norm = (lon - bounds['lon_min']) / (bounds['lon_max'] - bounds['lon_min'])
+        return 0.92 + 0.08 * math.sin(lat_norm * 10) * math.cos(lon_norm * 10)
+
+    start = time.perf_counter()
+    raster = TerrainRaster.from_function(bounds, 5.0, density_model, outside_value=0.0)
+    build_ms = (time.perf_counter() - start) * 1000
+    summary = raster.summary()
+    print(f"\n🧮 RASTER (5 m): {summary['rows']}x{summary['cols']} = {summary['cells']} células em {build_ms:.1f} ms")
+
+    # Erro da interpolação contra o modelo analítico
+    test_lats = [bounds['lat_min'] + (bounds['lat_max'] - bounds['lat_min']) * k / 97 for k in range(97)]
+    test_lons = [bounds['lon_min'] + (bounds['lon_max'] - bounds['lon_min']) * ((k * 37) % 97) / 97 for k in range(97)]
+    sampled = raster.sample_batch(test_lats, test_lons)
+    max_error = max(abs(s - density_model(lat, lon)) for s, lat, lon in zip(sampled, test_lats, test_lons))
+    print(f"   Erro máximo vs modelo: {max_error:.6f}")
+    print(f"   Fora dos bounds: {raster.sample(-22.0, -47.0)}")
+
+    # Round-trip em disco com mmap
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'density.f32')
+        raster.save(path)
+        mapped = TerrainRaster.from_file(path, outside_value=0.0)
+        diff = abs(mapped.sample(-22.7150, -47.6500) - raster.sample(-22.7150, -47.6500))
+        print(f"\n💾 MMAP: {os.path.getsize(path)} bytes, diferença float32 = {diff:.2e}")
+        mapped.close()
+
+    print(f"\n✅ Terrain raster funcionando!")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,24 @@
+"""Testes dos dados de exemplo"""
+
+import json
+from pathlib import Path
+
+MOCKS_DIR = Path(__file__).resolve().parent.parent
+
+
+def _reject_duplicates(pairs):
+    keys = [key for key, _ in pairs]
+    duplicates = sorted({key for key in keys if keys.count(key) > 1})
+    assert not duplicates, f"chaves duplicadas: {duplicates}"
+    return dict(pairs)
+
+
+class TestExampleData:
+    """JSONs de exemplo sem chaves duplicadas (o json do Python guarda só a última)"""
+
+    def test_no_duplicate_keys(self):
+        paths = sorted(MOCKS_DIR.glob('*.json'))
+        assert paths
+        for path in paths:
+            with open(path, 'r', encoding='utf-8') as f:
+                json.load(f, object_pairs_hook=_reject_duplicates)
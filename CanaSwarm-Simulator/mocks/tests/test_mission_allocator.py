@@ -0,0 +1,70 @@
+"""Testes do MissionAllocator"""
+
+import random
+
+from geodesy_mock import LocalENU
+from mission_allocator_mock import MissionAllocator, make_strips
+
+BOUNDS = {'lat_min': -22.7250, 'lat_max': -22.7150, 'lon_min': -47.6500, 'lon_max': -47.6400}
+
+
+class BruteForceCheckedAllocator(MissionAllocator):
+    """Confere cada escolha do leilão contra a avaliação de todas as faixas livres"""
+
+    checked = 0
+
+    def _best_strip(self, robot):
+        strip_id, cost = super()._best_strip(robot)
+        taken = {taken_id for other in self.robots.values() for taken_id in other['strip_energy_wh']}
+        brute = min(self._strip_cost(robot, strip)[0]
+                    for free_id, strip in self.strips.items() if free_id not in taken)
+        assert strip_id not in taken
+        assert cost[0] == brute
+        self.checked += 1
+        return strip_id, cost
+
+
+def _allocator(strip_width_m, segment_length_m, robot_count, seed):
+    frame = LocalENU.from_bounds(BOUNDS)
+    allocator = BruteForceCheckedAllocator(frame, make_strips(frame, BOUNDS, strip_width_m, segment_length_m))
+    rng = random.Random(seed)
+    for index in range(robot_count):
+        allocator.add_robot(f"BOT-{index:03d}",
+                            rng.uniform(BOUNDS['lat_min'], BOUNDS['lat_max']),
+                            rng.uniform(BOUNDS['lon_min'], BOUNDS['lon_max']),
+                            available_wh=rng.uniform(500, 2400), capacity_wh=2400)
+    return allocator
+
+
+class TestBestStrip:
+    """Faixa escolhida = menor lance entre todas as faixas livres"""
+
+    def test_allocation_matches_brute_force(self):
+        allocator = _allocator(8.0, 150.0, 40, seed=1)
+        allocator.allocate()
+        assert allocator.checked > 0
+        assert allocator.get_summary()['strips_unassigned'] == 0
+
+    def test_reallocation_matches_brute_force(self):
+        allocator = _allocator(8.0, 150.0, 40, seed=2)
+        allocator.allocate()
+        checked = allocator.checked
+        for index in range(0, 40, 7):
+            allocator.release_robot(f"BOT-{index:03d}")
+        assert allocator.checked > checked
+        assert allocator.get_summary()['strips_unassigned'] == 0
+
+    def test_picks_nearest_strip_along_track(self):
+        """Robô no meio do campo leva o segmento onde está, não o primeiro da pista"""
+        frame = LocalENU.from_bounds(BOUNDS)
+        strips = make_strips(frame, BOUNDS, 8.0, 100.0)
+        allocator = MissionAllocator(frame, strips)
+        target = strips[len(strips) // 2]
+        entry_along = target['along_m'][0] + 1.0
+        entry_across = target['across_m'] - target['width_m'] / 2
+        east, north = (entry_along, entry_across) if target['along_east'] else (entry_across, entry_along)
+        lat, lon = frame.to_geodetic(east, north)
+        allocator.add_robot('BOT-000', lat, lon, available_wh=2400)
+
+        strip_id, _ = allocator._best_strip(allocator.robots['BOT-000'])
+        assert strip_id == target['strip_id']
@@ -0,0 +1,71 @@
+"""Testes do SimProfiler com checkpoint"""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from checkpoint_mock import SimulationSnapshot
+from sim_profiler_mock import ROOT_FRAME, SimProfiler
+from swarm_simulator_mock import SwarmSimulator
+
+DATA_FILE = Path(__file__).resolve().parent.parent / "example_simulation_data.json"
+
+
+@pytest.fixture
+def simulation_data():
+    with open(DATA_FILE, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _robot_frames(profiler):
+    return sum(calls for stack, (calls, _, _) in profiler.frames.items() if stack[-1] == 'RobotSimulator.update')
+
+
+class TestProfileCheckpoint:
+    """Simulação instrumentada pode ser capturada, restaurada e ramificada"""
+
+    def test_capture_with_config_profile(self, simulation_data):
+        simulation_data['config']['profile'] = True
+        swarm = SwarmSimulator(simulation_data)
+        for _ in range(20):
+            swarm.step()
+
+        snapshot = SimulationSnapshot.capture(swarm)
+        restored = snapshot.restore()
+        ticks = restored.profiler.ticks
+        robot_updates = _robot_frames(restored.profiler)
+        for _ in range(20):
+            restored.step()
+
+        # Ramo restaurado continua medido, no próprio profiler
+        assert restored.profiler is not swarm.profiler
+        assert restored.profiler.ticks == ticks + 20
+        assert _robot_frames(restored.profiler) > robot_updates
+        assert swarm.profiler.ticks == 20
+
+    def test_restore_matches_unprofiled_run(self, simulation_data):
+        plain = SwarmSimulator(simulation_data)
+        profiled = SwarmSimulator(simulation_data)
+        profiled.attach_profiler(SimProfiler())
+        for _ in range(10):
+            plain.step()
+            profiled.step()
+
+        branch = SimulationSnapshot.capture(profiled).restore()
+        plain_branch = SimulationSnapshot.capture(plain).restore()
+        for _ in range(30):
+            branch.step()
+            plain_branch.step()
+        assert [robot.robot['state'] for robot in branch.robots] == \
+               [robot.robot['state'] for robot in plain_branch.robots]
+
+    def test_detach_after_restore(self, simulation_data):
+        swarm = SwarmSimulator(simulation_data)
+        swarm.attach_profiler(SimProfiler())
+        restored = SimulationSnapshot.capture(swarm).restore()
+        restored.profiler.detach()
+        restored.step()
+        assert restored.profiler.ticks == 0
+        assert 'step' not in vars(restored)
+        assert ROOT_FRAME not in {stack[0] for stack in restored.profiler.frames}
@@ -0,0 +1,332 @@
+#!/usr/bin/env python3
+"""
+Trajectory Recorder Mock - CanaSwarm Simulator
+
+Grava a trajetória da frota (posição, velocidade, SOC, potência, alertas)
+em buffers colunares pré-alocados e descarrega em um arquivo binário
+colunar, em chunks comprimidos, com leitor mapeado em memória.
+
+Uma hora de 500 robôs a 0.1s são ~18 milhões de amostras: inviável como
+lista de dicts/JSON, trivial como colunas de floats.
+
+Formato do arquivo:
+- `MAGIC` (8 bytes)
+- Chunks: cada coluna de cada chunk é um bloco zlib independente
+- Índice JSON (colunas, robôs, offsets e faixa de tempo de cada chunk)
+- Rodapé: tamanho do índice (uint64 LE) + `MAGIC`
+
+Author: CanaSwarm Team
+Date: 2026-02-20
+"""
+
+import json
+import mmap
+import struct
+import sys
+import zlib
+from array import array
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+MAGIC = b'CSTRAJ01'
+FOOTER = struct.Struct('<Q8s')
+
+# Colunas gravadas: (nome, typecode do array)
+COLUMNS = (
+    ('t', 'd'),
+    ('robot', 'H'),
+    ('lat', 'd'),
+    ('lon', 'd'),
+    ('altitude_m', 'f'),
+    ('heading_deg', 'f'),
+    ('speed_ms', 'f'),
+    ('soc_percent', 'f'),
+    ('power_w', 'f'),
+    ('alerts', 'B')
+)
+
+# Bit de cada tipo de alerta na coluna `alerts`
+ALERT_BITS = {
+    'battery_critical': 1,
+    'battery_low': 2,
+    'temperature_high': 4,
+    'cpu_high': 8
+}
+
+
+def _to_little_endian(column: array) -> bytes:
+    if sys.byteorder != 'little' and column.itemsize > 1:
+        column = array(column.typecode, column)
+        column.byteswap()
+    return column.tobytes()
+
+
+class TrajectoryRecorder:
+    """Buffers colunares pré-alocados com flush em chunks comprimidos"""
+
+    def __init__(self, path: str, robot_ids: Sequence[str], chunk_rows: int = 65536,
+                 compression_level: int = 6):
+        """
+        Inicializa recorder e abre o arquivo de saída
+
+        Args:
+            path: Arquivo de saída
+            robot_ids: IDs dos robôs (a coluna `robot` guarda o índice nesta lista)
+            chunk_rows: Linhas por chunk (tamanho dos buffers)
+            compression_level: Nível zlib (1 = rápido, 9 = menor)
+        """
+        self.path = path
+        self.robot_ids = list(robot_ids)
+        self.chunk_rows = chunk_rows
+        self.compression_level = compression_level
+
+        # Buffers alocados uma vez e reaproveitados a cada chunk
+        self._buffers = {name: array(typecode, bytes(array(typecode).itemsize * chunk_rows))
+                         for name, typecode in COLUMNS}
+        self._rows = 0
+        self.chunks: List[Dict[str, Any]] = []
+        self.total_rows = 0
+
+        self._file = open(path, 'wb')
+        self._file.write(MAGIC)
+
+    def record(self, t: float, robot_index: int, state: Dict[str, Any],
+               power_w: float = 0.0, alerts: Sequence[Dict] = ()):
+        """
+        Grava uma amostra
+
+        Args:
+            t: Tempo simulado (s)
+            robot_index: Índice do robô em `robot_ids`
+            state: Estado do robô (position, velocity, battery)
+            power_w: Potência líquida da bateria
+            alerts: Alertas ativos (viram bitmask)
+        """
+        row = self._rows
+        position = state['position']
+        buffers = self._buffers
+
+        buffers['t'][row] = t
+        buffers['robot'][row] = robot_index
+        buffers['lat'][row] = position['lat']
+        buffers['lon'][row] = position['lon']
+        buffers['altitude_m'][row] = position['altitude_m']
+        buffers['heading_deg'][row] = position['heading_deg']
+        buffers['speed_ms'][row] = state['velocity']['linear_ms']
+        buffers['soc_percent'][row] = state['battery']['soc_percent']
+        buffers['power_w'][row] = power_w
+
+        mask = 0
+        for alert in alerts:
+            mask |= ALERT_BITS.get(alert['type'], 0)
+        buffers['alerts'][row] = mask
+
+        self._rows = row + 1
+        if self._rows == self.chunk_rows:
+            self.flush()
+
+    def record_result(self, t: float, robot_index: int, result: Dict[str, Any]):
+        """Grava o resultado de `RobotSimulator.update()` / `fast_forward()`"""
+        self.record(t, robot_index, result['robot']['state'],
+                    result['battery']['power_net_w'], result['alerts'])
+
+    def flush(self):
+        """Comprime e escreve as linhas em buffer como um novo chunk"""
+        rows = self._rows
+        if rows == 0:
+            return
+
+        t_values = self._buffers['t'][:rows]
+        chunk = {'rows': rows, 't_min': min(t_values), 't_max': max(t_values), 'columns': {}}
+
+        for name, _ in COLUMNS:
+            column = self._buffers[name]
+            data = _to_little_endian(column if rows == self.chunk_rows else column[:rows])
+            compressed = zlib.compress(data, self.compression_level)
+            chunk['columns'][name] = [self._file.tell(), len(compressed)]
+            self._file.write(compressed)
+
+        self.chunks.append(chunk)
+        self.total_rows += rows
+        self._rows = 0
+
+    def close(self):
+        """Descarrega o último chunk e escreve índice + rodapé"""
+        if self._file.closed:
+            return
+        self.flush()
+
+        index = json.dumps({
+            'columns': [list(column) for column in COLUMNS],
+            'alert_bits': ALERT_BITS,
+            'robot_ids': self.robot_ids,
+            'total_rows': self.total_rows,
+            'chunks': self.chunks
+        }).encode('utf-8')
+        self._file.write(index)
+        self._file.write(FOOTER.pack(len(index), MAGIC))
+        self._file.close()
+
+    def __enter__(self) -> 'TrajectoryRecorder':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class TrajectoryReader:
+    """Leitor mapeado em memória (descomprime só os chunks consultados)"""
+
+    def __init__(self, path: str):
+        """
+        Abre arquivo gravado pelo TrajectoryRecorder
+
+        Args:
+            path: Arquivo de trajetória
+        """
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if self._mmap[:len(MAGIC)] != MAGIC:
+            self._mmap.close()
+            raise ValueError(f"{path}: não é um arquivo de trajetória")
+
+        index_size, magic = FOOTER.unpack_from(self._mmap, len(self._mmap) - FOOTER.size)
+        if magic != MAGIC:
+            self._mmap.close()
+            raise ValueError(f"{path}: arquivo incompleto (recorder não foi fechado)")
+
+        index_start = len(self._mmap) - FOOTER.size - index_size
+        index = json.loads(self._mmap[index_start:index_start + index_size])
+
+        self.typecodes = {name: typecode for name, typecode in index['columns']}
+        self.alert_bits = index['alert_bits']
+        self.robot_ids = index['robot_ids']
+        self.total_rows = index['total_rows']
+        self.chunks = index['chunks']
+
+    def _decode(self, chunk: Dict[str, Any], name: str) -> array:
+        offset, length = chunk['columns'][name]
+        with memoryview(self._mmap)[offset:offset + length] as block:
+            column = array(self.typecodes[name], zlib.decompress(block))
+        if sys.byteorder != 'little' and column.itemsize > 1:
+            column.byteswap()
+        return column
+
+    def iter_chunks(self, columns: Sequence[str], t_start: Optional[float] = None,
+                    t_end: Optional[float] = None) -> Iterator[Dict[str, array]]:
+        """
+        Itera chunks com as colunas pedidas (chunks fora de [t_start, t_end] são pulados)
+
+        Yields:
+            Dict coluna → array do chunk
+        """
+        for chunk in self.chunks:
+            if t_start is not None and chunk['t_max'] < t_start:
+                continue
+            if t_end is not None and chunk['t_min'] > t_end:
+                continue
+            yield {name: self._decode(chunk, name) for name in columns}
+
+    def column(self, name: str, t_start: Optional[float] = None, t_end: Optional[float] = None) -> array:
+        """Coluna inteira (ou dos chunks na faixa de tempo) concatenada"""
+        result = array(self.typecodes[name])
+        for chunk in self.iter_chunks([name], t_start, t_end):
+            result.extend(chunk[name])
+        return result
+
+    def robot_track(self, robot_id: str, columns: Sequence[str] = ('t', 'lat', 'lon', 'soc_percent'),
+                    t_start: Optional[float] = None, t_end: Optional[float] = None) -> Dict[str, array]:
+        """
+        Trajetória de um robô
+
+        Args:
+            robot_id: ID do robô
+            columns: Colunas desejadas
+            t_start, t_end: Faixa de tempo (inclusiva)
+
+        Returns:
+            Dict coluna → array apenas com as amostras do robô na faixa
+        """
+        robot_index = self.robot_ids.index(robot_id)
+        needed = list(dict.fromkeys(['robot', 't', *columns]))
+        track = {name: array(self.typecodes[name]) for name in columns}
+
+        for chunk in self.iter_chunks(needed, t_start, t_end):
+            robots = chunk['robot']
+            times = chunk['t']
+            for row in range(len(robots)):
+                if robots[row] != robot_index:
+                    continue
+                t = times[row]
+                if (t_start is not None and t < t_start) or (t_end is not None and t > t_end):
+                    continue
+                for name in columns:
+                    track[name].append(chunk[name][row])
+        return track
+
+    def close(self):
+        """Libera o arquivo mapeado"""
+        self._mmap.close()
+
+    def __enter__(self) -> 'TrajectoryReader':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def main():
+    """Grava a frota do exemplo e lê de volta"""
+    import os
+    import tempfile
+    import time
+
+    from swarm_simulator_mock import SwarmSimulator
+
+    print("🎞️  Simulator - Trajectory Recorder Mock")
+    print("=" * 70)
+
+    with open('example_simulation_data.json', 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    swarm = SwarmSimulator(data)
+    robot_ids = [robot.robot['robot_id'] for robot in swarm.robots]
+    duration = 300
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'trajectory.cstraj')
+
+        start = time.perf_counter()
+        with TrajectoryRecorder(path, robot_ids, chunk_rows=4096) as recorder:
+            swarm.attach_recorder(recorder)
+            swarm.run(duration)
+        wall_s = time.perf_counter() - start
+
+        file_size = os.path.getsize(path)
+        raw_size = recorder.total_rows * sum(array(typecode).itemsize for _, typecode in COLUMNS)
+        print(f"\n💾 GRAVAÇÃO ({duration}s, {len(robot_ids)} robôs, {wall_s:.2f}s reais):")
+        print(f"   Amostras: {recorder.total_rows} em {len(recorder.chunks)} chunks")
+        print(f"   Arquivo: {file_size / 1024:.1f} KB (colunas brutas: {raw_size / 1024:.1f} KB, "
+              f"{file_size / recorder.total_rows:.1f} bytes/amostra)")
+
+        with TrajectoryReader(path) as reader:
+            print(f"\n📖 LEITURA (mmap):")
+            for robot_id in reader.robot_ids:
+                track = reader.robot_track(robot_id, ('t', 'lat', 'lon', 'soc_percent'))
+                print(f"   {robot_id}: {len(track['t'])} amostras | "
+                      f"({track['lat'][0]:.6f}, {track['lon'][0]:.6f}) → ({track['lat'][-1]:.6f}, {track['lon'][-1]:.6f}) | "
+                      f"SOC {track['soc_percent'][0]:.1f}% → {track['soc_percent'][-1]:.1f}%")
+
+            window = reader.robot_track(robot_ids[1], ('t', 'speed_ms'), t_start=100, t_end=110)
+            print(f"   {robot_ids[1]} em [100s, 110s]: {len(window['t'])} amostras, "
+                  f"velocidade média {sum(window['speed_ms']) / len(window['speed_ms']):.2f} m/s")
+
+            alerts = reader.column('alerts')
+            flagged = sum(1 for mask in alerts if mask & reader.alert_bits['battery_low'])
+            print(f"   Amostras com battery_low: {flagged}")
+
+    print(f"\n✅ Trajectory recorder funcionando!")
+
+
+if __name__ == '__main__':
+    main()
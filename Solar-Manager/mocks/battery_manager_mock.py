@@ -6,19 +6,34 @@ Gerencia banco de baterias (SOC, SOH, ciclos, saúde)
 """
 
 import json
+import sys
 import random
 from pathlib import Path
 from typing import Dict
 from datetime import datetime
 
+# Histórico limitado compartilhado com Telemetry
+TELEMETRY_MOCKS_DIR = Path(__file__).resolve().parent.parent.parent / 'Telemetry' / 'mocks'
+if str(TELEMETRY_MOCKS_DIR) not in sys.path:
+    sys.path.insert(0, str(TELEMETRY_MOCKS_DIR))
+
+from history_store_mock import BoundedHistory  # noqa: E402
+
+HISTORY_ROLLUP_FIELDS = [
+    'health_metrics.state_of_health_percent',
+    'health_metrics.overall_health_score',
+    'capacity_analysis.available_energy_kwh',
+    'capacity_analysis.usable_energy_kwh'
+]
+
 
 class BatteryManager:
     """Gerenciador de banco de baterias LiFePO4"""
     
-    def __init__(self, battery_id: str):
+    def __init__(self, battery_id: str, history_size: int = 1000):
         self.battery_id = battery_id
         self.management_count = 0
-        self.history = []
+        self.history = BoundedHistory(max_items=history_size, rollup_fields=HISTORY_ROLLUP_FIELDS)
     
     def manage_battery_bank(self, solar_data: Dict) -> Dict:
         """
@@ -6,18 +6,35 @@ Otimiza uso de energia solar e coordena recarga de robôs
 """
 
 import json
+import sys
 from pathlib import Path
 from typing import Dict, List
 from datetime import datetime, timedelta
 
+# Histórico limitado compartilhado com Telemetry
+TELEMETRY_MOCKS_DIR = Path(__file__).resolve().parent.parent.parent / 'Telemetry' / 'mocks'
+if str(TELEMETRY_MOCKS_DIR) not in sys.path:
+    sys.path.insert(0, str(TELEMETRY_MOCKS_DIR))
+
+from history_store_mock import BoundedHistory  # noqa: E402
+
+HISTORY_ROLLUP_FIELDS = [
+    'energy_analysis.solar_power_kw',
+    'energy_analysis.battery_soc_percent',
+    'energy_analysis.total_available_power_kw',
+    'load_analysis.current_total_load_kw',
+    'load_analysis.robot_charging_load_kw',
+    'battery_strategy.solar_surplus_deficit_kw'
+]
+
 
 class EnergyOptimizer:
     """Otimizador de energia solar e gestão de carga"""
     
-    def __init__(self, station_id: str):
+    def __init__(self, station_id: str, history_size: int = 1000):
         self.station_id = station_id
         self.optimization_count = 0
-        self.decisions_history = []
+        self.decisions_history = BoundedHistory(max_items=history_size, rollup_fields=HISTORY_ROLLUP_FIELDS)
     
     def optimize_energy_usage(self, solar_data: Dict) -> Dict:
         """
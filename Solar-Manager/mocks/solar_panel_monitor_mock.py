@@ -6,19 +6,34 @@ Monitora painéis solares (geração, eficiência, condições ambientais)
 """
 
 import json
+import sys
 import random
 from pathlib import Path
 from typing import Dict
 from datetime import datetime, timedelta
 
+# Histórico limitado compartilhado com Telemetry
+TELEMETRY_MOCKS_DIR = Path(__file__).resolve().parent.parent.parent / 'Telemetry' / 'mocks'
+if str(TELEMETRY_MOCKS_DIR) not in sys.path:
+    sys.path.insert(0, str(TELEMETRY_MOCKS_DIR))
+
+from history_store_mock import BoundedHistory  # noqa: E402
+
+HISTORY_ROLLUP_FIELDS = [
+    'current_generation.power_kw',
+    'current_generation.efficiency_percent',
+    'performance_metrics.performance_ratio',
+    'performance_metrics.temperature_loss_percent'
+]
+
 
 class SolarPanelMonitor:
     """Monitor de painéis solares fotovoltaicos"""
     
-    def __init__(self, station_id: str):
+    def __init__(self, station_id: str, history_size: int = 1000):
         self.station_id = station_id
         self.monitoring_count = 0
-        self.history = []
+        self.history = BoundedHistory(max_items=history_size, rollup_fields=HISTORY_ROLLUP_FIELDS)
     
     def monitor_solar_array(self, solar_data: Dict) -> Dict:
         """
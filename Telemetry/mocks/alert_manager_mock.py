@@ -7,16 +7,53 @@ Gerenciador de alertas e notificações
 
 import json
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Optional
+
+from alert_priority_mock import AlertPriorityQueue
+from alert_store_mock import OPENED, REOPENED, SEVERITY_CHANGED, AlertStore
+from history_store_mock import BoundedHistory
+from notification_dispatcher_mock import NotificationDispatcher
+from rule_engine_mock import DEFAULT_RULES_PATH, RuleEngine
+
+HISTORY_ROLLUP_FIELDS = [
+    'total_alerts',
+    'existing_alerts',
+    'generated_alerts',
+    'active_alerts'
+]
+
+# Transições que geram ações e notificações
+NOTIFY_TRANSITIONS = (OPENED, REOPENED, SEVERITY_CHANGED)
+
+# Alertas ranqueados por coleta (dashboard e notificações)
+PRIORITIZED_TOP_K = 100
 
 
 class AlertManager:
     """Gerenciador de alertas"""
     
-    def __init__(self, session_id: str):
+    def __init__(self, session_id: str, history_size: int = 1000, rules_path: Optional[Path] = None,
+                 top_k: int = PRIORITIZED_TOP_K, dispatcher: Optional[NotificationDispatcher] = None):
+        """
+        Args:
+            session_id: ID da sessão de telemetria
+            history_size: Resultados inteiros mantidos no histórico
+            rules_path: Arquivo de regras (default: alert_rules.json)
+            top_k: Alertas ranqueados em `prioritized_alerts`
+            dispatcher: Entrega assíncrona das notificações (None = só gera os dicts)
+        """
         self.session_id = session_id
         self.alert_count = 0
-        self.history = []
+        self.history = BoundedHistory(max_items=history_size, rollup_fields=HISTORY_ROLLUP_FIELDS)
+        self.rule_engine = RuleEngine.from_file(rules_path or DEFAULT_RULES_PATH)
+        self.store = AlertStore()
+        # Fila de prioridade atualizada pelas transições do store
+        self.priority = AlertPriorityQueue()
+        self.store.listeners.append(self.priority.on_transition)
+        self.top_k = top_k
+        self.dispatcher = dispatcher
+        self.notification_count = 0
+        self.last_summary_day: Optional[str] = None
     
     def manage_alerts(self, telemetry_data: Dict) -> Dict:
         """
@@ -48,14 +85,21 @@ class AlertManager:
         # Combina e remove duplicatas
         all_alerts = self._merge_alerts(existing_alerts, generated_alerts)
         
-        # Prioriza alertas
-        prioritized = self._prioritize_alerts(all_alerts)
+        # Ciclo de vida: IDs estáveis, só transições
+        transitions = self.store.observe(all_alerts, telemetry_data['timestamp'])
+        new_alerts = [t['alert'] for t in transitions if t['transition'] in NOTIFY_TRANSITIONS]
+        
+        # Top-K dos alertas ativos (abertos e reconhecidos)
+        prioritized = self._prioritize_alerts()
         
-        # Determina ações
-        actions = self._determine_actions(prioritized)
+        # Determina ações (só para incidentes novos ou reabertos)
+        actions = self._determine_actions(new_alerts)
         
         # Gera notificações
-        notifications = self._generate_notifications(prioritized, actions)
+        notifications = self._generate_notifications(new_alerts, actions, telemetry_data['timestamp'])
+        if self.dispatcher is not None:
+            for notification in notifications:
+                self.dispatcher.submit(notification)
         
         result = {
             'session_id': self.session_id,
@@ -64,7 +108,10 @@ class AlertManager:
             'total_alerts': len(all_alerts),
             'existing_alerts': len(existing_alerts),
             'generated_alerts': len(generated_alerts),
+            'active_alerts': len(self.priority),
+            'alerts_by_severity': dict(self.priority.by_severity),
             'prioritized_alerts': prioritized,
+            'transitions': [{key: value for key, value in t.items() if key != 'alert'} for t in transitions],
             'actions': actions,
             'notifications': notifications
         }
@@ -95,118 +142,14 @@ class AlertManager:
         return alerts
     
     def _generate_alerts_from_rules(self, robots: List[Dict]) -> List[Dict]:
-        """Gera alertas baseado em regras"""
-        alerts = []
-        alert_id_counter = 1000
-        
-        for robot in robots:
-            robot_id = robot['robot_id']
-            
-            # Regra 1: Bateria crítica (<20%)
-            battery = robot.get('battery', {})
-            soc = battery.get('soc_percent', 100)
-            if soc < 20:
-                alerts.append({
-                    'robot_id': robot_id,
-                    'alert_id': f'ALERT-GEN-{alert_id_counter}',
-                    'severity': 'critical',
-                    'type': 'battery_critical',
-                    'message': f'Bateria crítica em {soc}%',
-                    'threshold': 20,
-                    'current_value': soc,
-                    'source': 'rule_engine'
-                })
-                alert_id_counter += 1
-            
-            # Regra 2: Bateria baixa (<50% e não carregando)
-            elif soc < 50 and not battery.get('charging', False):
-                # Verifica se já existe alerta
-                existing = any(a.get('robot_id') == robot_id and 
-                             a.get('type') == 'battery_low' 
-                             for a in alerts)
-                if not existing:
-                    alerts.append({
-                        'robot_id': robot_id,
-                        'alert_id': f'ALERT-GEN-{alert_id_counter}',
-                        'severity': 'warning',
-                        'type': 'battery_low',
-                        'message': f'Bateria baixa em {soc}%',
-                        'threshold': 50,
-                        'current_value': soc,
-                        'source': 'rule_engine'
-                    })
-                    alert_id_counter += 1
-            
-            # Regra 3: Temperatura excessiva (>50°C)
-            temp = battery.get('temperature_c', 25)
-            if temp > 50:
-                alerts.append({
-                    'robot_id': robot_id,
-                    'alert_id': f'ALERT-GEN-{alert_id_counter}',
-                    'severity': 'warning',
-                    'type': 'temperature_high',
-                    'message': f'Temperatura bateria elevada: {temp}°C',
-                    'threshold': 50,
-                    'current_value': temp,
-                    'source': 'rule_engine'
-                })
-                alert_id_counter += 1
-            
-            # Regra 4: CPU alto (>90%)
-            health = robot.get('health', {})
-            cpu = health.get('cpu_usage_percent', 0)
-            if cpu > 90:
-                alerts.append({
-                    'robot_id': robot_id,
-                    'alert_id': f'ALERT-GEN-{alert_id_counter}',
-                    'severity': 'warning',
-                    'type': 'cpu_high',
-                    'message': f'CPU elevada: {cpu}%',
-                    'threshold': 90,
-                    'current_value': cpu,
-                    'source': 'rule_engine'
-                })
-                alert_id_counter += 1
-            
-            # Regra 5: Memória alta (>85%)
-            mem = health.get('memory_usage_percent', 0)
-            if mem > 85:
-                alerts.append({
-                    'robot_id': robot_id,
-                    'alert_id': f'ALERT-GEN-{alert_id_counter}',
-                    'severity': 'info',
-                    'type': 'memory_high',
-                    'message': f'Memória elevada: {mem}%',
-                    'threshold': 85,
-                    'current_value': mem,
-                    'source': 'rule_engine'
-                })
-                alert_id_counter += 1
-            
-            # Regra 6: Status não saudável
-            overall_status = health.get('overall_status', 'unknown')
-            if overall_status == 'warning':
-                alerts.append({
-                    'robot_id': robot_id,
-                    'alert_id': f'ALERT-GEN-{alert_id_counter}',
-                    'severity': 'warning',
-                    'type': 'robot_degraded',
-                    'message': f'Robô em estado degradado',
-                    'source': 'rule_engine'
-                })
-                alert_id_counter += 1
-            elif overall_status == 'critical':
-                alerts.append({
-                    'robot_id': robot_id,
-                    'alert_id': f'ALERT-GEN-{alert_id_counter}',
-                    'severity': 'critical',
-                    'type': 'robot_critical',
-                    'message': f'Robô em estado crítico',
-                    'source': 'rule_engine'
-                })
-                alert_id_counter += 1
+        """
+        Gera alertas baseado em regras
         
-        return alerts
+        Regras declarativas (`alert_rules.json`) avaliadas pelo RuleEngine:
+        só regras com métricas alteradas são reavaliadas, dedup por
+        (robot_id, type). O ID vem do AlertStore (estável por incidente).
+        """
+        return [dict(alert) for alert in self.rule_engine.evaluate_fleet(robots)]
     
     def _merge_alerts(self, existing: List[Dict], generated: List[Dict]) -> List[Dict]:
         """Combina alertas e remove duplicatas"""
@@ -230,43 +173,15 @@ class AlertManager:
         
         return merged
     
-    def _prioritize_alerts(self, alerts: List[Dict]) -> List[Dict]:
-        """Prioriza alertas por severidade e tipo"""
-        # Define peso de prioridade
-        severity_weight = {
-            'critical': 100,
-            'warning': 50,
-            'info': 10
-        }
-        
-        # Define peso por tipo
-        type_weight = {
-            'battery_critical': 20,
-            'robot_critical': 18,
-            'safety_violation': 15,
-            'temperature_high': 12,
-            'battery_low': 10,
-            'robot_degraded': 8,
-            'cpu_high': 5,
-            'memory_high': 3
-        }
-        
-        # Calcula score de prioridade
-        for alert in alerts:
-            severity_score = severity_weight.get(alert['severity'], 0)
-            type_score = type_weight.get(alert['type'], 0)
-            ack_penalty = -50 if alert.get('acknowledged', False) else 0
-            
-            alert['priority_score'] = severity_score + type_score + ack_penalty
-        
-        # Ordena por priority_score (descending)
-        alerts.sort(key=lambda a: a['priority_score'], reverse=True)
-        
-        # Adiciona rank
-        for i, alert in enumerate(alerts, 1):
-            alert['priority_rank'] = i
-        
-        return alerts
+    def _prioritize_alerts(self) -> List[Dict]:
+        """
+        Top-K alertas ativos por severidade e tipo
+
+        Scores mantidos pela fila de prioridade a cada transição do store
+        (abrir, reconhecer, mudar severidade, resolver); aqui só os K
+        primeiros são lidos, com os valores da coleta atual.
+        """
+        return self.priority.top_k(self.top_k, lookup=self.store.current_alert)
     
     def _determine_actions(self, alerts: List[Dict]) -> List[Dict]:
         """Determina ações baseado em alertas"""
@@ -334,15 +249,21 @@ class AlertManager:
         
         return actions
     
-    def _generate_notifications(self, alerts: List[Dict], actions: List[Dict]) -> List[Dict]:
-        """Gera notificações"""
+    def _generate_notifications(self, new_alerts: List[Dict], actions: List[Dict],
+                                timestamp: str) -> List[Dict]:
+        """
+        Gera notificações
+        
+        Alertas críticos e ações só de incidentes novos/reabertos; resumo
+        uma vez por dia. IDs sequenciais na sessão.
+        """
         notifications = []
         
         # Notificações de alertas críticos
-        critical_alerts = [a for a in alerts if a['severity'] == 'critical' and not a.get('acknowledged', False)]
+        critical_alerts = [a for a in new_alerts if a['severity'] == 'critical' and not a.get('acknowledged', False)]
         if critical_alerts:
             notifications.append({
-                'notification_id': 'NOTIF-001',
+                'notification_id': self._next_notification_id(),
                 'type': 'critical_alert',
                 'channel': ['sms', 'email', 'push'],
                 'recipients': ['operator', 'supervisor', 'maintenance_team'],
@@ -354,7 +275,7 @@ class AlertManager:
         high_priority_actions = [a for a in actions if a['priority'] in ['critical', 'high']]
         if high_priority_actions:
             notifications.append({
-                'notification_id': 'NOTIF-002',
+                'notification_id': self._next_notification_id(),
                 'type': 'action_required',
                 'channel': ['push', 'email'],
                 'recipients': ['operator', 'supervisor'],
@@ -362,22 +283,29 @@ class AlertManager:
                 'details': [a['description'] for a in high_priority_actions[:3]]
             })
         
-        # Resumo diário
-        notifications.append({
-            'notification_id': 'NOTIF-003',
-            'type': 'daily_summary',
-            'channel': ['email'],
-            'recipients': ['manager', 'supervisor'],
-            'message': f'Resumo de telemetria: {len(alerts)} alertas ativos',
-            'details': {
-                'critical': len([a for a in alerts if a['severity'] == 'critical']),
-                'warning': len([a for a in alerts if a['severity'] == 'warning']),
-                'info': len([a for a in alerts if a['severity'] == 'info'])
-            }
-        })
+        # Resumo diário (primeira coleta de cada dia)
+        day = timestamp[:10]
+        if day != self.last_summary_day:
+            self.last_summary_day = day
+            notifications.append({
+                'notification_id': self._next_notification_id(),
+                'type': 'daily_summary',
+                'channel': ['email'],
+                'recipients': ['manager', 'supervisor'],
+                'message': f'Resumo de telemetria: {len(self.priority)} alertas ativos',
+                'details': {
+                    'critical': self.priority.by_severity.get('critical', 0),
+                    'warning': self.priority.by_severity.get('warning', 0),
+                    'info': self.priority.by_severity.get('info', 0)
+                }
+            })
         
         return notifications
     
+    def _next_notification_id(self) -> str:
+        self.notification_count += 1
+        return f'NOTIF-{self.notification_count:03d}'
+    
     def display_alert_report(self, result: Dict):
         """Exibe relatório de alertas"""
         print("\n" + "="*70)
@@ -393,10 +321,13 @@ class AlertManager:
         print(f"   Existentes: {result['existing_alerts']}")
         print(f"   Gerados: {result['generated_alerts']}")
         
-        # Por severidade
-        by_severity = {'critical': 0, 'warning': 0, 'info': 0}
-        for alert in alerts:
-            by_severity[alert['severity']] += 1
+        transitions = {}
+        for transition in result['transitions']:
+            transitions[transition['transition']] = transitions.get(transition['transition'], 0) + 1
+        print(f"   Incidentes ativos: {result['active_alerts']} | transições: {len(result['transitions'])} {transitions}")
+        
+        # Por severidade (todos os ativos, não só o top-K)
+        by_severity = result['alerts_by_severity']
         
         print(f"\n📈 POR SEVERIDADE:")
         print(f"   🔴 Critical: {by_severity['critical']}")
@@ -450,6 +381,13 @@ if __name__ == "__main__":
     # Exibe relatório
     manager.display_alert_report(result)
     
+    # Coletas seguintes: mesmo estado não gera alertas "novos" nem notificações
+    for second in (5, 10):
+        telemetry_data['timestamp'] = f"2026-02-20T15:45:{second:02d}.000Z"
+        again = manager.manage_alerts(telemetry_data)
+        print(f"\n🔁 Coleta +{second}s: {again['active_alerts']} ativos | {len(again['transitions'])} transições | "
+              f"{len(again['notifications'])} notificações | IDs {[a['alert_id'] for a in again['prioritized_alerts']]}")
+    
     print("\n" + "="*70)
     print("✅ GERENCIAMENTO COMPLETO")
     print("="*70)
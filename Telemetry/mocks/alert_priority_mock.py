@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""
+Telemetry - Alert Priority Mock
+
+Fila de prioridade indexada dos alertas ativos (AlertManager).
+
+Heap binário com mapa chave → posição: inserir, atualizar (ex.: reconhecer,
+mudar severidade) e remover custam O(log n), e `top_k(k)` percorre só os
+k primeiros em O(k log k). O score só muda nas transições do AlertStore,
+então durante um incidente com milhares de alertas nada é reordenado a
+cada coleta.
+"""
+
+import heapq
+from typing import Callable, Dict, Hashable, List, Optional, Tuple
+
+# Peso por severidade e por tipo (score = severidade + tipo + penalidade de reconhecimento)
+SEVERITY_WEIGHT = {
+    'critical': 100,
+    'warning': 50,
+    'info': 10
+}
+
+TYPE_WEIGHT = {
+    'battery_critical': 20,
+    'robot_critical': 18,
+    'safety_violation': 15,
+    'temperature_high': 12,
+    'battery_low': 10,
+    'robot_degraded': 8,
+    'cpu_high': 5,
+    'memory_high': 3
+}
+
+ACK_PENALTY = -50
+
+
+def priority_score(alert: Dict) -> int:
+    """Score de prioridade de um alerta"""
+    severity_score = SEVERITY_WEIGHT.get(alert['severity'], 0)
+    type_score = TYPE_WEIGHT.get(alert['type'], 0)
+    ack_penalty = ACK_PENALTY if alert.get('acknowledged', False) else 0
+    return severity_score + type_score + ack_penalty
+
+
+class IndexedPriorityQueue:
+    """
+    Max-heap indexado por chave
+
+    Empates saem na ordem da primeira inserção (mesma ordem de um sort
+    estável); atualizar uma chave mantém a ordem original dela.
+    """
+
+    def __init__(self):
+        self._heap: List[Hashable] = []
+        self._position: Dict[Hashable, int] = {}
+        # chave → (-score, sequência): menor = mais prioritário
+        self._rank_key: Dict[Hashable, Tuple[float, int]] = {}
+        self._sequence = 0
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._position
+
+    def score(self, key: Hashable) -> Optional[float]:
+        rank_key = self._rank_key.get(key)
+        return None if rank_key is None else -rank_key[0]
+
+    def push(self, key: Hashable, score: float):
+        """Insere ou atualiza a chave (O(log n))"""
+        if key in self._position:
+            old = self._rank_key[key]
+            new = (-score, old[1])
+            self._rank_key[key] = new
+            index = self._position[key]
+            if new < old:
+                self._sift_up(index)
+            elif new > old:
+                self._sift_down(index)
+            return
+        self._sequence += 1
+        self._rank_key[key] = (-score, self._sequence)
+        self._heap.append(key)
+        self._position[key] = len(self._heap) - 1
+        self._sift_up(len(self._heap) - 1)
+
+    def remove(self, key: Hashable) -> bool:
+        """Remove a chave (O(log n)); False se ausente"""
+        index = self._position.pop(key, None)
+        if index is None:
+            return False
+        del self._rank_key[key]
+        last = self._heap.pop()
+        if index < len(self._heap):
+            self._heap[index] = last
+            self._position[last] = index
+            self._sift_down(index)
+            self._sift_up(self._position[last])
+        return True
+
+    def peek(self) -> Optional[Tuple[Hashable, float]]:
+        """(chave, score) de maior prioridade"""
+        if not self._heap:
+            return None
+        key = self._heap[0]
+        return key, -self._rank_key[key][0]
+
+    def top_k(self, k: int) -> List[Tuple[Hashable, float]]:
+        """
+        k chaves de maior prioridade, em ordem (O(k log k))
+
+        Percorre o heap a partir da raiz com um heap auxiliar de fronteira.
+        """
+        heap, rank_key = self._heap, self._rank_key
+        result = []
+        if not heap or k <= 0:
+            return result
+        frontier = [(rank_key[heap[0]], 0)]
+        while frontier and len(result) < k:
+            key_rank, index = heapq.heappop(frontier)
+            result.append((heap[index], -key_rank[0]))
+            for child in (2 * index + 1, 2 * index + 2):
+                if child < len(heap):
+                    heapq.heappush(frontier, (rank_key[heap[child]], child))
+        return result
+
+    def _sift_up(self, index: int):
+        heap, position, rank_key = self._heap, self._position, self._rank_key
+        key = heap[index]
+        rank = rank_key[key]
+        while index > 0:
+            parent = (index - 1) // 2
+            parent_key = heap[parent]
+            if rank_key[parent_key] <= rank:
+                break
+            heap[index] = parent_key
+            position[parent_key] = index
+            index = parent
+        heap[index] = key
+        position[key] = index
+
+    def _sift_down(self, index: int):
+        heap, position, rank_key = self._heap, self._position, self._rank_key
+        size = len(heap)
+        key = heap[index]
+        rank = rank_key[key]
+        while True:
+            child = 2 * index + 1
+            if child >= size:
+                break
+            right = child + 1
+            if right < size and rank_key[heap[right]] < rank_key[heap[child]]:
+                child = right
+            if rank_key[heap[child]] >= rank:
+                break
+            heap[index] = heap[child]
+            position[heap[index]] = index
+            index = child
+        heap[index] = key
+        position[key] = index
+
+
+class AlertPriorityQueue:
+    """Alertas ativos por alert_id, com score e contagem por severidade"""
+
+    def __init__(self):
+        self.queue = IndexedPriorityQueue()
+        self.alerts: Dict[str, Dict] = {}
+        self.severity: Dict[str, str] = {}
+        self.by_severity: Dict[str, int] = {severity: 0 for severity in SEVERITY_WEIGHT}
+        self.updates = 0
+
+    def __len__(self) -> int:
+        return len(self.queue)
+
+    def upsert(self, alert: Dict, alert_id: Optional[str] = None):
+        """Insere ou rescora um alerta (O(log n)); ID default: alert['alert_id']"""
+        alert_id = alert_id or alert['alert_id']
+        previous = self.severity.get(alert_id)
+        if previous is not None:
+            self.by_severity[previous] -= 1
+        severity = alert['severity']
+        self.severity[alert_id] = severity
+        self.by_severity[severity] = self.by_severity.get(severity, 0) + 1
+        self.alerts[alert_id] = alert
+        score = priority_score(alert)
+        alert['priority_score'] = score
+        self.queue.push(alert_id, score)
+        self.updates += 1
+
+    def remove(self, alert_id: str):
+        """Retira um alerta resolvido (O(log n))"""
+        severity = self.severity.pop(alert_id, None)
+        if severity is None:
+            return
+        self.by_severity[severity] -= 1
+        del self.alerts[alert_id]
+        self.queue.remove(alert_id)
+        self.updates += 1
+
+    def on_transition(self, transition: str, alert_id: str, alert: Dict):
+        """Listener do AlertStore: resolvido sai da fila, demais transições rescoram"""
+        if transition == 'resolved':
+            self.remove(alert_id)
+        else:
+            self.upsert(alert, alert_id)
+
+    def top_k(self, k: int, lookup: Optional[Callable[[str], Dict]] = None) -> List[Dict]:
+        """
+        k alertas de maior prioridade com `priority_rank` 1..k
+
+        Args:
+            k: Quantidade de alertas
+            lookup: alert_id → dict atual do alerta (default: o dict da última atualização)
+        """
+        ranked = []
+        for rank, (alert_id, score) in enumerate(self.queue.top_k(k), 1):
+            alert = lookup(alert_id) if lookup is not None else self.alerts[alert_id]
+            alert['priority_score'] = score
+            alert['priority_rank'] = rank
+            ranked.append(alert)
+        return ranked
+
+
+if __name__ == "__main__":
+    import random
+    import time
+
+    print("🏆 Telemetry - Alert Priority Mock\n")
+    print("="*70)
+
+    # Incidente na frota inteira: 5000 alertas ativos
+    rng = random.Random(11)
+    types = list(TYPE_WEIGHT)
+    alerts = [{
+        'alert_id': f'ALERT-GEN-{1000 + index}',
+        'robot_id': f'MICROBOT-{index:04d}',
+        'type': rng.choice(types),
+        'severity': rng.choice(list(SEVERITY_WEIGHT)),
+        'acknowledged': False
+    } for index in range(5000)]
+
+    priority = AlertPriorityQueue()
+    start = time.perf_counter()
+    for alert in alerts:
+        priority.upsert(alert)
+    insert_us = (time.perf_counter() - start) / len(alerts) * 1e6
+
+    # Cada segundo: 50 reconhecimentos/atualizações + top 10 para o dashboard
+    seconds = 100
+    start = time.perf_counter()
+    for _ in range(seconds):
+        for alert in rng.sample(alerts, 50):
+            if alert['alert_id'] in priority.alerts:
+                alert['acknowledged'] = not alert['acknowledged']
+                priority.upsert(alert)
+        top = priority.top_k(10)
+    incremental_us = (time.perf_counter() - start) / seconds * 1e6
+
+    # Referência: rescore + sort completo a cada segundo
+    start = time.perf_counter()
+    for _ in range(seconds):
+        for alert in alerts:
+            alert['priority_score'] = priority_score(alert)
+        ordered = sorted(alerts, key=lambda a: a['priority_score'], reverse=True)
+        for rank, alert in enumerate(ordered, 1):
+            alert['priority_rank'] = rank
+    full_us = (time.perf_counter() - start) / seconds * 1e6
+
+    # Mesma ordem do sort estável
+    expected = [a['alert_id'] for a in sorted(alerts, key=lambda a: priority_score(a), reverse=True)[:10]]
+    same = [a['alert_id'] for a in priority.top_k(10)] == expected
+
+    print(f"\n🚨 {len(priority):,} ALERTAS ATIVOS | por severidade {priority.by_severity}")
+    print(f"   Inserção: {insert_us:.1f} µs/alerta")
+    print(f"   Por segundo (50 atualizações + top 10): {incremental_us:.0f} µs")
+    print(f"   Rescore + sort completo por segundo: {full_us:.0f} µs ({full_us / incremental_us:.0f}× mais lento)")
+    print(f"   Top 10 igual ao sort estável: {same}")
+
+    # Resolução: remove em O(log n)
+    for alert in alerts[:1000]:
+        priority.remove(alert['alert_id'])
+    top = priority.top_k(3)
+    print(f"\n✅ 1000 resolvidos: {len(priority):,} ativos | top 3: "
+          f"{[(a['robot_id'], a['type'], a['priority_score']) for a in top]}")
+
+    print("\n" + "="*70)
+    print("✅ FILA DE PRIORIDADE FUNCIONANDO")
+    print("="*70)
@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+"""
+Telemetry - Alert Store Mock
+
+Estado dos alertas entre coletas: cada incidente (robot_id, type) tem ID
+estável e ciclo de vida open → acknowledged → resolved.
+
+A cada coleta o store recebe os alertas ativos e devolve só as transições
+(aberto, reconhecido, severidade alterada, resolvido, reaberto), então
+notificações e ações escalam com incidentes, não com a frequência de
+coleta. Um alerta só é resolvido depois de ficar ausente por
+`clear_seconds`; reaberturas logo após a resolução reutilizam o mesmo
+incidente e, acima de `flap_threshold` reaberturas em `flap_window_seconds`,
+o incidente é marcado como flapping e suas transições são suprimidas.
+"""
+
+from collections import deque
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from history_store_mock import Timestamp, to_epoch
+
+OPEN = 'open'
+ACKNOWLEDGED = 'acknowledged'
+RESOLVED = 'resolved'
+
+# Transições emitidas
+OPENED = 'opened'
+REOPENED = 'reopened'
+ACKNOWLEDGE = 'acknowledged'
+SEVERITY_CHANGED = 'severity_changed'
+RESOLVE = 'resolved'
+
+
+class AlertRecord:
+    """Um incidente (robot_id, type)"""
+
+    __slots__ = ('alert_id', 'key', 'state', 'alert', 'opened_at', 'last_seen', 'cleared_since',
+                 'resolved_at', 'acknowledged_at', 'flap_times', 'flapping')
+
+    def __init__(self, alert_id: str, key: Tuple[str, str], alert: Dict, t: float):
+        self.alert_id = alert_id
+        self.key = key
+        self.state = OPEN
+        self.alert = alert
+        self.opened_at = t
+        self.last_seen = t
+        self.cleared_since: Optional[float] = None
+        self.resolved_at: Optional[float] = None
+        self.acknowledged_at: Optional[float] = None
+        self.flap_times: deque = deque()
+        self.flapping = False
+
+    def to_dict(self) -> Dict:
+        return {
+            'alert_id': self.alert_id,
+            'robot_id': self.key[0],
+            'type': self.key[1],
+            'state': self.state,
+            'severity': self.alert.get('severity'),
+            'opened_at': self.opened_at,
+            'last_seen': self.last_seen,
+            'acknowledged_at': self.acknowledged_at,
+            'resolved_at': self.resolved_at,
+            'flaps': len(self.flap_times),
+            'flapping': self.flapping
+        }
+
+
+class AlertStore:
+    """Ciclo de vida dos alertas com IDs estáveis e supressão de flapping"""
+
+    def __init__(self, clear_seconds: float = 60.0, reopen_window_seconds: float = 600.0,
+                 flap_threshold: int = 3, flap_window_seconds: float = 3600.0,
+                 id_prefix: str = 'ALERT-GEN-', first_id: int = 1000):
+        """
+        Args:
+            clear_seconds: Ausência contínua antes de resolver
+            reopen_window_seconds: Após resolvido, o mesmo incidente reabre nesse intervalo
+            flap_threshold: Reaberturas na janela que marcam o incidente como flapping
+            flap_window_seconds: Janela da contagem de reaberturas
+            id_prefix, first_id: Formato dos IDs gerados (alertas sem ID próprio)
+        """
+        self.clear_seconds = clear_seconds
+        self.reopen_window_seconds = reopen_window_seconds
+        self.flap_threshold = flap_threshold
+        self.flap_window_seconds = flap_window_seconds
+        self.id_prefix = id_prefix
+        self._next_id = first_id
+
+        # (robot_id, type) → incidente (abertos, reconhecidos e resolvidos recentes)
+        self.records: Dict[Tuple[str, str], AlertRecord] = {}
+        self.by_id: Dict[str, AlertRecord] = {}
+
+        # Recebem toda mudança de estado (inclusive suprimidas): (transição, alert_id, alerta)
+        self.listeners: List[Callable[[str, str, Dict], None]] = []
+
+        self.transition_count = 0
+        self.suppressed_count = 0
+        self.incident_count = 0
+
+    def _new_id(self) -> str:
+        alert_id = f'{self.id_prefix}{self._next_id}'
+        self._next_id += 1
+        return alert_id
+
+    def observe(self, alerts: Iterable[Dict], timestamp: Timestamp) -> List[Dict]:
+        """
+        Aplica os alertas ativos de uma coleta
+
+        Cada alerta recebe `alert_id` (estável por incidente) e `state`.
+
+        Args:
+            alerts: Alertas ativos (um por (robot_id, type))
+            timestamp: Momento da coleta
+
+        Returns:
+            Transições desta coleta
+        """
+        t = to_epoch(timestamp)
+        transitions: List[Dict] = []
+        seen = set()
+
+        for alert in alerts:
+            key = (alert['robot_id'], alert['type'])
+            seen.add(key)
+            record = self.records.get(key)
+
+            if record is None or (record.state == RESOLVED and t - record.resolved_at > self.reopen_window_seconds):
+                # Incidente novo
+                if record is not None:
+                    del self.by_id[record.alert_id]
+                alert_id = alert.get('alert_id') or self._new_id()
+                if alert_id in self.by_id:
+                    alert_id = self._new_id()
+                record = AlertRecord(alert_id, key, alert, t)
+                self.records[key] = record
+                self.by_id[alert_id] = record
+                self.incident_count += 1
+                self._emit(transitions, record, OPENED, t)
+                if alert.get('acknowledged', False):
+                    self._acknowledge(record, t, transitions)
+                continue
+
+            previous = record.alert
+            record.alert = alert
+            record.last_seen = t
+            record.cleared_since = None
+            if record.state == ACKNOWLEDGED:
+                alert['acknowledged'] = True
+
+            if record.state == RESOLVED:
+                # Reabertura logo após resolver: mesmo incidente, conta flap
+                record.flap_times.append(t)
+                self._update_flapping(record, t)
+                record.state = OPEN
+                record.resolved_at = None
+                record.acknowledged_at = None
+                self._emit(transitions, record, REOPENED, t)
+            elif previous.get('severity') != alert.get('severity'):
+                self._emit(transitions, record, SEVERITY_CHANGED, t, previous=previous.get('severity'))
+
+            if alert.get('acknowledged', False) and record.state == OPEN:
+                self._acknowledge(record, t, transitions)
+
+        # Ausentes: resolve após clear_seconds sem reaparecer
+        for key, record in list(self.records.items()):
+            if record.state == RESOLVED:
+                if t - record.resolved_at > max(self.reopen_window_seconds, self.flap_window_seconds):
+                    del self.records[key]
+                    del self.by_id[record.alert_id]
+                continue
+            if key in seen:
+                continue
+            if record.cleared_since is None:
+                record.cleared_since = t
+            if t - record.cleared_since >= self.clear_seconds:
+                self._update_flapping(record, t)
+                record.state = RESOLVED
+                record.resolved_at = t
+                self._emit(transitions, record, RESOLVE, t)
+
+        for record in self.records.values():
+            record.alert['alert_id'] = record.alert_id
+            record.alert['state'] = record.state
+
+        return transitions
+
+    def _update_flapping(self, record: AlertRecord, t: float):
+        """Descarta reaberturas fora da janela e recalcula o flapping"""
+        while record.flap_times and t - record.flap_times[0] > self.flap_window_seconds:
+            record.flap_times.popleft()
+        record.flapping = len(record.flap_times) >= self.flap_threshold
+
+    def _acknowledge(self, record: AlertRecord, t: float, transitions: List[Dict]):
+        record.state = ACKNOWLEDGED
+        record.acknowledged_at = t
+        record.alert['acknowledged'] = True
+        self._emit(transitions, record, ACKNOWLEDGE, t)
+
+    def acknowledge(self, alert_id: str, timestamp: Timestamp) -> Optional[Dict]:
+        """
+        Reconhece um incidente aberto (operador)
+
+        Returns:
+            Transição (None se o ID não existe ou não está aberto)
+        """
+        record = self.by_id.get(alert_id)
+        if record is None or record.state != OPEN:
+            return None
+        transitions: List[Dict] = []
+        self._acknowledge(record, to_epoch(timestamp), transitions)
+        record.alert['state'] = record.state
+        return transitions[0] if transitions else None
+
+    def _emit(self, transitions: List[Dict], record: AlertRecord, transition: str, t: float, **extra):
+        """Registra transição (suprimida se o incidente está flapping)"""
+        for listener in self.listeners:
+            listener(transition, record.alert_id, record.alert)
+        if record.flapping and transition in (REOPENED, RESOLVE):
+            self.suppressed_count += 1
+            return
+        self.transition_count += 1
+        entry = {
+            'transition': transition,
+            'alert_id': record.alert_id,
+            'robot_id': record.key[0],
+            'type': record.key[1],
+            'severity': record.alert.get('severity'),
+            'state': record.state,
+            'timestamp': t,
+            'alert': record.alert
+        }
+        entry.update(extra)
+        transitions.append(entry)
+
+    def current_alert(self, alert_id: str) -> Dict:
+        """Último dict observado do incidente"""
+        return self.by_id[alert_id].alert
+
+    def active_alerts(self) -> List[Dict]:
+        """Alertas abertos e reconhecidos (ordem de abertura)"""
+        return [record.alert for record in self.records.values() if record.state != RESOLVED]
+
+    def get(self, alert_id: str) -> Optional[Dict]:
+        """Estado de um incidente pelo ID"""
+        record = self.by_id.get(alert_id)
+        return record.to_dict() if record is not None else None
+
+    def get_stats(self) -> Dict:
+        """Contagem por estado, incidentes, transições emitidas e suprimidas"""
+        by_state = {OPEN: 0, ACKNOWLEDGED: 0, RESOLVED: 0}
+        for record in self.records.values():
+            by_state[record.state] += 1
+        return {
+            'by_state': by_state,
+            'flapping': sum(1 for record in self.records.values() if record.flapping),
+            'incidents': self.incident_count,
+            'transitions': self.transition_count,
+            'suppressed_transitions': self.suppressed_count
+        }
+
+
+if __name__ == "__main__":
+    print("🗂️  Telemetry - Alert Store Mock\n")
+    print("="*70)
+
+    store = AlertStore(clear_seconds=30, reopen_window_seconds=300, flap_threshold=3)
+    base = 1771602300  # 2026-02-20T15:45:00Z
+
+    def battery_alert(soc: float) -> Dict:
+        return {'robot_id': 'MICROBOT-004', 'type': 'battery_low', 'severity': 'warning',
+                'message': f'Bateria baixa em {soc}%', 'current_value': soc}
+
+    # 1 coleta por segundo durante 10 min, alerta contínuo: 1 transição
+    transitions = []
+    for second in range(600):
+        transitions += store.observe([battery_alert(45)], base + second)
+    alert_id = transitions[0]['alert_id']
+    print(f"\n📥 600 COLETAS COM O MESMO ALERTA: {len(transitions)} transição ({transitions[0]['transition']}, {alert_id})")
+
+    # Ausência curta (< clear_seconds) não resolve
+    short = store.observe([], base + 600) + store.observe([], base + 610) + store.observe([battery_alert(44)], base + 620)
+    print(f"   Sumiu por 20s e voltou: {len(short)} transições | ID mantido: {store.get(alert_id)['state']}")
+
+    # Reconhecimento pelo operador
+    ack = store.acknowledge(alert_id, base + 630)
+    print(f"   Operador reconheceu: {ack['transition']} ({ack['alert_id']})")
+
+    # Resolve após 30s ausente, reabre 3× em seguida → flapping
+    timeline = []
+    t = base + 640
+    for cycle in range(5):
+        for present in (False, False, False, True):
+            for transition in store.observe([battery_alert(48)] if present else [], t):
+                timeline.append(transition['transition'])
+            t += 20
+    record = store.get(alert_id)
+    print(f"\n🔁 FLAPPING (5 ciclos resolve/reabre): emitidas {timeline}")
+    print(f"   Mesmo incidente {record['alert_id']}: flaps {record['flaps']} | flapping {record['flapping']} | "
+          f"suprimidas {store.get_stats()['suppressed_transitions']}")
+
+    # Outro robô: incidente novo, ID novo
+    new = store.observe([battery_alert(48), {'robot_id': 'MICROBOT-007', 'type': 'cpu_high',
+                                             'severity': 'warning', 'message': 'CPU elevada: 95%'}], t)
+    print(f"\n🆕 NOVO INCIDENTE: {[(n['transition'], n['alert_id'], n['robot_id']) for n in new]}")
+
+    stats = store.get_stats()
+    print(f"\n📊 {stats['incidents']} incidentes | {stats['transitions']} transições | estados {stats['by_state']}")
+
+    print("\n" + "="*70)
+    print("✅ CICLO DE VIDA DE ALERTAS FUNCIONANDO")
+    print("="*70)
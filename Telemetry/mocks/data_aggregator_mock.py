@@ -7,16 +7,38 @@ Agregador de dados de telemetria (analytics, trends, KPIs)
 
 import json
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Optional
+
+from fleet_columns_mock import FleetColumns
+from history_store_mock import BoundedHistory
+from streaming_aggregator_mock import StreamingFleetAggregator
+from window_aggregator_mock import WindowAggregator
+
+HISTORY_ROLLUP_FIELDS = [
+    'fleet.total_robots',
+    'fleet.average_speed_ms',
+    'battery.average_soc_percent',
+    'battery.min_soc_percent',
+    'battery.max_temperature_c',
+    'battery.total_power_consumption_kw',
+    'mission.total_area_covered_ha',
+    'kpis.availability_percent',
+    'kpis.fleet_health_score'
+]
 
 
 class DataAggregator:
     """Agregador de dados de telemetria"""
     
-    def __init__(self, session_id: str):
+    def __init__(self, session_id: str, history_size: int = 1000,
+                 windows: Optional[Dict[str, float]] = None):
         self.session_id = session_id
         self.aggregation_count = 0
-        self.history = []
+        self.history = BoundedHistory(max_items=history_size, rollup_fields=HISTORY_ROLLUP_FIELDS)
+        self.stream = StreamingFleetAggregator()
+        self.windows = WindowAggregator(windows)
+        # Último snapshot ainda não aplicado ao agregador incremental
+        self._pending_snapshot: Optional[List[Dict]] = None
     
     def aggregate_data(self, telemetry_data: Dict) -> Dict:
         """
@@ -28,27 +50,75 @@ class DataAggregator:
         - Tendências (trends)
         - KPIs operacionais
         
+        O snapshot é projetado em colunas numa única passada e as agregações
+        saem das colunas; a mesma passada alimenta as estatísticas no tempo
+        por robô a cada snapshot. O estado da frota no agregador incremental
+        só recebe o último snapshot, quando o caminho por mensagem
+        (`ingest_message`) é usado.
+        
         Args:
             telemetry_data: Dados de telemetria
         
         Returns:
             Dados agregados
         """
-        self.aggregation_count += 1
-        
         robots = telemetry_data.get('robots_telemetry', [])
+        columns = FleetColumns.from_robots(robots)
+        self.stream.record_robot_times(columns.robot_times)
+        self._pending_snapshot = robots
+        self.windows.add_snapshot(telemetry_data)
+        return self._build_result(columns, telemetry_data['timestamp'])
+    
+    def _sync_stream(self):
+        """Aplica ao agregador incremental o snapshot pendente (tempos já registrados)"""
+        if self._pending_snapshot is not None:
+            self.stream.sync_snapshot(self._pending_snapshot, record_times=False)
+            self._pending_snapshot = None
+    
+    def ingest_message(self, robot: Dict):
+        """
+        Aplica a telemetria de um único robô (O(1) na frota)
         
-        # Agregações de frota
-        fleet_aggregation = self._aggregate_fleet_metrics(robots)
+        Args:
+            robot: Registro no formato de `robots_telemetry`
+        """
+        self._sync_stream()
+        self.stream.ingest_message(robot)
+        self.windows.add_robot(robot)
+    
+    def aggregate_windows(self, now: Optional[str] = None) -> Dict:
+        """
+        Agregações por janela (1 min, 15 min, 1 h por default)
+        
+        Args:
+            now: Fim das janelas sliding (default: telemetria mais recente)
+        
+        Returns:
+            sliding/tumbling: janela → métrica → count, mean, min, max, p50, p95, p99
+        """
+        return self.windows.summary(now)
+    
+    def aggregate_stream(self, timestamp: Optional[str] = None) -> Dict:
+        """
+        Resultado agregado do estado incremental atual
         
-        # Agregações de bateria
-        battery_aggregation = self._aggregate_battery_metrics(robots)
+        Args:
+            timestamp: Timestamp do resultado (default: última mensagem)
         
-        # Agregações de missão
-        mission_aggregation = self._aggregate_mission_metrics(robots)
+        Returns:
+            Dados agregados (mesmo formato de `aggregate_data`)
+        """
+        self._sync_stream()
+        return self._build_result(self.stream, timestamp or self.stream.last_timestamp)
+    
+    def _build_result(self, source, timestamp: str) -> Dict:
+        """Monta o resultado a partir de FleetColumns ou StreamingFleetAggregator"""
+        self.aggregation_count += 1
         
-        # Agregações de performance
-        performance_aggregation = self._aggregate_performance_metrics(robots)
+        fleet_aggregation = source.fleet_metrics()
+        battery_aggregation = source.battery_metrics()
+        mission_aggregation = source.mission_metrics()
+        performance_aggregation = source.performance_metrics()
         
         # KPIs operacionais
         operational_kpis = self._calculate_operational_kpis(fleet_aggregation, 
@@ -57,7 +127,7 @@ class DataAggregator:
         
         result = {
             'session_id': self.session_id,
-            'timestamp': telemetry_data['timestamp'],
+            'timestamp': timestamp,
             'aggregation_count': self.aggregation_count,
             'fleet': fleet_aggregation,
             'battery': battery_aggregation,
@@ -69,185 +139,6 @@ class DataAggregator:
         self.history.append(result)
         return result
     
-    def _aggregate_fleet_metrics(self, robots: List[Dict]) -> Dict:
-        """Agrega métricas de frota"""
-        total_robots = len(robots)
-        
-        # Por tipo
-        by_type = {}
-        for robot in robots:
-            rtype = robot['type']
-            by_type[rtype] = by_type.get(rtype, 0) + 1
-        
-        # Por status de saúde
-        by_health = {'healthy': 0, 'warning': 0, 'critical': 0, 'unknown': 0}
-        for robot in robots:
-            health = robot.get('health', {}).get('overall_status', 'unknown')
-            by_health[health] = by_health.get(health, 0) + 1
-        
-        # Por status de missão
-        by_mission_status = {}
-        for robot in robots:
-            mission_status = robot.get('mission', {}).get('status', 'unknown')
-            by_mission_status[mission_status] = by_mission_status.get(mission_status, 0) + 1
-        
-        # Posições (centróide da frota)
-        lats = [r['position']['lat'] for r in robots if r.get('position')]
-        lons = [r['position']['lon'] for r in robots if r.get('position')]
-        
-        centroid = {
-            'lat': sum(lats) / len(lats) if lats else 0,
-            'lon': sum(lons) / len(lons) if lons else 0
-        }
-        
-        # Velocidade média
-        speeds = [r['position'].get('speed_ms', 0) for r in robots if r.get('position')]
-        avg_speed = sum(speeds) / len(speeds) if speeds else 0
-        
-        return {
-            'total_robots': total_robots,
-            'by_type': by_type,
-            'by_health': by_health,
-            'by_mission_status': by_mission_status,
-            'centroid': centroid,
-            'average_speed_ms': round(avg_speed, 2)
-        }
-    
-    def _aggregate_battery_metrics(self, robots: List[Dict]) -> Dict:
-        """Agrega métricas de bateria"""
-        batteries = [r.get('battery', {}) for r in robots if r.get('battery')]
-        
-        if not batteries:
-            return {}
-        
-        # SOC
-        socs = [b['soc_percent'] for b in batteries]
-        avg_soc = sum(socs) / len(socs)
-        min_soc = min(socs)
-        max_soc = max(socs)
-        
-        # Temperatura
-        temps = [b['temperature_c'] for b in batteries]
-        avg_temp = sum(temps) / len(temps)
-        max_temp = max(temps)
-        
-        # Potência
-        powers = [abs(b['voltage_v'] * b['current_a']) for b in batteries]
-        total_power = sum(powers)
-        
-        # Carregando
-        charging_count = sum(1 for b in batteries if b.get('charging', False))
-        
-        # Ciclos
-        cycles = [b.get('cycles_count', 0) for b in batteries]
-        avg_cycles = sum(cycles) / len(cycles) if cycles else 0
-        
-        # Range estimado
-        ranges = [b.get('estimated_range_km', 0) for b in batteries]
-        avg_range = sum(ranges) / len(ranges) if ranges else 0
-        
-        # Distribuição de SOC
-        soc_distribution = {
-            'critical_0_20': sum(1 for s in socs if s < 20),
-            'low_20_50': sum(1 for s in socs if 20 <= s < 50),
-            'medium_50_80': sum(1 for s in socs if 50 <= s < 80),
-            'high_80_100': sum(1 for s in socs if s >= 80)
-        }
-        
-        return {
-            'average_soc_percent': round(avg_soc, 1),
-            'min_soc_percent': min_soc,
-            'max_soc_percent': max_soc,
-            'soc_distribution': soc_distribution,
-            'average_temperature_c': round(avg_temp, 1),
-            'max_temperature_c': max_temp,
-            'total_power_consumption_kw': round(total_power / 1000, 2),
-            'charging_count': charging_count,
-            'average_cycles': round(avg_cycles, 0),
-            'average_range_km': round(avg_range, 1)
-        }
-    
-    def _aggregate_mission_metrics(self, robots: List[Dict]) -> Dict:
-        """Agrega métricas de missão"""
-        missions = [r.get('mission', {}) for r in robots if r.get('mission')]
-        
-        # Missões ativas
-        active_missions = [m for m in missions if m.get('mission_id')]
-        
-        if not active_missions:
-            return {
-                'active_missions': 0,
-                'idle_robots': len(robots),
-                'total_area_covered_ha': 0,
-                'total_area_remaining_ha': 0
-            }
-        
-        # Progresso
-        progresses = [m.get('progress_percent', 0) for m in active_missions]
-        avg_progress = sum(progresses) / len(progresses) if progresses else 0
-        
-        # Área
-        areas_covered = [m.get('area_covered_ha', 0) for m in missions]
-        areas_remaining = [m.get('area_remaining_ha', 0) for m in missions]
-        total_area_covered = sum(areas_covered)
-        total_area_remaining = sum(areas_remaining)
-        
-        # Por status
-        mission_statuses = [m.get('status', 'idle') for m in missions]
-        by_status = {}
-        for status in mission_statuses:
-            by_status[status] = by_status.get(status, 0) + 1
-        
-        # Eficiência (área coberta por hora de uptime)
-        total_uptime = sum(r.get('health', {}).get('uptime_hours', 0) for r in robots)
-        efficiency_ha_per_hour = (total_area_covered / total_uptime) if total_uptime > 0 else 0
-        
-        return {
-            'active_missions': len(active_missions),
-            'idle_robots': by_status.get('idle', 0),
-            'average_progress_percent': round(avg_progress, 1),
-            'total_area_covered_ha': round(total_area_covered, 2),
-            'total_area_remaining_ha': round(total_area_remaining, 2),
-            'by_status': by_status,
-            'efficiency_ha_per_hour': round(efficiency_ha_per_hour, 2)
-        }
-    
-    def _aggregate_performance_metrics(self, robots: List[Dict]) -> Dict:
-        """Agrega métricas de performance"""
-        healths = [r.get('health', {}) for r in robots if r.get('health')]
-        
-        if not healths:
-            return {}
-        
-        # CPU
-        cpus = [h.get('cpu_usage_percent', 0) for h in healths]
-        avg_cpu = sum(cpus) / len(cpus)
-        max_cpu = max(cpus) if cpus else 0
-        
-        # Memória
-        mems = [h.get('memory_usage_percent', 0) for h in healths]
-        avg_mem = sum(mems) / len(mems)
-        max_mem = max(mems) if mems else 0
-        
-        # Uptime
-        uptimes = [h.get('uptime_hours', 0) for h in healths]
-        avg_uptime = sum(uptimes) / len(uptimes)
-        total_uptime = sum(uptimes)
-        
-        # Latência de rede
-        latencies = [h.get('network_latency_ms', 0) for h in healths]
-        avg_latency = sum(latencies) / len(latencies) if latencies else 0
-        
-        return {
-            'average_cpu_percent': round(avg_cpu, 1),
-            'max_cpu_percent': max_cpu,
-            'average_memory_percent': round(avg_mem, 1),
-            'max_memory_percent': max_mem,
-            'average_uptime_hours': round(avg_uptime, 1),
-            'total_uptime_hours': round(total_uptime, 1),
-            'average_network_latency_ms': round(avg_latency, 0)
-        }
-    
     def _calculate_operational_kpis(self, fleet: Dict, battery: Dict, 
                                     mission: Dict) -> Dict:
         """Calcula KPIs operacionais"""
@@ -336,6 +227,16 @@ class DataAggregator:
         print(f"   Uptime médio: {perf['average_uptime_hours']:.1f}h (total {perf['total_uptime_hours']:.1f}h)")
         print(f"   Latência média: {perf['average_network_latency_ms']:.0f} ms")
         
+        windows = self.aggregate_windows()['sliding']
+        if any(windows.values()):
+            print(f"\n🪟 JANELAS (sliding, p50/p95/p99):")
+            for name, metrics in windows.items():
+                temp = metrics.get('temperature_c')
+                soc = metrics.get('soc_percent')
+                if temp and soc:
+                    print(f"   {name}: temperatura {temp['p50']:.1f}/{temp['p95']:.1f}/{temp['p99']:.1f}°C | "
+                          f"SOC {soc['p50']:.1f}/{soc['p95']:.1f}/{soc['p99']:.1f}%")
+        
         print(f"\n📈 KPIs OPERACIONAIS:")
         print(f"   Disponibilidade: {kpis['availability_percent']:.1f}%")
         print(f"   Utilização: {kpis['utilization_percent']:.1f}%")
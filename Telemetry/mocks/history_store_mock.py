@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+Telemetry - History Store Mock
+
+Histórico limitado (ring buffer por quantidade e/ou idade) compartilhado
+pelos componentes de Telemetry e Solar-Manager.
+
+Os resultados recentes ficam inteiros; os que saem do buffer viram rollups
+por janela de tempo (contagem, média, mín, máx, último por campo numérico),
+então um coletor rodando por semanas a 1-10 Hz ocupa memória constante e
+ainda responde "como foi a última hora/dia".
+"""
+
+import math
+from bisect import bisect_left, bisect_right
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+Timestamp = Union[str, int, float, datetime]
+
+
+def to_epoch(timestamp: Timestamp) -> float:
+    """Converte timestamp ISO 8601 (com ou sem 'Z'), datetime ou número em segundos epoch"""
+    if isinstance(timestamp, (int, float)):
+        return float(timestamp)
+    if isinstance(timestamp, str):
+        timestamp = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.replace(tzinfo=timezone.utc)
+    return timestamp.timestamp()
+
+
+def _lookup(item: Dict, path: Tuple[str, ...]) -> Any:
+    """Valor em `item` no caminho pontilhado já separado (None se ausente)"""
+    value = item
+    for key in path:
+        if not isinstance(value, dict):
+            return None
+        value = value.get(key)
+    return value
+
+
+class Rollup:
+    """Resumo de uma janela de tempo: contagem e estatísticas por campo"""
+
+    __slots__ = ('start', 'end', 'count', 'fields')
+
+    def __init__(self, start: float):
+        self.start = start
+        self.end = start
+        self.count = 0
+        # campo → [n, soma, mín, máx, último]
+        self.fields: Dict[str, List[float]] = {}
+
+    def add(self, t: float, item: Dict, fields: Sequence[Tuple[str, Tuple[str, ...]]]):
+        """Acumula um item na janela"""
+        self.count += 1
+        self.end = max(self.end, t)
+        for name, path in fields:
+            value = _lookup(item, path)
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                continue
+            stats = self.fields.get(name)
+            if stats is None:
+                self.fields[name] = [1, value, value, value, value]
+            else:
+                stats[0] += 1
+                stats[1] += value
+                if value < stats[2]:
+                    stats[2] = value
+                if value > stats[3]:
+                    stats[3] = value
+                stats[4] = value
+
+    def to_dict(self) -> Dict:
+        """Exporta como dict (JSON)"""
+        return {
+            'start': self.start,
+            'end': self.end,
+            'count': self.count,
+            'fields': {
+                name: {'count': n, 'mean': round(total / n, 4), 'min': low, 'max': high, 'last': last}
+                for name, (n, total, low, high, last) in self.fields.items()
+            }
+        }
+
+
+class BoundedHistory:
+    """
+    Ring buffer de resultados com limite por quantidade e/ou idade
+
+    Mantém a interface de lista usada antes (`append`, `len`, iteração,
+    `history[-1]`), mas descarta o excesso em rollups por janela.
+    """
+
+    def __init__(self, max_items: Optional[int] = 1000, max_age_seconds: Optional[float] = None,
+                 rollup_seconds: float = 60.0, max_rollups: int = 10080,
+                 rollup_fields: Sequence[str] = (), time_key: str = 'timestamp'):
+        """
+        Args:
+            max_items: Máximo de itens inteiros (None = sem limite por quantidade)
+            max_age_seconds: Idade máxima em relação ao item mais novo (None = sem limite)
+            rollup_seconds: Largura da janela dos rollups
+            max_rollups: Rollups mantidos (default: 1 semana de janelas de 1 min)
+            rollup_fields: Caminhos pontilhados dos campos numéricos resumidos
+                (ex.: 'collection_stats.average_battery_soc')
+            time_key: Chave do timestamp nos itens
+        """
+        if max_items is None and max_age_seconds is None:
+            raise ValueError("BoundedHistory precisa de max_items ou max_age_seconds")
+
+        self.max_items = max_items
+        self.max_age_seconds = max_age_seconds
+        self.rollup_seconds = rollup_seconds
+        self.time_key = time_key
+        self.rollup_fields = [(field, tuple(field.split('.'))) for field in rollup_fields]
+
+        # Buffer: listas paralelas com início deslocado (remoção O(1) amortizada)
+        self._times: List[float] = []
+        self._items: List[Dict] = []
+        self._start = 0
+
+        self.rollups: deque = deque(maxlen=max_rollups)
+        self._open_rollup: Optional[Rollup] = None
+        self.evicted_count = 0
+
+    def append(self, item: Dict, timestamp: Optional[Timestamp] = None):
+        """
+        Adiciona um item (timestamp do próprio item por default)
+
+        Itens fora de ordem são inseridos na posição certa.
+        """
+        t = to_epoch(item[self.time_key] if timestamp is None else timestamp)
+        if self._items and t < self._times[-1]:
+            index = bisect_right(self._times, t, self._start)
+            self._times.insert(index, t)
+            self._items.insert(index, item)
+        else:
+            self._times.append(t)
+            self._items.append(item)
+        self._evict()
+
+    def _evict(self):
+        """Move para os rollups o que passou dos limites"""
+        newest = self._times[-1]
+        limit_count = self.max_items
+        limit_age = self.max_age_seconds
+        while self._start < len(self._items):
+            size = len(self._items) - self._start
+            too_many = limit_count is not None and size > limit_count
+            too_old = limit_age is not None and newest - self._times[self._start] > limit_age
+            if not (too_many or too_old):
+                break
+            self._roll(self._times[self._start], self._items[self._start])
+            self._items[self._start] = None
+            self._start += 1
+            self.evicted_count += 1
+
+        # Compacta quando metade da lista já foi descartada
+        if self._start > 64 and self._start * 2 > len(self._items):
+            del self._times[:self._start]
+            del self._items[:self._start]
+            self._start = 0
+
+    def _roll(self, t: float, item: Dict):
+        """Acumula item descartado na janela correspondente"""
+        window_start = math.floor(t / self.rollup_seconds) * self.rollup_seconds
+        rollup = self._open_rollup
+        if rollup is None or window_start > rollup.start:
+            rollup = self._open_rollup = Rollup(window_start)
+            self.rollups.append(rollup)
+        # Item atrasado de uma janela já fechada entra na janela aberta
+        rollup.add(t, item, self.rollup_fields)
+
+    def get_range(self, t0: Timestamp, t1: Timestamp) -> List[Dict]:
+        """Itens inteiros com t0 <= timestamp <= t1 (busca binária)"""
+        low = bisect_left(self._times, to_epoch(t0), self._start)
+        high = bisect_right(self._times, to_epoch(t1), low)
+        return self._items[low:high]
+
+    def get_rollups(self, t0: Timestamp, t1: Timestamp) -> List[Dict]:
+        """Rollups cujas janelas intersectam [t0, t1]"""
+        start, end = to_epoch(t0), to_epoch(t1)
+        rollups = self.rollups
+        low = bisect_left(rollups, start, key=lambda rollup: rollup.start + self.rollup_seconds)
+        result = []
+        for index in range(low, len(rollups)):
+            rollup = rollups[index]
+            if rollup.start > end:
+                break
+            result.append(rollup.to_dict())
+        return result
+
+    def latest(self) -> Optional[Dict]:
+        """Item mais recente (None se vazio)"""
+        return self._items[-1] if len(self._items) > self._start else None
+
+    def time_span(self) -> Tuple[Optional[float], Optional[float]]:
+        """(mais antigo, mais novo) entre os itens inteiros"""
+        if len(self._items) == self._start:
+            return None, None
+        return self._times[self._start], self._times[-1]
+
+    def __len__(self) -> int:
+        return len(self._items) - self._start
+
+    def __iter__(self) -> Iterator[Dict]:
+        return iter(self._items[self._start:])
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self._items[self._start:][index]
+        size = len(self)
+        if index < 0:
+            index += size
+        if not 0 <= index < size:
+            raise IndexError('BoundedHistory index out of range')
+        return self._items[self._start + index]
+
+    def __bool__(self) -> bool:
+        return len(self) > 0
+
+    def get_stats(self) -> Dict:
+        """Ocupação do buffer e dos rollups"""
+        oldest, newest = self.time_span()
+        return {
+            'items': len(self),
+            'evicted': self.evicted_count,
+            'rollups': len(self.rollups),
+            'oldest': oldest,
+            'newest': newest
+        }
+
+
+if __name__ == "__main__":
+    import sys
+    import time
+    import tracemalloc
+    from datetime import timedelta
+
+    print("🗄️  Telemetry - History Store Mock\n")
+    print("="*70)
+
+    # 1. Coletor a 1 Hz por 1 dia simulado: memória constante
+    history = BoundedHistory(max_items=600, max_age_seconds=600, rollup_seconds=60,
+                             rollup_fields=['collection_stats.average_battery_soc', 'robots_count'])
+    base = datetime(2026, 2, 20, 15, 45, tzinfo=timezone.utc)
+    samples = 24 * 3600
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    for i in range(samples):
+        t = base + timedelta(seconds=i)
+        history.append({
+            'timestamp': t.isoformat().replace('+00:00', 'Z'),
+            'robots_count': 50,
+            'collection_stats': {'average_battery_soc': 80 - 60 * i / samples}
+        })
+    elapsed = time.perf_counter() - start
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    stats = history.get_stats()
+    print(f"\n📥 1 DIA A 1 Hz ({samples:,} coletas):")
+    print(f"   Inteiros: {stats['items']} | rollups: {stats['rollups']} | descartados: {stats['evicted']:,}")
+    print(f"   {elapsed / samples * 1e6:.1f} µs/append | memória {current / 1024 / 1024:.1f} MB (pico {peak / 1024 / 1024:.1f} MB)")
+
+    # 2. Consultas por intervalo
+    newest = history.latest()['timestamp']
+    t1 = to_epoch(newest)
+    recent = history.get_range(t1 - 10, t1)
+    print(f"\n🔎 CONSULTAS:")
+    print(f"   Últimos 10s: {len(recent)} coletas inteiras")
+    hourly = history.get_rollups(t1 - 3 * 3600, t1)
+    first, last = hourly[0], hourly[-1]
+    print(f"   Últimas 3h: {len(hourly)} rollups de 1 min")
+    print(f"   SOC médio {first['fields']['collection_stats.average_battery_soc']['mean']:.2f}% → "
+          f"{last['fields']['collection_stats.average_battery_soc']['mean']:.2f}% "
+          f"({last['count']} coletas por janela)")
+
+    # 3. Interface de lista preservada
+    print(f"\n📋 COMPATIBILIDADE: len={len(history)} | history[-1] == latest(): {history[-1] is history.latest()}")
+
+    print("\n" + "="*70)
+    print("✅ HISTÓRICO LIMITADO FUNCIONANDO")
+    print("="*70)
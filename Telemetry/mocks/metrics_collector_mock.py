@@ -9,14 +9,34 @@ import json
 from pathlib import Path
 from typing import Dict, List
 
+from fleet_columns_mock import FleetColumns
+from history_store_mock import BoundedHistory
+from timeseries_store_mock import robot_series_values
+
+HISTORY_ROLLUP_FIELDS = [
+    'robots_count',
+    'collection_stats.average_battery_soc',
+    'collection_stats.healthy_robots',
+    'collection_stats.active_missions',
+    'collection_stats.total_alerts',
+    'data_quality.quality_score'
+]
+
 
 class MetricsCollector:
     """Coletor de métricas de telemetria"""
     
-    def __init__(self, session_id: str):
+    def __init__(self, session_id: str, history_size: int = 1000, store=None):
+        """
+        Args:
+            session_id: ID da sessão de telemetria
+            history_size: Coletas inteiras mantidas no histórico
+            store: TimeSeriesStore opcional (séries por robô e métrica)
+        """
         self.session_id = session_id
+        self.store = store
         self.collection_count = 0
-        self.history = []
+        self.history = BoundedHistory(max_items=history_size, rollup_fields=HISTORY_ROLLUP_FIELDS)
     
     def collect_metrics(self, telemetry_data: Dict) -> Dict:
         """
@@ -30,6 +50,9 @@ class MetricsCollector:
         - Frequência: 1-10 Hz dependendo do sensor
         - Time-series DB: InfluxDB, TimescaleDB
         
+        Mensagens por robô entram por TelemetryIngest (telemetry_ingest_mock),
+        que chama `ingest_message`; `snapshot()` dele alimenta este método.
+        
         Args:
             telemetry_data: Dados brutos de telemetria
         
@@ -40,17 +63,21 @@ class MetricsCollector:
         
         robots = telemetry_data.get('robots_telemetry', [])
         
-        # Coleta métricas por robô
+        # Coleta métricas por robô (e projeta a frota em colunas na mesma passada)
         robot_metrics = []
+        columns = FleetColumns()
         for robot in robots:
+            columns.add(robot)
             metrics = self._collect_robot_metrics(robot)
             robot_metrics.append(metrics)
+            if self.store is not None:
+                self.store.append_metrics(metrics['robot_id'], metrics['timestamp'], robot_series_values(metrics))
         
         # Estatísticas de coleta
-        collection_stats = self._calculate_collection_stats(robot_metrics)
+        collection_stats = self._calculate_collection_stats(columns)
         
         # Qualidade dos dados
-        data_quality = self._assess_data_quality(robots, collection_stats)
+        data_quality = self._assess_data_quality(columns, collection_stats)
         
         result = {
             'session_id': self.session_id,
@@ -65,6 +92,21 @@ class MetricsCollector:
         self.history.append(result)
         return result
     
+    def ingest_message(self, robot: Dict) -> Dict:
+        """
+        Coleta métricas de um único robô (ingestão por mensagem)
+        
+        Args:
+            robot: Registro no formato de `robots_telemetry`
+        
+        Returns:
+            Métricas do robô
+        """
+        metrics = self._collect_robot_metrics(robot)
+        if self.store is not None:
+            self.store.append_metrics(metrics['robot_id'], metrics['timestamp'], robot_series_values(metrics))
+        return metrics
+    
     def _collect_robot_metrics(self, robot: Dict) -> Dict:
         """Coleta métricas de um robô"""
         robot_id = robot['robot_id']
@@ -197,9 +239,9 @@ class MetricsCollector:
             by_severity[severity] = by_severity.get(severity, 0) + 1
         return by_severity
     
-    def _calculate_collection_stats(self, robot_metrics: List[Dict]) -> Dict:
+    def _calculate_collection_stats(self, columns: FleetColumns) -> Dict:
         """Calcula estatísticas de coleta"""
-        if not robot_metrics:
+        if columns.robots == 0:
             return {
                 'collection_rate': 0,
                 'expected_robots': 0,
@@ -207,50 +249,12 @@ class MetricsCollector:
                 'collection_success_rate': 0
             }
         
-        total_robots = len(robot_metrics)
-        
-        # Métricas de bateria
-        battery_socs = [m['battery']['soc_percent'] for m in robot_metrics]
-        avg_battery_soc = sum(battery_socs) / len(battery_socs) if battery_socs else 0
-        
-        # Métricas de saúde
-        health_statuses = [m['system_health']['overall_status'] for m in robot_metrics]
-        healthy_count = sum(1 for s in health_statuses if s == 'healthy')
-        
-        # Métricas de missão
-        mission_statuses = [m['mission']['status'] for m in robot_metrics]
-        active_missions = sum(1 for s in mission_statuses if s not in ['idle', 'charging'])
-        
-        return {
-            'total_robots': total_robots,
-            'collection_success_rate': 100.0,  # Mock sempre 100%
-            'average_battery_soc': round(avg_battery_soc, 1),
-            'healthy_robots': healthy_count,
-            'active_missions': active_missions,
-            'total_alerts': sum(m['alerts']['total_alerts'] for m in robot_metrics)
-        }
+        return columns.collection_stats()
     
-    def _assess_data_quality(self, robots: List[Dict], stats: Dict) -> Dict:
+    def _assess_data_quality(self, columns: FleetColumns, stats: Dict) -> Dict:
         """Avalia qualidade dos dados coletados"""
-        # Completude (% de campos preenchidos)
-        total_fields = 0
-        filled_fields = 0
-        
-        for robot in robots:
-            # Conta campos importantes
-            if robot.get('position'):
-                total_fields += 5
-                filled_fields += 5  # Mock sempre completo
-            
-            if robot.get('battery'):
-                total_fields += 7
-                filled_fields += 7
-            
-            if robot.get('sensors'):
-                total_fields += len(robot.get('sensors', {}))
-                filled_fields += len([s for s in robot.get('sensors', {}).values() if s])
-        
-        completeness = (filled_fields / total_fields * 100) if total_fields > 0 else 0
+        # Completude (% de campos preenchidos: posição, bateria, sensores)
+        completeness = columns.completeness_percent()
         
         # Latência (mock)
         latency_ms = 125  # Da system_health
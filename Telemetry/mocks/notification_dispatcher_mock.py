@@ -0,0 +1,423 @@
+#!/usr/bin/env python3
+"""
+Telemetry - Notification Dispatcher Mock
+
+Entrega assíncrona das notificações do AlertManager (sms, email, push).
+
+Cada notificação vira uma entrega por (canal, destinatário). Críticas vão
+direto para a fila do canal com prioridade máxima; as demais são agrupadas
+em digests por (canal, destinatário) durante `digest_seconds`. Cada canal
+tem seus próprios workers asyncio e fila de prioridade, então um lote de
+warnings enfileirado não atrasa um alerta crítico de outro canal nem fica
+na frente dele no mesmo canal.
+
+Destinatários têm limite de taxa (token bucket por canal): entregas não
+críticas acima do limite voltam para o digest e saem juntas quando houver
+token. Falhas do canal (`DeliveryError` ou qualquer outra exceção do
+sink, ex.: OSError do FileSink) são retentadas com backoff exponencial;
+esgotadas as tentativas, a entrega vai para `dead_letters`. Nenhuma falha
+derruba o worker.
+"""
+
+import asyncio
+import json
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+PRIORITY_CRITICAL = 0
+PRIORITY_NORMAL = 1
+
+# Tipos de notificação entregues sem digest nem limite de taxa
+CRITICAL_TYPES = ('critical_alert',)
+
+DEFAULT_WORKERS = {'sms': 1, 'email': 2, 'push': 2}
+
+
+class DeliveryError(Exception):
+    """Falha transitória do canal (a entrega é retentada)"""
+
+
+class MemorySink:
+    """Canal em memória (testes): guarda as entregas em `delivered`"""
+
+    def __init__(self, latency_seconds: float = 0.0, fail_every: int = 0):
+        """
+        Args:
+            latency_seconds: Tempo simulado de envio
+            fail_every: A cada N envios, um falha com DeliveryError (0 = nunca)
+        """
+        self.latency_seconds = latency_seconds
+        self.fail_every = fail_every
+        self.delivered: List[Dict] = []
+        self.attempts = 0
+
+    async def send(self, payload: Dict):
+        self.attempts += 1
+        await asyncio.sleep(self.latency_seconds)
+        if self.fail_every and self.attempts % self.fail_every == 0:
+            raise DeliveryError(f"falha simulada no envio {self.attempts}")
+        self.delivered.append(payload)
+
+
+class FileSink:
+    """Canal em arquivo: uma entrega por linha JSON"""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.delivered = 0
+
+    async def send(self, payload: Dict):
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(payload, ensure_ascii=False) + '\n')
+        self.delivered += 1
+
+
+class TokenBucket:
+    """Limite de taxa: `rate_per_second` contínuo com rajada de até `burst`"""
+
+    __slots__ = ('rate_per_second', 'burst', 'tokens', 'updated')
+
+    def __init__(self, rate_per_second: float, burst: float, now: float):
+        self.rate_per_second = rate_per_second
+        self.burst = burst
+        self.tokens = burst
+        self.updated = now
+
+    def _refill(self, now: float):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate_per_second)
+        self.updated = now
+
+    def try_take(self, now: float) -> bool:
+        self._refill(now)
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+    def take(self, now: float):
+        """Consome mesmo sem saldo (críticas contam, mas não esperam)"""
+        self._refill(now)
+        self.tokens -= 1
+
+    def wait_seconds(self, now: float) -> float:
+        """Tempo até haver 1 token"""
+        self._refill(now)
+        return max(0.0, (1 - self.tokens) / self.rate_per_second)
+
+
+class NotificationDispatcher:
+    """Workers assíncronos por canal com digests, limite de taxa e retentativas"""
+
+    def __init__(self, sinks: Dict[str, object], workers: Optional[Dict[str, int]] = None,
+                 digest_seconds: float = 30.0, digest_max_items: int = 50,
+                 rate_per_minute: float = 6.0, burst: int = 3,
+                 max_retries: int = 3, backoff_seconds: float = 1.0,
+                 time_fn: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            sinks: Canal → sink com `async send(payload)`
+            workers: Workers por canal (default: DEFAULT_WORKERS, 1 para canais desconhecidos)
+            digest_seconds: Janela de agrupamento das notificações não críticas
+            digest_max_items: Digest com esse tamanho é enviado sem esperar a janela
+            rate_per_minute, burst: Limite por (canal, destinatário) para entregas não críticas
+            max_retries: Retentativas após falha do sink
+            backoff_seconds: Espera da 1ª retentativa (dobra a cada tentativa)
+            time_fn: Relógio (substituível em testes)
+        """
+        self.sinks = sinks
+        self.workers = {channel: (workers or DEFAULT_WORKERS).get(channel, 1) for channel in sinks}
+        self.digest_seconds = digest_seconds
+        self.digest_max_items = digest_max_items
+        self.rate_per_second = rate_per_minute / 60.0
+        self.burst = burst
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+        self.time_fn = time_fn
+
+        self.queues: Dict[str, asyncio.PriorityQueue] = {channel: asyncio.PriorityQueue() for channel in sinks}
+        self.buckets: Dict[Tuple[str, str], TokenBucket] = {}
+        # (canal, destinatário) → notificações aguardando o digest
+        self.digests: Dict[Tuple[str, str], List[Dict]] = {}
+        self.digest_created: Dict[Tuple[str, str], float] = {}
+        self.dead_letters: List[Dict] = []
+
+        self._tasks: List[asyncio.Task] = []
+        self._timers: Dict[Tuple[str, str], asyncio.TimerHandle] = {}
+        self._scheduled = 0  # retentativas e adiamentos pendentes
+        self._sequence = 0
+        self.latencies: Dict[int, List[float]] = {PRIORITY_CRITICAL: [], PRIORITY_NORMAL: []}
+        self.stats = {
+            'submitted': 0,
+            'unroutable': 0,
+            'coalesced': 0,  # notificações entregues dentro de um digest (além da 1ª)
+            'delivered': 0,
+            'rate_limited': 0,
+            'retried': 0,
+            'failed': 0
+        }
+
+    # Entrada
+
+    def submit(self, notification: Dict) -> int:
+        """
+        Enfileira uma notificação (não bloqueia)
+
+        Returns:
+            Entregas (canal, destinatário) geradas
+        """
+        self.stats['submitted'] += 1
+        now = self.time_fn()
+        critical = notification['type'] in CRITICAL_TYPES
+        routed = 0
+        for channel in notification['channel']:
+            if channel not in self.sinks:
+                self.stats['unroutable'] += 1
+                continue
+            for recipient in notification['recipients']:
+                routed += 1
+                if critical:
+                    self._enqueue(channel, recipient, [notification], PRIORITY_CRITICAL, now)
+                else:
+                    self._add_to_digest((channel, recipient), [notification], now)
+        return routed
+
+    def _add_to_digest(self, key: Tuple[str, str], items: List[Dict], created: float):
+        pending = self.digests.setdefault(key, [])
+        pending.extend(items)
+        self.digest_created[key] = min(self.digest_created.get(key, created), created)
+        if len(pending) >= self.digest_max_items:
+            self._flush_digest(key)
+        elif key not in self._timers:
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                return  # sem loop: sai no start()
+            self._timers[key] = loop.call_later(self.digest_seconds, self._flush_digest, key)
+
+    def _flush_digest(self, key: Tuple[str, str]):
+        timer = self._timers.pop(key, None)
+        if timer is not None:
+            timer.cancel()
+        items = self.digests.pop(key, None)
+        created = self.digest_created.pop(key, None)
+        if items:
+            self._enqueue(key[0], key[1], items, PRIORITY_NORMAL, created)
+
+    def flush_digests(self):
+        """Envia todos os digests pendentes sem esperar a janela"""
+        for key in list(self.digests):
+            self._flush_digest(key)
+
+    def _enqueue(self, channel: str, recipient: str, items: List[Dict], priority: int,
+                 created: float, attempt: int = 0):
+        self._sequence += 1
+        delivery = {
+            'channel': channel,
+            'recipient': recipient,
+            'priority': priority,
+            'items': items,
+            'created': created,
+            'attempt': attempt
+        }
+        self.queues[channel].put_nowait((priority, self._sequence, delivery))
+
+    # Workers
+
+    async def start(self):
+        """Inicia os workers de cada canal (e digests recebidos antes do loop)"""
+        for channel, count in self.workers.items():
+            for _ in range(count):
+                self._tasks.append(asyncio.create_task(self._worker(channel)))
+        loop = asyncio.get_running_loop()
+        for key in list(self.digests):
+            if key not in self._timers:
+                self._timers[key] = loop.call_later(self.digest_seconds, self._flush_digest, key)
+
+    async def _worker(self, channel: str):
+        queue = self.queues[channel]
+        sink = self.sinks[channel]
+        while True:
+            _, _, delivery = await queue.get()
+            try:
+                await self._deliver(sink, delivery)
+            except Exception as error:
+                # Erro fora do envio (ex.: payload inválido): não retentável
+                delivery['error'] = repr(error)
+                self.stats['failed'] += 1
+                self.dead_letters.append(delivery)
+            finally:
+                queue.task_done()
+
+    async def _deliver(self, sink, delivery: Dict):
+        channel, recipient = delivery['channel'], delivery['recipient']
+        now = self.time_fn()
+        bucket = self.buckets.get((channel, recipient))
+        if bucket is None:
+            bucket = self.buckets[(channel, recipient)] = TokenBucket(self.rate_per_second, self.burst, now)
+
+        if delivery['priority'] == PRIORITY_CRITICAL:
+            bucket.take(now)
+        elif not bucket.try_take(now):
+            # Acima do limite: volta para o digest quando houver token
+            self.stats['rate_limited'] += 1
+            self._schedule(bucket.wait_seconds(now), self._defer, delivery)
+            return
+
+        payload = self._payload(delivery)
+        try:
+            await sink.send(payload)
+        except Exception as error:
+            delivery['error'] = repr(error)
+            if delivery['attempt'] >= self.max_retries:
+                self.stats['failed'] += 1
+                self.dead_letters.append(delivery)
+            else:
+                self.stats['retried'] += 1
+                self._schedule(self.backoff_seconds * 2 ** delivery['attempt'], self._retry, delivery)
+            return
+
+        self.stats['delivered'] += 1
+        self.stats['coalesced'] += len(delivery['items']) - 1
+        self.latencies[delivery['priority']].append(self.time_fn() - delivery['created'])
+
+    def _payload(self, delivery: Dict) -> Dict:
+        items = delivery['items']
+        if len(items) == 1:
+            message = items[0]['message']
+        else:
+            message = f"{len(items)} notificações: " + '; '.join(item['message'] for item in items[:3])
+        return {
+            'channel': delivery['channel'],
+            'recipient': delivery['recipient'],
+            'priority': 'critical' if delivery['priority'] == PRIORITY_CRITICAL else 'normal',
+            'notification_ids': [item.get('notification_id') for item in items],
+            'digest': len(items) > 1,
+            'message': message,
+            'attempt': delivery['attempt']
+        }
+
+    def _schedule(self, delay: float, callback, delivery: Dict):
+        self._scheduled += 1
+
+        def run():
+            self._scheduled -= 1
+            callback(delivery)
+
+        asyncio.get_running_loop().call_later(delay, run)
+
+    def _retry(self, delivery: Dict):
+        self._enqueue(delivery['channel'], delivery['recipient'], delivery['items'], delivery['priority'],
+                      delivery['created'], delivery['attempt'] + 1)
+
+    def _defer(self, delivery: Dict):
+        # Junta com o que chegou enquanto esperava e envia como um digest só
+        key = (delivery['channel'], delivery['recipient'])
+        self.digests[key] = delivery['items'] + self.digests.get(key, [])
+        self.digest_created[key] = min(self.digest_created.get(key, delivery['created']), delivery['created'])
+        self._flush_digest(key)
+
+    async def drain(self):
+        """Espera esvaziar filas, digests, adiamentos e retentativas"""
+        while True:
+            self.flush_digests()
+            for queue in self.queues.values():
+                await queue.join()
+            if not self._scheduled and not self.digests:
+                return
+            await asyncio.sleep(min(self.backoff_seconds, 0.05))
+
+    async def stop(self):
+        """Cancela workers e timers"""
+        for timer in self._timers.values():
+            timer.cancel()
+        self._timers.clear()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+
+    def get_stats(self) -> Dict:
+        """Contadores e latência de entrega (ms) por prioridade"""
+        latency = {}
+        for priority, name in ((PRIORITY_CRITICAL, 'critical'), (PRIORITY_NORMAL, 'normal')):
+            values = sorted(self.latencies[priority])
+            if values:
+                latency[name] = {
+                    'count': len(values),
+                    'p50_ms': round(values[len(values) // 2] * 1000, 1),
+                    'max_ms': round(values[-1] * 1000, 1)
+                }
+        return dict(self.stats, dead_letters=len(self.dead_letters), latency=latency)
+
+
+if __name__ == "__main__":
+    import tempfile
+
+    print("📨 Telemetry - Notification Dispatcher Mock\n")
+    print("="*70)
+
+    def warning(index: int) -> Dict:
+        return {'notification_id': f'NOTIF-{index:03d}', 'type': 'action_required',
+                'channel': ['push', 'email'], 'recipients': ['operator', 'supervisor'],
+                'message': f'schedule_charge MICROBOT-{index:03d}'}
+
+    critical = {'notification_id': 'NOTIF-999', 'type': 'critical_alert',
+                'channel': ['sms', 'email', 'push'], 'recipients': ['operator', 'supervisor', 'maintenance_team'],
+                'message': '1 alerta(s) crítico(s) requer atenção imediata'}
+
+    async def main():
+        out_dir = Path(tempfile.mkdtemp())
+        sinks = {
+            'sms': FileSink(out_dir / 'sms.jsonl'),
+            'email': MemorySink(latency_seconds=0.010, fail_every=4),
+            'push': MemorySink(latency_seconds=0.005)
+        }
+        dispatcher = NotificationDispatcher(sinks, digest_seconds=0.2, digest_max_items=100,
+                                            rate_per_minute=600, burst=2, backoff_seconds=0.05)
+        await dispatcher.start()
+
+        # Rajada de 500 warnings e, logo atrás, um crítico
+        for index in range(500):
+            dispatcher.submit(warning(index))
+        dispatcher.submit(critical)
+        await dispatcher.drain()
+        stats = dispatcher.get_stats()
+        await dispatcher.stop()
+
+        print(f"\n📥 RAJADA: {stats['submitted']} notificações (500 warnings + 1 crítica)")
+        print(f"   Entregas: {stats['delivered']} | notificações absorvidas em digests: {stats['coalesced']}")
+        print(f"   Limitadas por taxa (reagrupadas): {stats['rate_limited']}")
+        print(f"   Retentativas: {stats['retried']} | falhas definitivas: {stats['failed']}")
+        latency = stats['latency']
+        print(f"\n⚡ LATÊNCIA:")
+        print(f"   Crítica: p50 {latency['critical']['p50_ms']} ms | máx {latency['critical']['max_ms']} ms")
+        print(f"   Digests: p50 {latency['normal']['p50_ms']} ms | máx {latency['normal']['max_ms']} ms")
+
+        digest = next(p for p in sinks['push'].delivered if p['digest'])
+        print(f"\n📦 DIGEST (push → {digest['recipient']}): {digest['message'][:70]}...")
+        lines = (out_dir / 'sms.jsonl').read_text(encoding='utf-8').splitlines()
+        print(f"📝 SMS em arquivo: {len(lines)} entregas ({', '.join(json.loads(l)['recipient'] for l in lines)})")
+
+        # AlertManager → dispatcher (submit síncrono, entrega nos workers)
+        from alert_manager_mock import AlertManager
+
+        data_file = Path(__file__).parent / "example_telemetry_data.json"
+        with open(data_file, 'r', encoding='utf-8') as f:
+            telemetry_data = json.load(f)
+        email = MemorySink()
+        dispatcher = NotificationDispatcher({'email': email, 'push': MemorySink(), 'sms': MemorySink()},
+                                            digest_seconds=0.05)
+        manager = AlertManager("TELEM-SESSION-20260220-154500", dispatcher=dispatcher)
+        await dispatcher.start()
+        result = manager.manage_alerts(telemetry_data)
+        await dispatcher.drain()
+        await dispatcher.stop()
+        print(f"\n🚨 ALERT MANAGER: {len(result['notifications'])} notificação(ões) → "
+              f"{[(p['recipient'], p['message']) for p in email.delivered]}")
+
+    asyncio.run(main())
+
+    print("\n" + "="*70)
+    print("✅ DESPACHO DE NOTIFICAÇÕES FUNCIONANDO")
+    print("="*70)
@@ -0,0 +1,564 @@
+#!/usr/bin/env python3
+"""
+Telemetry - Streaming Aggregator Mock
+
+Agregação incremental da frota: cada mensagem de telemetria de um robô
+retira a contribuição anterior dele e soma a nova, em O(campos) por
+mensagem, em vez de refazer listas e passes sobre a frota inteira a cada
+snapshot.
+
+Por campo numérico mantém contagem, soma e variância de Welford (com
+remoção); mínimos/máximos usam heaps preguiçosos (entradas antigas são
+descartadas só quando chegam ao topo). Por robô mantém estatísticas ao
+longo do tempo (média, desvio, mín, máx) de SOC, temperatura, potência e CPU.
+"""
+
+import heapq
+import math
+from operator import itemgetter
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# Atualizações entre recálculos completos das somas (limita erro de ponto flutuante das remoções)
+REBUILD_EVERY = 200000
+
+# Estatísticas por robô ao longo do tempo
+ROBOT_TIME_FIELDS = ('soc_percent', 'temperature_c', 'power_w', 'cpu_usage_percent')
+
+
+class RunningStats:
+    """Contagem, soma, média e variância (Welford) com inserção e remoção"""
+
+    __slots__ = ('count', 'total', 'mean', 'm2', 'minimum', 'maximum')
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.minimum = math.inf  # só inserção (estatísticas por robô)
+        self.maximum = -math.inf
+
+    def add(self, value: float):
+        self.count += 1
+        self.total += value
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        if value < self.minimum:
+            self.minimum = value
+        if value > self.maximum:
+            self.maximum = value
+
+    def remove(self, value: float):
+        """Retira um valor inserido antes (mín/máx não são mantidos na remoção)"""
+        self.count -= 1
+        if self.count <= 0:
+            self.count = 0
+            self.total = self.mean = self.m2 = 0.0
+            return
+        self.total -= value
+        delta = value - self.mean
+        self.mean -= delta / self.count
+        self.m2 = max(0.0, self.m2 - delta * (value - self.mean))
+
+    def average(self) -> float:
+        return self.total / self.count if self.count else 0
+
+    def variance(self) -> float:
+        return self.m2 / self.count if self.count else 0.0
+
+    def std(self) -> float:
+        return math.sqrt(self.variance())
+
+    def to_dict(self) -> Dict:
+        return {
+            'count': self.count,
+            'mean': round(self.mean, 3),
+            'std': round(self.std(), 3),
+            'min': self.minimum if self.count else None,
+            'max': self.maximum if self.count else None
+        }
+
+
+class LazyExtremum:
+    """Mínimo (ou máximo) por chave com heap preguiçoso: O(log n) por atualização"""
+
+    __slots__ = ('sign', '_heap', '_current', '_sequence')
+
+    def __init__(self, maximum: bool = False):
+        self.sign = -1 if maximum else 1
+        self._heap: List[Tuple[float, int, str]] = []
+        self._current: Dict[str, Tuple[Any, int]] = {}
+        self._sequence = 0
+
+    def set(self, key: str, value: Any):
+        """Define o valor atual da chave (None retira)"""
+        if value is None:
+            self._current.pop(key, None)
+        else:
+            self._sequence += 1
+            self._current[key] = (value, self._sequence)
+            heapq.heappush(self._heap, (self.sign * value, self._sequence, key))
+        # Reconstrói quando as entradas antigas dominam o heap
+        if len(self._heap) > 2 * len(self._current) + 64:
+            self._heap = [(self.sign * value, sequence, key) for key, (value, sequence) in self._current.items()]
+            heapq.heapify(self._heap)
+
+    def peek(self) -> Optional[Any]:
+        """Valor extremo atual (None se vazio)"""
+        heap = self._heap
+        while heap:
+            _, sequence, key = heap[0]
+            current = self._current.get(key)
+            if current is not None and current[1] == sequence:
+                return current[0]
+            heapq.heappop(heap)
+        return None
+
+
+# Campos numéricos (None = robô fora do grupo do campo) e categóricos, na ordem de `extract_contribution`
+NUMERIC_FIELDS = (
+    'lat', 'lon', 'speed_ms',
+    'soc_percent', 'temperature_c', 'power_w', 'charging', 'cycles', 'range_km',
+    'mission_active', 'progress_percent', 'area_covered_ha', 'area_remaining_ha',
+    'cpu_usage_percent', 'memory_usage_percent', 'uptime_hours', 'network_latency_ms',
+    'fleet_uptime_hours'
+)
+CATEGORY_FIELDS = ('type', 'health_status', 'fleet_mission_status', 'mission_status', 'soc_band')
+
+# Valores de ROBOT_TIME_FIELDS em uma tupla de NUMERIC_FIELDS
+robot_time_values = itemgetter(*(NUMERIC_FIELDS.index(name) for name in ROBOT_TIME_FIELDS))
+
+SOC_BANDS = ('critical_0_20', 'low_20_50', 'medium_50_80', 'high_80_100')
+
+# Extremos mantidos: nome → (campo, máximo?)
+EXTREMA = {
+    'min_soc': ('soc_percent', False),
+    'max_soc': ('soc_percent', True),
+    'max_temperature': ('temperature_c', True),
+    'max_cpu': ('cpu_usage_percent', True),
+    'max_memory': ('memory_usage_percent', True)
+}
+
+
+def soc_band(soc: float) -> str:
+    """Faixa da distribuição de SOC"""
+    if soc < 20:
+        return 'critical_0_20'
+    if soc < 50:
+        return 'low_20_50'
+    if soc < 80:
+        return 'medium_50_80'
+    return 'high_80_100'
+
+
+def extract_contribution(robot: Dict) -> Tuple[Tuple, Tuple]:
+    """
+    Contribuição de um robô para os agregados (mesmas regras de DataAggregator)
+
+    Única leitura dos blocos do registro: o agregador incremental, as
+    colunas do snapshot (FleetColumns) e as janelas (WindowAggregator)
+    partem destes valores.
+
+    Returns:
+        (valores de NUMERIC_FIELDS, valores de CATEGORY_FIELDS)
+    """
+    position = robot.get('position')
+    if position:
+        position_values = (position['lat'], position['lon'], position.get('speed_ms', 0))
+    else:
+        position_values = (None, None, None)
+
+    battery = robot.get('battery')
+    if battery:
+        soc = battery['soc_percent']
+        battery_values = (soc, battery['temperature_c'], abs(battery['voltage_v'] * battery['current_a']),
+                          1 if battery.get('charging', False) else 0,
+                          battery.get('cycles_count', 0), battery.get('estimated_range_km', 0))
+        band = soc_band(soc)
+    else:
+        battery_values = (None,) * 6
+        band = None
+
+    mission = robot.get('mission')
+    if mission:
+        active = bool(mission.get('mission_id'))
+        mission_values = (1 if active else 0, mission.get('progress_percent', 0) if active else None,
+                          mission.get('area_covered_ha', 0), mission.get('area_remaining_ha', 0))
+        mission_status = mission.get('status', 'idle')
+    else:
+        mission_values = (None,) * 4
+        mission_status = None
+
+    health = robot.get('health')
+    if health:
+        health_values = (health.get('cpu_usage_percent', 0), health.get('memory_usage_percent', 0),
+                         health.get('uptime_hours', 0), health.get('network_latency_ms', 0))
+    else:
+        health_values = (None,) * 4
+
+    # Uptime de todos os robôs (sem bloco health conta 0): base da eficiência das missões
+    fleet_uptime = robot.get('health', {}).get('uptime_hours', 0)
+
+    numeric = position_values + battery_values + mission_values + health_values + (fleet_uptime,)
+    categorical = (
+        robot['type'],
+        robot.get('health', {}).get('overall_status', 'unknown'),
+        robot.get('mission', {}).get('status', 'unknown'),
+        mission_status,
+        band
+    )
+    return numeric, categorical
+
+
+def _count(counts: Dict[Any, int], value: Any, delta: int):
+    """Ajusta o contador de uma categoria (remove a chave ao zerar)"""
+    if value is None:
+        return
+    total = counts.get(value, 0) + delta
+    if total:
+        counts[value] = total
+    else:
+        del counts[value]
+
+
+class FleetSections:
+    """
+    Seções no formato de DataAggregator (fleet, battery, mission, performance)
+
+    Regras escritas uma vez sobre agregados por campo de NUMERIC_FIELDS e
+    contagens de CATEGORY_FIELDS: StreamingFleetAggregator (estado
+    incremental) e FleetColumns (colunas de um snapshot) só dizem como
+    obter cada agregado.
+    """
+
+    def _robot_count(self) -> int:
+        raise NotImplementedError
+
+    def _field_count(self, field: str) -> int:
+        raise NotImplementedError
+
+    def _field_total(self, field: str) -> float:
+        raise NotImplementedError
+
+    def _field_average(self, field: str) -> float:
+        raise NotImplementedError
+
+    def _field_std(self, field: str) -> float:
+        raise NotImplementedError
+
+    def _field_min(self, field: str) -> Optional[float]:
+        raise NotImplementedError
+
+    def _field_max(self, field: str) -> Optional[float]:
+        raise NotImplementedError
+
+    def _category(self, name: str) -> Dict[Any, int]:
+        raise NotImplementedError
+
+    def fleet_metrics(self) -> Dict:
+        """Totais, distribuições, centróide e velocidade média"""
+        by_health = {'healthy': 0, 'warning': 0, 'critical': 0, 'unknown': 0}
+        by_health.update(self._category('health_status'))
+        return {
+            'total_robots': self._robot_count(),
+            'by_type': dict(self._category('type')),
+            'by_health': by_health,
+            'by_mission_status': dict(self._category('fleet_mission_status')),
+            'centroid': {'lat': self._field_average('lat'), 'lon': self._field_average('lon')},
+            'average_speed_ms': round(self._field_average('speed_ms'), 2)
+        }
+
+    def battery_metrics(self) -> Dict:
+        """SOC, temperatura, potência, carga e distribuição de SOC"""
+        if self._field_count('soc_percent') == 0:
+            return {}
+        bands = self._category('soc_band')
+        return {
+            'average_soc_percent': round(self._field_average('soc_percent'), 1),
+            'min_soc_percent': self._field_min('soc_percent'),
+            'max_soc_percent': self._field_max('soc_percent'),
+            'soc_std_percent': round(self._field_std('soc_percent'), 1),
+            'soc_distribution': {band: bands.get(band, 0) for band in SOC_BANDS},
+            'average_temperature_c': round(self._field_average('temperature_c'), 1),
+            'max_temperature_c': self._field_max('temperature_c'),
+            'temperature_std_c': round(self._field_std('temperature_c'), 1),
+            'total_power_consumption_kw': round(self._field_total('power_w') / 1000, 2),
+            'charging_count': int(round(self._field_total('charging'))),
+            'average_cycles': round(self._field_average('cycles'), 0),
+            'average_range_km': round(self._field_average('range_km'), 1)
+        }
+
+    def mission_metrics(self) -> Dict:
+        """Missões ativas, progresso, área e eficiência"""
+        active = int(round(self._field_total('mission_active')))
+        if active == 0:
+            return {
+                'active_missions': 0,
+                'idle_robots': self._robot_count(),
+                'total_area_covered_ha': 0,
+                'total_area_remaining_ha': 0
+            }
+        by_status = dict(self._category('mission_status'))
+        area_covered = self._field_total('area_covered_ha')
+        total_uptime = self._field_total('fleet_uptime_hours')
+        return {
+            'active_missions': active,
+            'idle_robots': by_status.get('idle', 0),
+            'average_progress_percent': round(self._field_average('progress_percent'), 1),
+            'total_area_covered_ha': round(area_covered, 2),
+            'total_area_remaining_ha': round(self._field_total('area_remaining_ha'), 2),
+            'by_status': by_status,
+            'efficiency_ha_per_hour': round(area_covered / total_uptime if total_uptime > 0 else 0, 2)
+        }
+
+    def performance_metrics(self) -> Dict:
+        """CPU, memória, uptime e latência"""
+        if self._field_count('cpu_usage_percent') == 0:
+            return {}
+        return {
+            'average_cpu_percent': round(self._field_average('cpu_usage_percent'), 1),
+            'max_cpu_percent': self._field_max('cpu_usage_percent'),
+            'average_memory_percent': round(self._field_average('memory_usage_percent'), 1),
+            'max_memory_percent': self._field_max('memory_usage_percent'),
+            'average_uptime_hours': round(self._field_average('uptime_hours'), 1),
+            'total_uptime_hours': round(self._field_total('uptime_hours'), 1),
+            'average_network_latency_ms': round(self._field_average('network_latency_ms'), 0)
+        }
+
+
+class StreamingFleetAggregator(FleetSections):
+    """Estado agregado da frota atualizado mensagem a mensagem"""
+
+    def __init__(self):
+        self.fields: Dict[str, RunningStats] = {}
+        self.categories: Dict[str, Dict[Any, int]] = {name: {} for name in CATEGORY_FIELDS}
+        self.extrema: Dict[str, LazyExtremum] = {name: LazyExtremum(maximum) for name, (_, maximum) in EXTREMA.items()}
+        self.robot_stats: Dict[str, Dict[str, RunningStats]] = {}
+        self._reset_fields()
+
+        # Mesmos objetos por posição (laço quente sem busca por nome)
+        self._counters = [self.categories[name] for name in CATEGORY_FIELDS]
+        self._extrema = [(NUMERIC_FIELDS.index(field), self.extrema[name]) for name, (field, _) in EXTREMA.items()]
+        self._extremum_by_field = {spec: self.extrema[name] for name, spec in EXTREMA.items()}
+
+        # Contribuição atual de cada robô: (numéricos, categóricos)
+        self._contributions: Dict[str, Tuple[Tuple, Tuple]] = {}
+        self.messages = 0
+        self.last_timestamp: Optional[str] = None
+        self._updates_since_rebuild = 0
+
+    def _reset_fields(self):
+        self.fields = {name: RunningStats() for name in NUMERIC_FIELDS}
+        self._stats = [self.fields[name] for name in NUMERIC_FIELDS]
+
+    def __len__(self) -> int:
+        return len(self._contributions)
+
+    def robot_ids(self) -> Iterable[str]:
+        return self._contributions.keys()
+
+    def ingest_message(self, robot: Dict, record_times: bool = True):
+        """
+        Aplica a telemetria de um robô (registro de `robots_telemetry`)
+
+        Só os campos que mudaram desde a mensagem anterior do robô são
+        retirados e somados de novo.
+
+        Args:
+            robot: Registro do robô
+            record_times: Soma a amostra às estatísticas no tempo do robô
+                          (False quando ela já foi registrada por `record_robot_times`)
+        """
+        robot_id = robot['robot_id']
+        numeric, categorical = extract_contribution(robot)
+        previous = self._contributions.get(robot_id)
+
+        if previous is None:
+            for stats, value in zip(self._stats, numeric):
+                if value is not None:
+                    stats.add(value)
+            for counts, value in zip(self._counters, categorical):
+                if value is not None:
+                    counts[value] = counts.get(value, 0) + 1
+            for index, extremum in self._extrema:
+                extremum.set(robot_id, numeric[index])
+        else:
+            old_numeric, old_categorical = previous
+            if old_numeric != numeric:
+                for stats, old, value in zip(self._stats, old_numeric, numeric):
+                    if old != value:
+                        if old is not None:
+                            stats.remove(old)
+                        if value is not None:
+                            stats.add(value)
+                for index, extremum in self._extrema:
+                    if old_numeric[index] != numeric[index]:
+                        extremum.set(robot_id, numeric[index])
+            if old_categorical != categorical:
+                for counts, old, value in zip(self._counters, old_categorical, categorical):
+                    if old != value:
+                        _count(counts, old, -1)
+                        _count(counts, value, 1)
+        self._contributions[robot_id] = (numeric, categorical)
+
+        self.messages += 1
+        self.last_timestamp = robot.get('timestamp', self.last_timestamp)
+
+        if record_times:
+            self._record_times(robot_id, robot_time_values(numeric))
+
+        self._updates_since_rebuild += 1
+        if self._updates_since_rebuild >= REBUILD_EVERY:
+            self.rebuild()
+
+    def _record_times(self, robot_id: str, values: Iterable[Optional[float]]):
+        history = self.robot_stats.get(robot_id)
+        if history is None:
+            history = self.robot_stats[robot_id] = {name: RunningStats() for name in ROBOT_TIME_FIELDS}
+        for name, value in zip(ROBOT_TIME_FIELDS, values):
+            if value is not None:
+                history[name].add(value)
+
+    def record_robot_times(self, robot_times: Iterable[Tuple]):
+        """
+        Soma um snapshot às estatísticas no tempo por robô
+
+        Args:
+            robot_times: (robot_id, *ROBOT_TIME_FIELDS) por robô (ver `FleetColumns.robot_times`)
+        """
+        for robot_id, *values in robot_times:
+            self._record_times(robot_id, values)
+
+    def remove_robot(self, robot_id: str):
+        """Retira o robô da frota (estatísticas no tempo são mantidas)"""
+        previous = self._contributions.pop(robot_id, None)
+        if previous is None:
+            return
+        numeric, categorical = previous
+        for stats, value in zip(self._stats, numeric):
+            if value is not None:
+                stats.remove(value)
+        for counts, value in zip(self._counters, categorical):
+            _count(counts, value, -1)
+        for _, extremum in self._extrema:
+            extremum.set(robot_id, None)
+
+    def rebuild(self):
+        """Recalcula somas e variâncias a partir das contribuições atuais"""
+        self._reset_fields()
+        for numeric, _ in self._contributions.values():
+            for stats, value in zip(self._stats, numeric):
+                if value is not None:
+                    stats.add(value)
+        self._updates_since_rebuild = 0
+
+    def sync_snapshot(self, robots: List[Dict], record_times: bool = True):
+        """Aplica um snapshot completo: ingere todos e retira robôs ausentes"""
+        present = set()
+        for robot in robots:
+            self.ingest_message(robot, record_times)
+            present.add(robot['robot_id'])
+        for robot_id in [robot_id for robot_id in self._contributions if robot_id not in present]:
+            self.remove_robot(robot_id)
+
+    # Agregados para FleetSections
+
+    def _robot_count(self) -> int:
+        return len(self._contributions)
+
+    def _field_count(self, field: str) -> int:
+        return self.fields[field].count
+
+    def _field_total(self, field: str) -> float:
+        return self.fields[field].total
+
+    def _field_average(self, field: str) -> float:
+        return self.fields[field].average()
+
+    def _field_std(self, field: str) -> float:
+        return self.fields[field].std()
+
+    def _field_min(self, field: str) -> Optional[float]:
+        return self._extremum_by_field[(field, False)].peek()
+
+    def _field_max(self, field: str) -> Optional[float]:
+        return self._extremum_by_field[(field, True)].peek()
+
+    def _category(self, name: str) -> Dict[Any, int]:
+        return self.categories[name]
+
+    def robot_summary(self, robot_id: str) -> Dict:
+        """Estatísticas no tempo de um robô (média, desvio, mín, máx por campo)"""
+        history = self.robot_stats.get(robot_id, {})
+        return {name: stats.to_dict() for name, stats in history.items()}
+
+
+if __name__ == "__main__":
+    import copy
+    import json
+    import random
+    import time
+    from pathlib import Path
+
+    from data_aggregator_mock import DataAggregator
+
+    print("🌊 Telemetry - Streaming Aggregator Mock\n")
+    print("="*70)
+
+    data_file = Path(__file__).parent / "example_telemetry_data.json"
+    with open(data_file, 'r', encoding='utf-8') as f:
+        telemetry_data = json.load(f)
+    templates = telemetry_data['robots_telemetry']
+
+    # Frota de 2000 robôs (réplicas do exemplo)
+    fleet = []
+    for index in range(2000):
+        robot = copy.deepcopy(templates[index % len(templates)])
+        robot['robot_id'] = f"{robot['robot_id']}-{index:04d}"
+        fleet.append(robot)
+
+    aggregator = DataAggregator("TELEM-SESSION-STREAM")
+    aggregator.aggregate_data(dict(telemetry_data, robots_telemetry=fleet))
+
+    # Mensagens individuais: 1 robô muda por vez
+    rng = random.Random(42)
+    messages = 20000
+    start = time.perf_counter()
+    for _ in range(messages):
+        robot = fleet[rng.randrange(len(fleet))]
+        battery = robot['battery']
+        battery['soc_percent'] = max(0.0, battery['soc_percent'] - rng.uniform(0, 0.5))
+        battery['temperature_c'] = battery['temperature_c'] + rng.uniform(-0.3, 0.4)
+        aggregator.ingest_message(robot)
+    stream_us = (time.perf_counter() - start) / messages * 1e6
+
+    start = time.perf_counter()
+    result = aggregator.aggregate_stream()
+    snapshot_us = (time.perf_counter() - start) * 1e6
+
+    # Referência: snapshot completo recalculado do zero
+    reference = DataAggregator("TELEM-SESSION-FULL")
+    start = time.perf_counter()
+    full = reference.aggregate_data(dict(telemetry_data, robots_telemetry=fleet))
+    full_ms = (time.perf_counter() - start) * 1000
+
+    print(f"\n📨 {messages:,} MENSAGENS ({len(fleet)} robôs):")
+    print(f"   {stream_us:.1f} µs/mensagem | resultado da frota em {snapshot_us:.0f} µs")
+    print(f"   Snapshot completo do zero: {full_ms:.1f} ms")
+
+    battery = result['battery']
+    same = all(abs(battery[key] - full['battery'][key]) < 1e-6
+               for key in ('average_soc_percent', 'max_temperature_c', 'min_soc_percent'))
+    print(f"\n🔋 SOC médio {battery['average_soc_percent']:.1f}% ± {battery['soc_std_percent']:.1f} "
+          f"(min {battery['min_soc_percent']:.1f}%) | temp máx {battery['max_temperature_c']:.1f}°C")
+    print(f"   Igual ao recálculo completo: {same}")
+
+    robot_id = fleet[0]['robot_id']
+    summary = aggregator.stream.robot_summary(robot_id)['soc_percent']
+    print(f"\n🤖 {robot_id}: {summary['count']} leituras | SOC médio {summary['mean']:.1f}% "
+          f"(mín {summary['min']:.1f}%, máx {summary['max']:.1f}%)")
+
+    print("\n" + "="*70)
+    print("✅ AGREGAÇÃO INCREMENTAL FUNCIONANDO")
+    print("="*70)
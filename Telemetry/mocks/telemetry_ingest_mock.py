@@ -0,0 +1,431 @@
+#!/usr/bin/env python3
+"""
+Telemetry - Telemetry Ingest Mock
+
+Ingestão por mensagem no formato MQTT: `fleet/{robot_id}/telemetry/#`.
+
+Tópicos aceitos:
+- `fleet/{robot_id}/telemetry`: registro completo (formato de `robots_telemetry`)
+- `fleet/{robot_id}/telemetry/{seção}`: envelope `{"timestamp", "data"[, "type"]}`
+  com a seção inteira (position, battery, mission, health, ...)
+- `fleet/{robot_id}/telemetry/{seção}/{campo}`: envelope com um campo de uma
+  seção já conhecida
+
+O transporte é plugável (qualquer objeto com `subscribe(filtro, callback)`);
+`LocalBroker` é o substituto em processo do Mosquitto/HiveMQ. O callback só
+enfileira em uma fila limitada com política de descarte ou coalescência
+(a mensagem mais nova do mesmo tópico substitui a pendente). `pump()`
+consome um micro-lote, monta o estado de cada robô e aplica uma única
+atualização por robô alterado no DataAggregator e no MetricsCollector.
+"""
+
+import asyncio
+import json
+from collections import OrderedDict, deque
+from typing import Callable, Dict, List, Optional, Tuple
+
+TOPIC_FILTER = 'fleet/+/telemetry/#'
+
+TELEMETRY_SECTIONS = ('position', 'battery', 'sensors', 'actuators', 'mission', 'health', 'alerts')
+
+# Campos numéricos obrigatórios por seção (lidos sem default pelo agregador e pelo coletor)
+REQUIRED_FIELDS = {
+    'position': ('lat', 'lon'),
+    'battery': ('soc_percent', 'temperature_c', 'voltage_v', 'current_a')
+}
+
+# Políticas da fila quando cheia
+COALESCE = 'coalesce'        # mesmo tópico substitui a pendente; tópico novo descarta o mais antigo
+DROP_OLDEST = 'drop_oldest'  # descarta a mensagem mais antiga
+DROP_NEWEST = 'drop_newest'  # recusa a mensagem nova
+QUEUE_POLICIES = (COALESCE, DROP_OLDEST, DROP_NEWEST)
+
+
+def valid_section(section: str, data) -> bool:
+    """Seção no formato de `robots_telemetry` (alerts é lista; demais, dict com os campos obrigatórios)"""
+    if section == 'alerts':
+        return isinstance(data, list)
+    if not isinstance(data, dict):
+        return False
+    for field in REQUIRED_FIELDS.get(section, ()):
+        value = data.get(field)
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            return False
+    return True
+
+
+def topic_matches(topic_filter: str, topic: str) -> bool:
+    """Casamento de tópico MQTT (`+` um nível, `#` o resto, inclusive o nível pai)"""
+    filter_levels = topic_filter.split('/')
+    topic_levels = topic.split('/')
+    for index, level in enumerate(filter_levels):
+        if level == '#':
+            return True
+        if index >= len(topic_levels):
+            return False
+        if level != '+' and level != topic_levels[index]:
+            return False
+    return len(filter_levels) == len(topic_levels)
+
+
+class LocalBroker:
+    """Broker em processo: entrega síncrona aos assinantes cujo filtro casa"""
+
+    def __init__(self):
+        self.subscriptions: List[Tuple[str, Callable]] = []
+        # tópico → callbacks (invalidado a cada subscribe)
+        self._routes: Dict[str, List[Callable]] = {}
+        self.published = 0
+
+    def subscribe(self, topic_filter: str, callback: Callable[[str, object], None]):
+        self.subscriptions.append((topic_filter, callback))
+        self._routes.clear()
+
+    def publish(self, topic: str, payload) -> int:
+        """
+        Publica uma mensagem
+
+        Returns:
+            Assinantes que receberam
+        """
+        self.published += 1
+        callbacks = self._routes.get(topic)
+        if callbacks is None:
+            callbacks = self._routes[topic] = [callback for topic_filter, callback in self.subscriptions
+                                               if topic_matches(topic_filter, topic)]
+        for callback in callbacks:
+            callback(topic, payload)
+        return len(callbacks)
+
+
+class BoundedQueue:
+    """Fila limitada com política de descarte ou coalescência por chave"""
+
+    def __init__(self, max_size: int = 10000, policy: str = COALESCE):
+        if policy not in QUEUE_POLICIES:
+            raise ValueError(f"Política inválida: {policy} (use {', '.join(QUEUE_POLICIES)})")
+        self.max_size = max_size
+        self.policy = policy
+        self._items = OrderedDict() if policy == COALESCE else deque()
+        self.accepted = 0
+        self.coalesced = 0
+        self.dropped = 0
+        self.high_watermark = 0
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def put(self, key, item) -> bool:
+        """Enfileira; False se a mensagem foi recusada (drop_newest)"""
+        items = self._items
+        if self.policy == COALESCE:
+            if key in items:
+                # Substitui a pendente e vai para o fim (ordem entre tópicos preservada)
+                items[key] = item
+                items.move_to_end(key)
+                self.coalesced += 1
+                return True
+            if len(items) >= self.max_size:
+                items.popitem(last=False)
+                self.dropped += 1
+            items[key] = item
+        elif len(items) >= self.max_size:
+            if self.policy == DROP_NEWEST:
+                self.dropped += 1
+                return False
+            items.popleft()
+            self.dropped += 1
+            items.append(item)
+        else:
+            items.append(item)
+        self.accepted += 1
+        if len(items) > self.high_watermark:
+            self.high_watermark = len(items)
+        return True
+
+    def pop_batch(self, max_items: int) -> List:
+        """Retira até `max_items` na ordem de chegada"""
+        items = self._items
+        count = min(max_items, len(items))
+        if self.policy == COALESCE:
+            popitem = items.popitem
+            return [popitem(last=False)[1] for _ in range(count)]
+        popleft = items.popleft
+        return [popleft() for _ in range(count)]
+
+    def get_stats(self) -> Dict:
+        return {
+            'policy': self.policy,
+            'depth': len(self._items),
+            'high_watermark': self.high_watermark,
+            'accepted': self.accepted,
+            'coalesced': self.coalesced,
+            'dropped': self.dropped
+        }
+
+
+class TelemetryIngest:
+    """Front end de ingestão: transporte → fila limitada → micro-lotes → coletor/agregador"""
+
+    def __init__(self, transport, collector=None, aggregator=None, queue_size: int = 10000,
+                 policy: str = COALESCE, batch_size: int = 1000, topic_filter: str = TOPIC_FILTER):
+        """
+        Args:
+            transport: Objeto com `subscribe(filtro, callback)` (ex.: LocalBroker)
+            collector: MetricsCollector (usa `ingest_message`)
+            aggregator: DataAggregator (usa `ingest_message`)
+            queue_size: Capacidade da fila
+            policy: 'coalesce', 'drop_oldest' ou 'drop_newest'
+            batch_size: Mensagens por micro-lote
+            topic_filter: Filtro assinado no transporte
+        """
+        self.collector = collector
+        self.aggregator = aggregator
+        self.batch_size = batch_size
+        self.queue = BoundedQueue(queue_size, policy)
+
+        # robot_id → registro montado (formato de `robots_telemetry`)
+        self.robots: Dict[str, Dict] = {}
+        self.last_timestamp: Optional[str] = None
+
+        self.received = 0
+        self.malformed = 0
+        self.incomplete = 0
+        self.update_errors = 0
+        self.batches = 0
+        self.robot_updates = 0
+
+        transport.subscribe(topic_filter, self.on_message)
+
+    def on_message(self, topic: str, payload):
+        """Callback do transporte: valida o tópico e enfileira (O(1))"""
+        self.received += 1
+        levels = topic.split('/')
+        if len(levels) < 3 or levels[0] != 'fleet' or levels[2] != 'telemetry':
+            self.malformed += 1
+            return
+        if isinstance(payload, (bytes, str)):
+            try:
+                payload = json.loads(payload)
+            except ValueError:
+                self.malformed += 1
+                return
+        if not isinstance(payload, dict):
+            self.malformed += 1
+            return
+        self.queue.put(topic, (levels, payload))
+
+    def pump(self) -> int:
+        """
+        Processa um micro-lote
+
+        Returns:
+            Mensagens consumidas da fila
+        """
+        batch = self.queue.pop_batch(self.batch_size)
+        if not batch:
+            return 0
+        changed: Dict[str, Dict] = {}
+        for levels, payload in batch:
+            record = self._apply(levels, payload)
+            if record is not None:
+                changed[record['robot_id']] = record
+
+        # Uma atualização por robô alterado no lote; falha de um não perde o lote
+        for record in changed.values():
+            try:
+                if self.aggregator is not None:
+                    self.aggregator.ingest_message(record)
+                if self.collector is not None:
+                    self.collector.ingest_message(record)
+            except Exception:
+                self.update_errors += 1
+
+        self.batches += 1
+        self.robot_updates += len(changed)
+        return len(batch)
+
+    def _apply(self, levels: List[str], payload: Dict) -> Optional[Dict]:
+        """Aplica uma mensagem ao registro do robô"""
+        robot_id = levels[1]
+        if len(levels) == 3:
+            if not all(valid_section(section, payload[section]) for section in TELEMETRY_SECTIONS
+                       if section in payload):
+                self.malformed += 1
+                return None
+            record = dict(payload)
+            record['robot_id'] = robot_id
+            record.setdefault('type', 'unknown')
+            record.setdefault('alerts', [])
+            self.robots[robot_id] = record
+        else:
+            if 'timestamp' not in payload or 'data' not in payload:
+                self.malformed += 1
+                return None
+            section = levels[3]
+            record = self.robots.get(robot_id)
+            if len(levels) > 4:
+                # Campo avulso: só de uma seção já recebida inteira
+                if record is None or not isinstance(record.get(section), dict):
+                    self.incomplete += 1
+                    return None
+                data = dict(record[section], **{levels[4]: payload['data']})
+                if not valid_section(section, data):
+                    self.malformed += 1
+                    return None
+                record[section] = data
+            else:
+                if section not in TELEMETRY_SECTIONS or not valid_section(section, payload['data']):
+                    self.malformed += 1
+                    return None
+                if record is None:
+                    record = self.robots[robot_id] = {'robot_id': robot_id, 'type': 'unknown', 'alerts': []}
+                record[section] = payload['data']
+            if 'type' in payload:
+                record['type'] = payload['type']
+            record['timestamp'] = payload['timestamp']
+
+        if 'timestamp' not in record:
+            self.incomplete += 1
+            return None
+        self.last_timestamp = record['timestamp']
+        return record
+
+    async def run(self, stop: asyncio.Event, interval_seconds: float = 0.05):
+        """Consome micro-lotes até `stop`; com fila vazia espera `interval_seconds`"""
+        while not stop.is_set():
+            if self.pump():
+                await asyncio.sleep(0)
+            else:
+                await asyncio.sleep(interval_seconds)
+        while self.pump():
+            pass
+
+    def snapshot(self) -> Dict:
+        """Estado montado no formato de `telemetry_data` (collect_metrics, manage_alerts)"""
+        return {
+            'timestamp': self.last_timestamp,
+            'robots_telemetry': list(self.robots.values())
+        }
+
+    def get_stats(self) -> Dict:
+        """Mensagens recebidas, descartadas, lotes, atualizações por robô e falhas delas"""
+        return {
+            'received': self.received,
+            'malformed': self.malformed,
+            'incomplete': self.incomplete,
+            'update_errors': self.update_errors,
+            'batches': self.batches,
+            'robot_updates': self.robot_updates,
+            'robots': len(self.robots),
+            'queue': self.queue.get_stats()
+        }
+
+
+if __name__ == "__main__":
+    import copy
+    import time
+    from pathlib import Path
+
+    from data_aggregator_mock import DataAggregator
+    from metrics_collector_mock import MetricsCollector
+
+    print("📡 Telemetry - Telemetry Ingest Mock\n")
+    print("="*70)
+
+    data_file = Path(__file__).parent / "example_telemetry_data.json"
+    with open(data_file, 'r', encoding='utf-8') as f:
+        telemetry_data = json.load(f)
+    templates = telemetry_data['robots_telemetry']
+
+    # 1. Registros completos do exemplo → mesmo resultado do snapshot
+    broker = LocalBroker()
+    aggregator = DataAggregator("TELEM-SESSION-20260220-154500")
+    ingest = TelemetryIngest(broker, aggregator=aggregator)
+    for robot in templates:
+        broker.publish(f"fleet/{robot['robot_id']}/telemetry", json.dumps(robot))
+    broker.publish("fleet/MICROBOT-001/status", b'{}')
+    ingest.pump()
+    streamed = aggregator.aggregate_stream()
+    reference = DataAggregator("REF").aggregate_data(telemetry_data)
+    print(f"\n📥 EXEMPLO: {ingest.get_stats()['robots']} robôs via broker | "
+          f"tópico fora do filtro ignorado: {broker.published - ingest.received} msg")
+    print(f"   Bateria igual ao snapshot: {streamed['battery'] == reference['battery']}")
+
+    # 2. Frota de 1000 robôs: posição 10 Hz, bateria/saúde/missão 1 Hz, por 5 s
+    robots = []
+    for index in range(1000):
+        robot = copy.deepcopy(templates[index % len(templates)])
+        robot['robot_id'] = f"{robot['robot_id']}-{index:04d}"
+        robots.append(robot)
+
+    messages = []
+    for tick in range(50):
+        timestamp = f"2026-02-20T15:46:{tick // 10:02d}.{(tick % 10) * 100:03d}Z"
+        for robot in robots:
+            sections = ['position'] + (['battery', 'health', 'mission'] if tick % 10 == 0 else [])
+            for section in sections:
+                if section not in robot:
+                    continue
+                data = robot[section]
+                if section == 'position':
+                    data = dict(data, lat=data['lat'] + tick * 1e-6)
+                envelope = {'timestamp': timestamp, 'type': robot['type'], 'data': data}
+                messages.append((f"fleet/{robot['robot_id']}/telemetry/{section}", json.dumps(envelope)))
+
+    broker = LocalBroker()
+    aggregator = DataAggregator("TELEM-SESSION-20260220-154600")
+    collector = MetricsCollector("TELEM-SESSION-20260220-154600")
+    ingest = TelemetryIngest(broker, collector=collector, aggregator=aggregator, batch_size=1000)
+    publish = broker.publish
+    start = time.perf_counter()
+    for count, (topic, payload) in enumerate(messages, 1):
+        publish(topic, payload)
+        if count % 1000 == 0:
+            ingest.pump()
+    while ingest.pump():
+        pass
+    elapsed = time.perf_counter() - start
+    stats = ingest.get_stats()
+    print(f"\n🐝 FROTA DE {stats['robots']:,} ROBÔS (posição 10 Hz + bateria/saúde/missão 1 Hz, 5 s):")
+    print(f"   Mensagens: {len(messages):,} em {elapsed:.2f}s → {len(messages) / elapsed:,.0f} msg/s em 1 core")
+    print(f"   Micro-lotes: {stats['batches']} | atualizações por robô: {stats['robot_updates']:,}")
+    print(f"   Fila: pico {stats['queue']['high_watermark']} | coalescidas {stats['queue']['coalesced']} | "
+          f"descartadas {stats['queue']['dropped']}")
+    fleet = aggregator.aggregate_stream()['fleet']
+    print(f"   Agregado: {fleet['total_robots']} robôs | velocidade média {fleet['average_speed_ms']} m/s")
+
+    # 3. Backpressure: 5 ticks de posição (5000 msgs) com consumidor parado, fila de 2000
+    burst = [message for message in messages if message[0].endswith('/position')][1000:6000]
+    print(f"\n🚧 BACKPRESSURE: {len(burst)} msgs com consumidor parado (fila de 2000)")
+    for policy in QUEUE_POLICIES:
+        broker = LocalBroker()
+        ingest = TelemetryIngest(broker, queue_size=2000, policy=policy)
+        for topic, payload in burst:
+            broker.publish(topic, payload)
+        queue = ingest.get_stats()['queue']
+        print(f"   {policy:<12} fila {queue['depth']:>5} | coalescidas {queue['coalesced']:>5} | "
+              f"descartadas {queue['dropped']:>5}")
+
+    # 4. Loop assíncrono com o produtor no mesmo event loop
+    async def main():
+        broker = LocalBroker()
+        aggregator = DataAggregator("TELEM-SESSION-20260220-154700")
+        ingest = TelemetryIngest(broker, aggregator=aggregator, queue_size=2000, batch_size=500)
+        stop = asyncio.Event()
+        consumer = asyncio.create_task(ingest.run(stop, interval_seconds=0.01))
+        for count, (topic, payload) in enumerate(messages[:20000], 1):
+            broker.publish(topic, payload)
+            if count % 500 == 0:
+                await asyncio.sleep(0)
+        stop.set()
+        await consumer
+        return ingest.get_stats()
+
+    stats = asyncio.run(main())
+    print(f"\n🔄 ASYNC: {stats['received']:,} recebidas | {stats['batches']} lotes | "
+          f"descartadas {stats['queue']['dropped']} | fila final {stats['queue']['depth']}")
+
+    print("\n" + "="*70)
+    print("✅ INGESTÃO DE TELEMETRIA FUNCIONANDO")
+    print("="*70)
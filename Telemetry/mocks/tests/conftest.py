@@ -0,0 +1,6 @@
+"""Mocks se importam pelo nome do módulo (como nos demos executados da pasta mocks)"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
@@ -0,0 +1,81 @@
+"""Testes do DataAggregator"""
+
+import copy
+import json
+from pathlib import Path
+
+import pytest
+
+from data_aggregator_mock import DataAggregator
+from fleet_columns_mock import FleetColumns
+from window_aggregator_mock import WINDOW_METRICS, robot_window_values
+
+DATA_FILE = Path(__file__).resolve().parent.parent / "example_telemetry_data.json"
+
+
+@pytest.fixture
+def telemetry_data():
+    with open(DATA_FILE, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _snapshots(telemetry_data, count):
+    """Snapshots com SOC caindo 1 ponto por snapshot"""
+    snapshots = []
+    for index in range(count):
+        snapshot = copy.deepcopy(telemetry_data)
+        for robot in snapshot['robots_telemetry']:
+            if robot.get('battery'):
+                robot['battery']['soc_percent'] -= index
+        snapshots.append(snapshot)
+    return snapshots
+
+
+class TestRobotTimeStats:
+    """Estatísticas no tempo por robô com snapshots e mensagens"""
+
+    def test_every_snapshot_is_counted(self, telemetry_data):
+        aggregator = DataAggregator("TEST")
+        for snapshot in _snapshots(telemetry_data, 5):
+            aggregator.aggregate_data(snapshot)
+
+        robot = telemetry_data['robots_telemetry'][0]
+        stats = aggregator.stream.robot_stats[robot['robot_id']]['soc_percent']
+        assert stats.count == 5
+        assert stats.minimum == pytest.approx(robot['battery']['soc_percent'] - 4)
+        assert stats.maximum == pytest.approx(robot['battery']['soc_percent'])
+
+    def test_stream_sync_does_not_count_snapshot_twice(self, telemetry_data):
+        aggregator = DataAggregator("TEST")
+        for snapshot in _snapshots(telemetry_data, 5):
+            aggregator.aggregate_data(snapshot)
+        aggregator.aggregate_stream()
+
+        robot = copy.deepcopy(telemetry_data['robots_telemetry'][0])
+        aggregator.ingest_message(robot)
+        assert aggregator.stream.robot_stats[robot['robot_id']]['soc_percent'].count == 6
+
+
+class TestSnapshotMatchesStream:
+    """Colunas do snapshot e agregador incremental montam as mesmas seções"""
+
+    def test_sections_match(self, telemetry_data):
+        robots = telemetry_data['robots_telemetry']
+        del robots[0]['health']['cpu_usage_percent']
+        robots[1].pop('battery', None)
+        aggregator = DataAggregator("TEST")
+        snapshot = aggregator.aggregate_data(telemetry_data)
+        stream = aggregator.aggregate_stream()
+
+        for section in ('fleet', 'battery', 'mission', 'performance'):
+            assert snapshot[section] == stream[section]
+
+    def test_window_values_match_robot_times(self, telemetry_data):
+        robots = telemetry_data['robots_telemetry']
+        del robots[0]['health']['cpu_usage_percent']
+        columns = FleetColumns.from_robots(robots)
+
+        for robot, (robot_id, *values) in zip(robots, columns.robot_times):
+            assert robot_id == robot['robot_id']
+            expected = {metric: value for metric, value in zip(WINDOW_METRICS, values) if value is not None}
+            assert robot_window_values(robot) == expected
@@ -0,0 +1,71 @@
+"""Testes do NotificationDispatcher"""
+
+import asyncio
+
+from notification_dispatcher_mock import MemorySink, NotificationDispatcher
+
+
+class BrokenSink:
+    """Sink cujos primeiros `failures` envios falham com OSError"""
+
+    def __init__(self, failures: int):
+        self.failures = failures
+        self.delivered = []
+
+    async def send(self, payload):
+        if self.failures:
+            self.failures -= 1
+            raise OSError(28, 'No space left on device')
+        self.delivered.append(payload)
+
+
+def _critical(notification_id):
+    return {
+        'notification_id': notification_id,
+        'type': 'critical_alert',
+        'channel': ['email'],
+        'recipients': ['ops@canaswarm.example'],
+        'message': 'bateria crítica'
+    }
+
+
+async def _dispatch(dispatcher, notifications):
+    await dispatcher.start()
+    for notification in notifications:
+        dispatcher.submit(notification)
+    try:
+        await asyncio.wait_for(dispatcher.drain(), timeout=5)
+    finally:
+        await dispatcher.stop()
+
+
+class TestSinkFailures:
+    """Exceções do sink não derrubam o worker"""
+
+    def test_os_error_is_retried(self):
+        sink = BrokenSink(failures=2)
+        dispatcher = NotificationDispatcher({'email': sink}, workers={'email': 1}, backoff_seconds=0.01)
+        asyncio.run(_dispatch(dispatcher, [_critical('N-1')]))
+
+        assert len(sink.delivered) == 1
+        assert dispatcher.stats['retried'] == 2
+        assert not dispatcher.dead_letters
+
+    def test_exhausted_retries_go_to_dead_letters(self):
+        sink = BrokenSink(failures=100)
+        dispatcher = NotificationDispatcher({'email': sink}, workers={'email': 1},
+                                            max_retries=2, backoff_seconds=0.01)
+        asyncio.run(_dispatch(dispatcher, [_critical('N-1'), _critical('N-2')]))
+
+        assert dispatcher.stats['failed'] == 2
+        assert [delivery['items'][0]['notification_id'] for delivery in dispatcher.dead_letters] == ['N-1', 'N-2']
+        assert 'OSError' in dispatcher.dead_letters[0]['error']
+
+    def test_worker_keeps_running_after_failure(self):
+        sink = BrokenSink(failures=1)
+        dispatcher = NotificationDispatcher({'email': sink, 'sms': MemorySink()}, workers={'email': 1},
+                                            max_retries=0, backoff_seconds=0.01)
+        asyncio.run(_dispatch(dispatcher, [_critical('N-1'), _critical('N-2')]))
+
+        assert len(dispatcher.dead_letters) == 1
+        assert [payload['notification_ids'] for payload in sink.delivered] == [['N-2']]
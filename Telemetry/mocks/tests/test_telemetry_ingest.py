@@ -0,0 +1,73 @@
+"""Testes do TelemetryIngest"""
+
+from data_aggregator_mock import DataAggregator
+from metrics_collector_mock import MetricsCollector
+from telemetry_ingest_mock import LocalBroker, TelemetryIngest
+
+TIMESTAMP = '2026-02-20T15:45:00Z'
+
+
+def _battery(soc):
+    return {'soc_percent': soc, 'voltage_v': 48.0, 'current_a': -10.0, 'temperature_c': 30.0}
+
+
+def _ingest():
+    broker = LocalBroker()
+    aggregator = DataAggregator("TEST")
+    ingest = TelemetryIngest(broker, collector=MetricsCollector("TEST"), aggregator=aggregator)
+    return broker, ingest, aggregator
+
+
+def _section(broker, robot_id, section, data):
+    broker.publish(f'fleet/{robot_id}/telemetry/{section}',
+                   {'timestamp': TIMESTAMP, 'type': 'harvester', 'data': data})
+
+
+class TestPartialSections:
+    """Seção sem campo obrigatório é descartada sem perder o resto do lote"""
+
+    def test_partial_battery_is_malformed(self):
+        broker, ingest, aggregator = _ingest()
+        _section(broker, 'MICROBOT-001', 'battery', _battery(80.0))
+        _section(broker, 'MICROBOT-002', 'battery', {'soc_percent': 40})
+        _section(broker, 'MICROBOT-003', 'battery', _battery(60.0))
+
+        assert ingest.pump() == 3
+        assert ingest.malformed == 1
+        assert ingest.update_errors == 0
+        assert set(aggregator.stream.robot_ids()) == {'MICROBOT-001', 'MICROBOT-003'}
+
+    def test_invalid_field_keeps_previous_section(self):
+        broker, ingest, aggregator = _ingest()
+        _section(broker, 'MICROBOT-001', 'battery', _battery(80.0))
+        ingest.pump()
+        broker.publish('fleet/MICROBOT-001/telemetry/battery/soc_percent', {'timestamp': TIMESTAMP, 'data': 'n/a'})
+        ingest.pump()
+
+        assert ingest.malformed == 1
+        assert ingest.robots['MICROBOT-001']['battery']['soc_percent'] == 80.0
+
+    def test_full_record_with_partial_section_is_malformed(self):
+        broker, ingest, _ = _ingest()
+        broker.publish('fleet/MICROBOT-001/telemetry',
+                       {'timestamp': TIMESTAMP, 'type': 'harvester', 'position': {'lat': -22.72}})
+        ingest.pump()
+
+        assert ingest.malformed == 1
+        assert 'MICROBOT-001' not in ingest.robots
+
+    def test_downstream_failure_is_isolated(self):
+        broker, ingest, aggregator = _ingest()
+
+        class FailingCollector:
+            def ingest_message(self, record):
+                if record['robot_id'] == 'MICROBOT-002':
+                    raise RuntimeError('coletor indisponível')
+
+        ingest.collector = FailingCollector()
+        for index in range(1, 4):
+            _section(broker, f'MICROBOT-00{index}', 'battery', _battery(50.0 + index))
+        ingest.pump()
+
+        assert ingest.update_errors == 1
+        assert len(aggregator.stream) == 3
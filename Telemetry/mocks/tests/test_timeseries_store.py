@@ -0,0 +1,56 @@
+"""Testes do TimeSeriesStore"""
+
+import os
+
+from timeseries_store_mock import TimeSeriesStore
+
+BASE = 1771602300  # 2026-02-20T15:45:00Z
+
+
+def _segment_files(directory):
+    return sorted(os.path.join(directory, name) for name in os.listdir(directory))
+
+
+class TestCrashRecovery:
+    """Cauda truncada por gravação interrompida"""
+
+    def test_append_after_truncated_tail(self, tmp_path):
+        directory = str(tmp_path)
+        store = TimeSeriesStore(directory, chunk_points=10)
+        for i in range(30):
+            store.append('MICROBOT-001', 'soc_percent', BASE + i, 80.0 - i * 0.25)
+        store.close()
+
+        # Interrupção no meio do último chunk
+        segment = _segment_files(directory)[-1]
+        with open(segment, 'r+b') as f:
+            f.truncate(os.path.getsize(segment) - 3)
+
+        store = TimeSeriesStore(directory, chunk_points=10)
+        assert store.truncated_bytes > 0
+        for i in range(30, 50):
+            store.append('MICROBOT-001', 'soc_percent', BASE + i, 80.0 - i * 0.25)
+        store.close()
+
+        store = TimeSeriesStore(directory, chunk_points=10)
+        times, values = store.query('MICROBOT-001', 'soc_percent', BASE, BASE + 100)
+        store.close()
+
+        # Chunk interrompido (pontos 20-29) perdido; os demais intactos e na ordem
+        expected = list(range(20)) + list(range(30, 50))
+        assert times == [BASE + i for i in expected]
+        assert values == [80.0 - i * 0.25 for i in expected]
+
+    def test_intact_segment_is_not_truncated(self, tmp_path):
+        directory = str(tmp_path)
+        store = TimeSeriesStore(directory, chunk_points=10)
+        for i in range(25):
+            store.append('MICROBOT-001', 'soc_percent', BASE + i, float(i))
+        store.close()
+        size = os.path.getsize(_segment_files(directory)[-1])
+
+        store = TimeSeriesStore(directory, chunk_points=10)
+        assert store.truncated_bytes == 0
+        assert store.query('MICROBOT-001', 'soc_percent', BASE, BASE + 100)[1] == [float(i) for i in range(25)]
+        store.close()
+        assert os.path.getsize(_segment_files(directory)[-1]) == size
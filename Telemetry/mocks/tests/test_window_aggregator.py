@@ -0,0 +1,57 @@
+"""Testes do WindowAggregator"""
+
+import pytest
+
+from window_aggregator_mock import WindowAggregator
+
+BASE = 1771599600  # 2026-02-20T15:00:00Z (início de hora)
+
+
+def _readings(clock_offset, seconds, value):
+    """Uma leitura de SOC por segundo, com o relógio do coletor deslocado"""
+    return [(BASE + clock_offset + t, value(t)) for t in range(seconds)]
+
+
+def _feed(aggregator, readings):
+    for timestamp, soc in readings:
+        aggregator.add({'soc_percent': soc}, timestamp)
+
+
+def _hour_summary(aggregator):
+    hours = dict(aggregator.tumbling('1h'))
+    return hours[BASE]['soc_percent'].summary()
+
+
+class TestShardMerge:
+    """Shards com relógios defasados somam igual ao agregador único"""
+
+    @pytest.fixture
+    def readings(self):
+        # Shard A já passou da hora BASE; B tem o relógio 20 min atrasado e ainda está nela
+        ahead = _readings(0, 4800, lambda t: 20.0 + (t % 31))
+        behind = _readings(-1200, 4000, lambda t: 10.0 + (t % 41))
+        return ahead, behind
+
+    @pytest.mark.parametrize('receiver', ['ahead', 'behind'])
+    def test_skewed_clocks(self, readings, receiver):
+        ahead, behind = readings
+        single = WindowAggregator()
+        _feed(single, sorted(ahead + behind))
+        shard_ahead, shard_behind = WindowAggregator(), WindowAggregator()
+        _feed(shard_ahead, ahead)
+        _feed(shard_behind, behind)
+
+        if receiver == 'ahead':
+            merged = shard_ahead
+            merged.merge(shard_behind)
+        else:
+            merged = shard_behind
+            merged.merge(shard_ahead)
+
+        expected = _hour_summary(single)
+        result = _hour_summary(merged)
+        assert result['count'] == expected['count'] == 3600 + 2800
+        assert result['min'] == expected['min'] == 10.0
+        assert result['max'] == expected['max'] == 50.0
+        assert result['mean'] == pytest.approx(expected['mean'])
+        assert merged.summary() == single.summary()
@@ -0,0 +1,480 @@
+#!/usr/bin/env python3
+"""
+Telemetry - Window Aggregator Mock
+
+Agregações por janela de tempo (tumbling e sliding; default 1 min, 15 min
+e 1 h) de SOC, temperatura, potência e CPU, com percentis p50/p95/p99.
+
+Médias escondem a bateria quente e o robô lento; os percentis vêm de um
+sketch de quantis no estilo DDSketch (erro relativo garantido, buckets
+logarítmicos), que é mesclável: janelas se formam somando panes de 10 s, e
+resultados de coletores diferentes (shards) se somam sem perder precisão.
+"""
+
+import math
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from history_store_mock import Timestamp, to_epoch
+from streaming_aggregator_mock import ROBOT_TIME_FIELDS, extract_contribution, robot_time_values
+
+# Janelas default: nome → segundos
+DEFAULT_WINDOWS = {'1m': 60, '15m': 900, '1h': 3600}
+
+# Métricas agregadas por janela (valores por robô, as mesmas das estatísticas no tempo)
+WINDOW_METRICS = ROBOT_TIME_FIELDS
+
+PERCENTILES = (0.50, 0.95, 0.99)
+
+
+class QuantileSketch:
+    """
+    Sketch de quantis com erro relativo limitado (estilo DDSketch)
+
+    Cada valor cai no bucket ceil(log_gamma(|v|)); o quantil devolvido fica a
+    no máximo `relative_accuracy` do valor real. Dois sketches com a mesma
+    precisão se mesclam somando os buckets.
+    """
+
+    __slots__ = ('relative_accuracy', 'gamma', '_log_gamma', 'max_bins',
+                 'positive', 'negative', 'zero_count', 'count', 'minimum', 'maximum')
+
+    def __init__(self, relative_accuracy: float = 0.01, max_bins: int = 2048):
+        """
+        Args:
+            relative_accuracy: Erro relativo máximo dos quantis (0.01 = 1%)
+            max_bins: Buckets por sinal antes de colapsar os menores
+        """
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("relative_accuracy deve estar entre 0 e 1")
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.max_bins = max_bins
+        self.positive: Dict[int, int] = {}
+        self.negative: Dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+        self.minimum = math.inf
+        self.maximum = -math.inf
+
+    def add(self, value: float, weight: int = 1):
+        """Adiciona um valor (com peso)"""
+        self.count += weight
+        if value < self.minimum:
+            self.minimum = value
+        if value > self.maximum:
+            self.maximum = value
+        if value > 0:
+            bins = self.positive
+            key = math.ceil(math.log(value) / self._log_gamma)
+        elif value < 0:
+            bins = self.negative
+            key = math.ceil(math.log(-value) / self._log_gamma)
+        else:
+            self.zero_count += weight
+            return
+        bins[key] = bins.get(key, 0) + weight
+        if len(bins) > self.max_bins:
+            self._collapse(bins)
+
+    def _collapse(self, bins: Dict[int, int]):
+        """Junta os buckets de menor magnitude (perde precisão só perto de zero)"""
+        keys = sorted(bins)
+        excess = len(keys) - self.max_bins
+        target = keys[excess]
+        bins[target] += sum(bins.pop(key) for key in keys[:excess])
+
+    def merge(self, other: 'QuantileSketch'):
+        """Soma outro sketch (mesma precisão) neste"""
+        if other.gamma != self.gamma:
+            raise ValueError("Sketches com precisões diferentes não podem ser mesclados")
+        for bins, other_bins in ((self.positive, other.positive), (self.negative, other.negative)):
+            for key, weight in other_bins.items():
+                bins[key] = bins.get(key, 0) + weight
+            if len(bins) > self.max_bins:
+                self._collapse(bins)
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+
+    def _value(self, key: int) -> float:
+        """Valor representativo do bucket (meio em escala relativa)"""
+        return 2 * self.gamma ** key / (self.gamma + 1)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Quantil q (0-1); None se vazio"""
+        if self.count == 0:
+            return None
+        rank = q * (self.count - 1)
+        seen = 0
+        # Negativos: maior magnitude primeiro
+        for key in sorted(self.negative, reverse=True):
+            seen += self.negative[key]
+            if seen > rank:
+                return max(self.minimum, -self._value(key))
+        seen += self.zero_count
+        if seen > rank:
+            return 0.0
+        for key in sorted(self.positive):
+            seen += self.positive[key]
+            if seen > rank:
+                return min(self.maximum, max(self.minimum, self._value(key)))
+        return self.maximum
+
+    def to_dict(self) -> Dict:
+        """Exporta como dict (JSON, para envio entre shards)"""
+        return {
+            'relative_accuracy': self.relative_accuracy,
+            'positive': {str(key): weight for key, weight in self.positive.items()},
+            'negative': {str(key): weight for key, weight in self.negative.items()},
+            'zero_count': self.zero_count,
+            'count': self.count,
+            'min': self.minimum if self.count else None,
+            'max': self.maximum if self.count else None
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'QuantileSketch':
+        """Reconstrói de `to_dict`"""
+        sketch = cls(data['relative_accuracy'])
+        sketch.positive = {int(key): weight for key, weight in data['positive'].items()}
+        sketch.negative = {int(key): weight for key, weight in data['negative'].items()}
+        sketch.zero_count = data['zero_count']
+        sketch.count = data['count']
+        if data['count']:
+            sketch.minimum, sketch.maximum = data['min'], data['max']
+        return sketch
+
+
+class WindowStats:
+    """Contagem, soma, mín, máx e sketch de quantis de uma métrica em uma janela"""
+
+    __slots__ = ('total', 'sketch')
+
+    def __init__(self, relative_accuracy: float = 0.01):
+        self.total = 0.0
+        self.sketch = QuantileSketch(relative_accuracy)
+
+    @property
+    def count(self) -> int:
+        return self.sketch.count
+
+    def add(self, value: float):
+        self.total += value
+        self.sketch.add(value)
+
+    def merge(self, other: 'WindowStats'):
+        self.total += other.total
+        self.sketch.merge(other.sketch)
+
+    def summary(self) -> Dict:
+        """Contagem, média, mín, máx e p50/p95/p99"""
+        sketch = self.sketch
+        if sketch.count == 0:
+            return {'count': 0}
+        result = {
+            'count': sketch.count,
+            'mean': round(self.total / sketch.count, 2),
+            'min': round(sketch.minimum, 2),
+            'max': round(sketch.maximum, 2)
+        }
+        for q in PERCENTILES:
+            result[f'p{int(q * 100)}'] = round(sketch.quantile(q), 2)
+        return result
+
+    def to_dict(self) -> Dict:
+        return {'total': self.total, 'sketch': self.sketch.to_dict()}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'WindowStats':
+        stats = cls()
+        stats.total = data['total']
+        stats.sketch = QuantileSketch.from_dict(data['sketch'])
+        return stats
+
+
+def robot_window_values(robot: Dict) -> Dict[str, float]:
+    """Valores de WINDOW_METRICS de um registro de `robots_telemetry` (via `extract_contribution`)"""
+    numeric, _ = extract_contribution(robot)
+    return {name: value for name, value in zip(ROBOT_TIME_FIELDS, robot_time_values(numeric))
+            if value is not None}
+
+
+class WindowAggregator:
+    """
+    Janelas tumbling e sliding sobre panes de tamanho fixo
+
+    Cada valor entra em um único pane (default 10 s). Janelas tumbling
+    (alinhadas ao epoch) são fechadas somando os panes delas; janelas
+    sliding somam os panes dos últimos N segundos na consulta.
+    """
+
+    def __init__(self, windows: Optional[Dict[str, float]] = None, pane_seconds: float = 10.0,
+                 metrics: Iterable[str] = WINDOW_METRICS, relative_accuracy: float = 0.01,
+                 closed_windows: int = 24):
+        """
+        Args:
+            windows: Janelas nome → segundos (múltiplos de pane_seconds)
+            pane_seconds: Granularidade dos panes (e das janelas sliding)
+            metrics: Métricas aceitas
+            relative_accuracy: Erro relativo dos percentis
+            closed_windows: Janelas tumbling fechadas mantidas por tamanho
+        """
+        self.windows = dict(DEFAULT_WINDOWS if windows is None else windows)
+        for name, seconds in self.windows.items():
+            if seconds % pane_seconds:
+                raise ValueError(f"Janela {name} ({seconds}s) não é múltipla do pane ({pane_seconds}s)")
+        self.pane_seconds = pane_seconds
+        self.metrics = tuple(metrics)
+        self.relative_accuracy = relative_accuracy
+        self.retention = max(self.windows.values())
+
+        # Pane (início) → métrica → estatísticas
+        self.panes: Dict[float, Dict[str, WindowStats]] = {}
+        # Janela → início da janela tumbling aberta
+        self._open_start: Dict[str, Optional[float]] = {name: None for name in self.windows}
+        # Janela → fechadas [(início, métrica → estatísticas)]
+        self.closed: Dict[str, deque] = {name: deque(maxlen=closed_windows) for name in self.windows}
+
+        self.newest: Optional[float] = None
+        self.values_count = 0
+        self.late_dropped = 0
+
+    def add(self, values: Dict[str, float], timestamp: Timestamp):
+        """
+        Adiciona valores de métricas observados em `timestamp`
+
+        Valores atrasados entram no pane (e na janela tumbling já fechada,
+        se ainda mantida); mais velhos que a retenção são descartados.
+        """
+        t = to_epoch(timestamp)
+        if self.newest is None or t > self.newest:
+            self._advance(t)
+        elif t <= self.newest - self.retention - self.pane_seconds:
+            self.late_dropped += len(values)
+            return
+
+        pane_start = math.floor(t / self.pane_seconds) * self.pane_seconds
+        pane = self.panes.get(pane_start)
+        if pane is None:
+            pane = self.panes[pane_start] = {}
+        late_windows = self._closed_windows_for(t) if t < self.newest else ()
+        for metric, value in values.items():
+            if metric not in self.metrics or value is None:
+                continue
+            stats = pane.get(metric)
+            if stats is None:
+                stats = pane[metric] = WindowStats(self.relative_accuracy)
+            stats.add(value)
+            for closed in late_windows:
+                closed.setdefault(metric, WindowStats(self.relative_accuracy)).add(value)
+            self.values_count += 1
+
+    def add_robot(self, robot: Dict):
+        """Adiciona um registro de `robots_telemetry` (timestamp do próprio registro)"""
+        self.add(robot_window_values(robot), robot['timestamp'])
+
+    def add_snapshot(self, telemetry_data: Dict):
+        """Adiciona todos os robôs de um snapshot de telemetria"""
+        default = telemetry_data.get('timestamp')
+        for robot in telemetry_data.get('robots_telemetry', []):
+            self.add(robot_window_values(robot), robot.get('timestamp', default))
+
+    def _advance(self, t: float):
+        """Fecha janelas tumbling que terminaram e descarta panes fora da retenção"""
+        for name, seconds in self.windows.items():
+            window_start = math.floor(t / seconds) * seconds
+            open_start = self._open_start[name]
+            if open_start is not None and window_start > open_start:
+                self.closed[name].append((open_start, self._merge_panes(open_start, open_start + seconds)))
+            if open_start is None or window_start > open_start:
+                self._open_start[name] = window_start
+        self.newest = t
+
+        horizon = t - self.retention - self.pane_seconds
+        for pane_start in [start for start in self.panes if start <= horizon]:
+            del self.panes[pane_start]
+
+    def _closed_windows_for(self, t: float) -> List[Dict[str, WindowStats]]:
+        """Estatísticas das janelas tumbling fechadas que contêm t"""
+        result = []
+        for name, seconds in self.windows.items():
+            for start, stats in reversed(self.closed[name]):
+                if start <= t < start + seconds:
+                    result.append(stats)
+                    break
+                if start + seconds <= t:
+                    break
+        return result
+
+    def _merge_panes(self, start: float, end: float) -> Dict[str, WindowStats]:
+        """Soma os panes com início em [start, end)"""
+        merged: Dict[str, WindowStats] = {}
+        for pane_start, pane in self.panes.items():
+            if start <= pane_start < end:
+                for metric, stats in pane.items():
+                    target = merged.get(metric)
+                    if target is None:
+                        target = merged[metric] = WindowStats(self.relative_accuracy)
+                    target.merge(stats)
+        return merged
+
+    def sliding(self, window: str, now: Optional[Timestamp] = None) -> Dict[str, WindowStats]:
+        """
+        Estatísticas dos últimos N segundos (granularidade de um pane)
+
+        Args:
+            window: Nome da janela (ex.: '15m')
+            now: Fim da janela (default: valor mais novo recebido)
+        """
+        if self.newest is None:
+            return {}
+        end = self.newest if now is None else to_epoch(now)
+        end_pane = math.floor(end / self.pane_seconds) * self.pane_seconds
+        return self._merge_panes(end_pane + self.pane_seconds - self.windows[window], end_pane + self.pane_seconds)
+
+    def tumbling(self, window: str) -> List[Tuple[float, Dict[str, WindowStats]]]:
+        """Janelas tumbling fechadas (mais antiga primeiro) e a aberta no fim"""
+        result = list(self.closed[window])
+        open_start = self._open_start[window]
+        if open_start is not None:
+            result.append((open_start, self._merge_panes(open_start, open_start + self.windows[window])))
+        return result
+
+    def merge(self, other: 'WindowAggregator'):
+        """
+        Soma o estado de outro agregador (outro shard de coletores)
+
+        Os dois precisam das mesmas janelas, pane e precisão. Os relógios
+        dos shards não precisam estar alinhados: janelas que já fecharam
+        aqui recebem a parte do outro shard, esteja ela fechada lá ou
+        ainda nos panes dele.
+        """
+        if (other.windows != self.windows or other.pane_seconds != self.pane_seconds
+                or other.relative_accuracy != self.relative_accuracy):
+            raise ValueError("Agregadores com janelas/pane/precisão diferentes")
+        if other.newest is not None and (self.newest is None or other.newest > self.newest):
+            self._advance(other.newest)
+        for name, seconds in self.windows.items():
+            open_start = self._open_start[name]
+            if open_start is None:
+                continue
+            # Contribuição do outro shard para janelas fechadas aqui
+            incoming = {start: stats for start, stats in other.closed[name]}
+            for pane_start in other.panes:
+                start = math.floor(pane_start / seconds) * seconds
+                if start < open_start and start not in incoming:
+                    incoming[start] = other._merge_panes(start, start + seconds)
+            own = {start: stats for start, stats in self.closed[name]}
+            for start, stats in incoming.items():
+                if start >= open_start:
+                    continue
+                target = own.setdefault(start, {})
+                for metric, metric_stats in stats.items():
+                    target.setdefault(metric, WindowStats(self.relative_accuracy)).merge(metric_stats)
+            self.closed[name] = deque(sorted(own.items(), key=lambda item: item[0]),
+                                      maxlen=self.closed[name].maxlen)
+        for pane_start, pane in other.panes.items():
+            target = self.panes.setdefault(pane_start, {})
+            for metric, stats in pane.items():
+                target.setdefault(metric, WindowStats(self.relative_accuracy)).merge(stats)
+        self.values_count += other.values_count
+        self.late_dropped += other.late_dropped
+
+    def summary(self, now: Optional[Timestamp] = None) -> Dict:
+        """
+        Resumo para relatórios
+
+        Returns:
+            sliding: janela → métrica → resumo (últimos N segundos)
+            tumbling: janela → última janela fechada (início e resumos)
+        """
+        result = {'sliding': {}, 'tumbling': {}}
+        for name in self.windows:
+            result['sliding'][name] = {metric: stats.summary()
+                                       for metric, stats in self.sliding(name, now).items()}
+            if self.closed[name]:
+                start, stats = self.closed[name][-1]
+                result['tumbling'][name] = {
+                    'start': start,
+                    'metrics': {metric: metric_stats.summary() for metric, metric_stats in stats.items()}
+                }
+        return result
+
+
+if __name__ == "__main__":
+    import random
+    import time
+    from datetime import datetime, timezone
+
+    print("🪟 Telemetry - Window Aggregator Mock\n")
+    print("="*70)
+
+    # 40 robôs a 1 Hz por 2h; 2 baterias esquentando e 1 robô com CPU saturada
+    rng = random.Random(7)
+    robots = 40
+    seconds = 2 * 3600
+    base = datetime(2026, 2, 20, 14, 0, tzinfo=timezone.utc).timestamp()
+    hot = {3, 17}
+
+    def reading(robot: int, i: int) -> Dict[str, float]:
+        temperature = 32 + rng.gauss(0, 1.5) + (0.004 * i if robot in hot else 0)
+        return {
+            'soc_percent': max(0.0, 95 - 0.008 * i - robot * 0.3 + rng.gauss(0, 0.5)),
+            'temperature_c': temperature,
+            'power_w': abs(600 + 80 * math.sin(i / 300 + robot) + rng.gauss(0, 40)),
+            'cpu_usage_percent': 96 + rng.random() * 4 if robot == 9 else 35 + rng.gauss(0, 8)
+        }
+
+    full = WindowAggregator()
+    shards = [WindowAggregator(), WindowAggregator()]
+    exact_temps: List[float] = []
+    start = time.perf_counter()
+    for i in range(seconds):
+        t = base + i
+        for robot in range(robots):
+            values = reading(robot, i)
+            full.add(values, t)
+            shards[robot % 2].add(values, t)
+            if i >= seconds - 900:
+                exact_temps.append(values['temperature_c'])
+    elapsed = time.perf_counter() - start
+    print(f"\n📥 {full.values_count:,} VALORES ({robots} robôs × 4 métricas × 2h a 1 Hz, 1 agregador + 2 shards)")
+    print(f"   {elapsed / (robots * seconds * 3) * 1e6:.1f} µs/leitura por agregador | panes: {len(full.panes)}")
+
+    # Sliding: média vs percentis
+    summary = full.summary()
+    print(f"\n🌡️  TEMPERATURA DA BATERIA (sliding):")
+    for name in DEFAULT_WINDOWS:
+        temp = summary['sliding'][name]['temperature_c']
+        print(f"   {name:>3}: média {temp['mean']:.1f}°C | p50 {temp['p50']:.1f} | p95 {temp['p95']:.1f} | "
+              f"p99 {temp['p99']:.1f} | máx {temp['max']:.1f}")
+    cpu = summary['sliding']['15m']['cpu_usage_percent']
+    print(f"   CPU 15m: média {cpu['mean']:.1f}% | p99 {cpu['p99']:.1f}% (robô saturado)")
+
+    # Precisão do sketch vs quantil exato
+    exact_temps.sort()
+    sketch = full.sliding('15m')['temperature_c'].sketch
+    worst = max(abs(sketch.quantile(q) - exact_temps[int(q * (len(exact_temps) - 1))])
+                / exact_temps[int(q * (len(exact_temps) - 1))] for q in PERCENTILES)
+    print(f"\n🎯 PRECISÃO 15m: erro relativo máximo {worst*100:.2f}% (limite {sketch.relative_accuracy*100:.0f}%)")
+
+    # Tumbling
+    hours = full.tumbling('1h')
+    closed_15m = len(full.closed['15m'])
+    print(f"\n🧱 TUMBLING: {closed_15m} janelas de 15m fechadas | 1h: {len(hours)} (última aberta)")
+    first_hour = hours[0][1]['temperature_c'].summary()
+    print(f"   1ª hora: temperatura p99 {first_hour['p99']:.1f}°C em {first_hour['count']:,} leituras")
+
+    # Shards: mescla igual ao agregador único
+    merged = WindowAggregator()
+    for shard in shards:
+        merged.merge(shard)
+    same = merged.summary() == summary
+    print(f"\n🔀 SHARDS: 2 coletores mesclados == agregador único: {same}")
+
+    print("\n" + "="*70)
+    print("✅ JANELAS E PERCENTIS FUNCIONANDO")
+    print("="*70)